@@ -1,7 +1,7 @@
 # ai_components/agent_rag_pipeline.py
 import streamlit as st
-import google.generativeai as genai
 from configs.app_config import GEMINI_API_MODEL_NAME
+from data_tracking.storage import load_history_analytics, load_workout_history
 import logging
 
 # Configure logging
@@ -22,7 +22,8 @@ def get_gemini_api_key():
         st.info("Example for secrets.toml:\nGEMINI_API_KEY=\"YOUR_AIza...KEY\"")
         return None
 
-def generate_ai_feedback(workout_history: list, workout_schedule: list, last_session_stats: dict) -> str:
+def generate_ai_feedback(workout_history: list, workout_schedule: list, last_session_stats: dict,
+                         history_analytics: dict | None = None) -> str:
     """
     Generates AI feedback using Gemini based on workout history and last session.
 
@@ -30,6 +31,7 @@ def generate_ai_feedback(workout_history: list, workout_schedule: list, last_ses
         workout_history (list): A list of dictionaries, each representing a past workout.
         workout_schedule (list): The list of exercises in the current/last schedule.
         last_session_stats (dict): Stats from the just-paused/completed session.
+        history_analytics (dict): `HistoryAnalytics.summary()` of the user's whole history (optional).
 
     Returns:
         str: AI-generated feedback or an error/info message.
@@ -39,6 +41,8 @@ def generate_ai_feedback(workout_history: list, workout_schedule: list, last_ses
         return "AI feedback requires a configured Gemini API Key."
 
     try:
+        import google.generativeai as genai  # loaded on first request, not with the page
+
         genai.configure(api_key=api_key)
         model = genai.GenerativeModel(GEMINI_API_MODEL_NAME)
 
@@ -46,6 +50,14 @@ def generate_ai_feedback(workout_history: list, workout_schedule: list, last_ses
         history_summary = "No extensive history available yet."
         if workout_history:
              history_summary = f"User has completed {len(workout_history)} sessions previously."
+        if history_analytics and history_analytics.get("sessions"):
+            history_summary += (
+                f" All-time: {history_analytics['sessions']} sessions, current streak"
+                f" {history_analytics['current_streak_days']} days (longest {history_analytics['longest_streak_days']}),"
+                f" recent rest-to-work ratio {history_analytics['rest_to_work_ratio']},"
+                f" last week's workout minutes per exercise {history_analytics['last_week_minutes_by_exercise']},"
+                f" personal bests {history_analytics['personal_bests']}."
+            )
 
         schedule_str = ", ".join(workout_schedule) if workout_schedule else "No specific schedule was used (freestyle)."
 
@@ -117,11 +129,11 @@ def get_ai_feedback_for_session(session_manager) -> str:
     """
     Gets AI feedback based on the current session state.
     """
-    if not st.session_state.get("timer_running", False):
+    if not session_manager.is_running_or_paused():
          return "Start a workout to get feedback."
 
     schedule = st.session_state.get("workout_schedule", [])
-    history = [] # In a real app, you'd load this: load_workout_history()
+    history = load_workout_history()  # the user's last HISTORY_DEFAULT_DAYS days
     stats = {
         "rounds": session_manager.get_completed_rounds(),
         "workout_time": session_manager.get_total_workout_time(),
@@ -135,6 +147,6 @@ def get_ai_feedback_for_session(session_manager) -> str:
 
     # If there is a schedule, generate feedback
     if schedule and session_manager.is_paused():
-        return generate_ai_feedback(history, schedule, stats)
+        return generate_ai_feedback(history, schedule, stats, load_history_analytics().summary())
 
     return "Pause your workout to receive AI feedback."
\ No newline at end of file
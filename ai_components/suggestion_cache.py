@@ -0,0 +1,244 @@
+# workout_app/ai_components/suggestion_cache.py
+"""
+Cache of AI workout suggestions, shared by every session of the process.
+
+Many members ask for the same thing ("20 minute full body, no equipment" at
+45/15 s), so a suggestion list is kept per key:
+
+    (normalized description, workout seconds, rest seconds, model name)
+
+The description is normalized with `normalize_description` (Unicode NFKC,
+case-folded, whitespace collapsed, trailing punctuation and surrounding
+quotes dropped), so trivially different spellings share an entry. The model
+name is part of the key so changing `GEMINI_API_MODEL_NAME` does not serve
+the old model's answers.
+
+* TTL: an entry is served for `AI_SUGGESTION_CACHE_TTL_SECONDS` after it was
+  stored, then dropped.
+* LRU: at most `AI_SUGGESTION_CACHE_MAX_ENTRIES` entries are kept in memory,
+  the least recently used dropped first.
+* Persistence: unless `AI_SUGGESTION_CACHE_PATH` is empty, entries are also
+  written to a small SQLite file, so they survive restarts and are shared
+  by every process on the host. A memory miss falls back to it. It is
+  trimmed to the same size, by when an entry was last stored or read from
+  disk (memory hits never write to it). Disk errors are logged and the
+  cache carries on in memory.
+* Locking: the memory layer has its own lock, held only for dictionary
+  work; the SQLite file is read and written under a separate lock, so a
+  slow disk never holds up another session's memory hit.
+
+Only non-empty suggestion lists are stored; errors are never cached.
+`stats()` reports memory and disk hits, misses, expirations and evictions.
+"""
+import collections
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+
+from configs.app_config import (
+    AI_SUGGESTION_CACHE_MAX_ENTRIES,
+    AI_SUGGESTION_CACHE_PATH,
+    AI_SUGGESTION_CACHE_TTL_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS suggestions (
+    key         TEXT PRIMARY KEY,
+    suggestions TEXT NOT NULL,
+    stored_at   REAL NOT NULL,
+    used_at     REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS suggestions_used ON suggestions (used_at);
+"""
+
+
+def normalize_description(description: str) -> str:
+    """The part of a workout description that decides the suggestions."""
+    text = " ".join(unicodedata.normalize("NFKC", description).casefold().split())
+    return text.strip("\"'").rstrip(".!?;, ").strip("\"' ")
+
+
+def cache_key(description: str, workout_seconds: int, rest_seconds: int, model: str) -> str:
+    return json.dumps([normalize_description(description), int(workout_seconds), int(rest_seconds), model],
+                      ensure_ascii=False)
+
+
+class SuggestionCache:
+    def __init__(self, path: str | None = AI_SUGGESTION_CACHE_PATH,
+                 max_entries: int = AI_SUGGESTION_CACHE_MAX_ENTRIES,
+                 ttl_seconds: float = AI_SUGGESTION_CACHE_TTL_SECONDS, clock=time.time):
+        self.path = path or None
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: collections.OrderedDict = collections.OrderedDict()  # key -> (stored_at, suggestions)
+        self._lock = threading.Lock()  # memory layer and counters
+        self._disk_lock = threading.Lock()  # the SQLite connection
+        self._conn: sqlite3.Connection | None = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+    # ----- disk -------------------------------------------------------------
+    def _disk(self) -> sqlite3.Connection | None:
+        """
+        The SQLite connection (opened on first use; None when persistence is
+        off or failed). It and `_disk_get` / `_disk_put` run under `_disk_lock`.
+        """
+        if self.path is None:
+            return None
+        if self._conn is None:
+            try:
+                directory = os.path.dirname(os.path.abspath(self.path))
+                os.makedirs(directory, exist_ok=True)
+                conn = sqlite3.connect(self.path, timeout=1.0, check_same_thread=False, isolation_level=None)
+                conn.execute("PRAGMA journal_mode = WAL")
+                conn.execute("PRAGMA synchronous = NORMAL")
+                conn.executescript(_SCHEMA)
+            except (sqlite3.Error, OSError) as exc:
+                logger.error("AI suggestion cache %s unavailable, keeping it in memory only: %s", self.path, exc)
+                self.path = None
+                return None
+            self._conn = conn
+        return self._conn
+
+    def _disk_get(self, key: str, now: float) -> tuple[float, list[str]] | None:
+        conn = self._disk()
+        if conn is None:
+            return None
+        try:
+            row = conn.execute("SELECT stored_at, suggestions FROM suggestions WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if row[0] + self.ttl_seconds <= now:
+                conn.execute("DELETE FROM suggestions WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE suggestions SET used_at = ? WHERE key = ?", (now, key))
+            return row[0], json.loads(row[1])
+        except (sqlite3.Error, ValueError) as exc:
+            logger.error("Could not read the AI suggestion cache: %s", exc)
+            return None
+
+    def _disk_put(self, key: str, suggestions: list[str], now: float) -> None:
+        conn = self._disk()
+        if conn is None:
+            return
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO suggestions (key, suggestions, stored_at, used_at) VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(suggestions, ensure_ascii=False), now, now),
+                )
+                conn.execute("DELETE FROM suggestions WHERE stored_at <= ?", (now - self.ttl_seconds,))
+                conn.execute(
+                    "DELETE FROM suggestions WHERE key IN"
+                    " (SELECT key FROM suggestions ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        except sqlite3.Error as exc:
+            logger.error("Could not write the AI suggestion cache: %s", exc)
+
+    # ----- cache ------------------------------------------------------------
+    def _remember(self, key: str, stored_at: float, suggestions: list[str]) -> None:
+        self._entries[key] = (stored_at, suggestions)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, key: str) -> list[str] | None:
+        """The cached suggestions for `key` (a copy), or None."""
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] + self.ttl_seconds > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return list(entry[1])
+                del self._entries[key]
+                self.expired += 1
+        # Another process may have stored a fresher entry; read it without
+        # holding the memory lock.
+        with self._disk_lock:
+            entry = self._disk_get(key, now)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            current = self._entries.get(key)
+            if current is not None and current[0] >= entry[0]:
+                entry = current  # a newer answer was put meanwhile
+            self._remember(key, *entry)
+            self.disk_hits += 1
+            return list(entry[1])
+
+    def put(self, key: str, suggestions: list[str]) -> None:
+        if not suggestions:
+            return
+        now = self._clock()
+        suggestions = list(suggestions)
+        with self._lock:
+            self._remember(key, now, suggestions)
+        with self._disk_lock:
+            self._disk_put(key, suggestions, now)
+
+    def clear(self) -> None:
+        """Empties the memory and disk cache."""
+        with self._lock:
+            self._entries.clear()
+        with self._disk_lock:
+            conn = self._disk()
+            if conn is not None:
+                try:
+                    conn.execute("DELETE FROM suggestions")
+                except sqlite3.Error as exc:
+                    logger.error("Could not clear the AI suggestion cache: %s", exc)
+
+    def close(self) -> None:
+        with self._disk_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "persistent": self.path is not None,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "evictions": self.evictions,
+                "hit_rate": round((self.hits + self.disk_hits) / lookups, 3) if lookups else None,
+            }
+
+
+_cache: SuggestionCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_suggestion_cache() -> SuggestionCache:
+    """The process-wide cache."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = SuggestionCache()
+    return _cache
@@ -1,7 +1,7 @@
 # workout_app/ai_components/workout_generator.py
 import streamlit as st
-import google.generativeai as genai
 from configs.app_config import GEMINI_API_MODEL_NAME
+from ai_components.suggestion_cache import cache_key, get_suggestion_cache
 import re # For parsing user input for duration
 
 # --- IMPORTANT: API KEY MANAGEMENT ---
@@ -24,7 +24,17 @@ def get_ai_workout_suggestions(
 
     Returns:
         list[str] | None: A list of suggested exercises, or None if an error occurs.
+
+    Answers are cached per normalized description and durations
+    (ai_components/suggestion_cache.py), so a repeated request skips the API.
     """
+    cache = get_suggestion_cache()
+    key = cache_key(user_description, workout_duration_per_exercise_seconds,
+                    rest_duration_per_exercise_seconds, GEMINI_API_MODEL_NAME)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
     api_key = None
     try:
         api_key = st.secrets["GEMINI_API_KEY"]
@@ -46,6 +56,8 @@ def get_ai_workout_suggestions(
         return None
 
     try:
+        import google.generativeai as genai  # loaded on first request, not with the page
+
         genai.configure(api_key=api_key)
         model = genai.GenerativeModel(GEMINI_API_MODEL_NAME)
 
@@ -94,6 +106,7 @@ def get_ai_workout_suggestions(
         if response.text:
             suggestions = [exercise.strip() for exercise in response.text.splitlines() if exercise.strip()]
             if suggestions:
+                cache.put(key, suggestions)
                 return suggestions
             else:
                 st.warning("AI returned an empty list of suggestions. Try rephrasing your request.", icon="💡")
@@ -0,0 +1,20 @@
+# app.py
+"""
+Optional launcher for production: runs Home.py with the page assets
+(utils/static_assets.py) on their own route, with a one-year immutable
+cache lifetime and pre-compressed bodies.
+
+    python app.py            # or: uvicorn app:app
+
+`streamlit run Home.py` keeps working as before; the assets then come from
+Streamlit's component file route.
+"""
+import streamlit as st
+
+from utils.static_assets import asset_routes, use_asset_route
+
+use_asset_route()
+app = st.App("Home.py", routes=asset_routes())
+
+if __name__ == "__main__":
+    app.run()
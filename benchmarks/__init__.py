@@ -0,0 +1,3 @@
+# benchmarks/__init__.py
+# This file makes the 'benchmarks' directory a Python package.
+# Run the scripts from the project root, e.g. `python -m benchmarks.live_timer_cost`.
@@ -0,0 +1,144 @@
+# benchmarks/analytics.py
+"""
+Cost of the history analytics (data_tracking/analytics.py) as the history grows.
+
+For each `--sizes` entry, fills a user with that many sessions over two
+years and reports:
+
+    load         `load_frames`: reading the rows into frames
+    vectorized   `compute` (group-by, diff and window operations on them)
+    loops        the same metrics from the same rows with Python loops over
+                 dicts, one row at a time (reading them not included)
+    cached       `get_history_analytics` when nothing was saved since the
+                 last call (median)
+    after save   the first `get_history_analytics` after a new session
+
+and whether both implementations agree (streaks, weekly volume, personal
+bests).
+
+Usage:
+    python -m benchmarks.analytics [--sizes 1000 10000 50000] [--json]
+"""
+import argparse
+import datetime
+import json
+import os
+import statistics
+import tempfile
+import time
+
+from benchmarks.history_store import populate, synthetic_record
+from data_tracking import analytics
+from data_tracking.history_store import HistoryStore
+
+
+def _rows(store: HistoryStore, user_id: str) -> tuple[list, list]:
+    with store.connection() as conn:
+        sessions = conn.execute(
+            "SELECT id, started_at, duration, workout_seconds, rounds FROM sessions WHERE user_id = ?"
+            " ORDER BY started_at, id", (user_id,)).fetchall()
+        exercises = conn.execute(
+            "SELECT period, exercise, sets, workout_seconds FROM exercise_rollups"
+            " WHERE user_id = ? AND granularity = 'week'", (user_id,)).fetchall()
+    return sessions, exercises
+
+
+def _loops(sessions: list, exercises: list) -> dict:
+    """The reference: every metric with plain Python loops over dicts."""
+    day_minutes, week_minutes = {}, {}
+    for session_id, started_at, duration, workout_seconds, rounds in sessions:
+        day = datetime.datetime.fromtimestamp(started_at).date()
+        week = day - datetime.timedelta(days=day.weekday())
+        day_minutes[day] = day_minutes.get(day, 0.0) + workout_seconds
+        week_minutes[week] = week_minutes.get(week, 0.0) + workout_seconds
+    volume, most_sets = {}, {}
+    for period, exercise, sets, seconds in exercises:
+        year, week = period.split("-W")
+        volume[(datetime.date.fromisocalendar(int(year), int(week), 1), exercise)] = (sets, round(seconds / 60, 3))
+        most_sets[exercise] = max(most_sets.get(exercise, 0), sets)
+    longest = run = 0
+    last = None
+    for day in sorted(day_minutes):
+        run = run + 1 if last is not None and (day - last).days == 1 else 1
+        longest = max(longest, run)
+        last = day
+    return {
+        "longest_streak": longest,
+        "weekly_volume": volume,
+        "longest_session_minutes": round(max(row[2] for row in sessions) / 60, 1),
+        "most_rounds": max(row[4] for row in sessions),
+        "best_day_workout_minutes": round(max(day_minutes.values()) / 60, 1),
+        "best_week_workout_minutes": round(max(week_minutes.values()) / 60, 1),
+        "most_sets_in_a_week": most_sets,
+    }
+
+
+def _agrees(result: analytics.HistoryAnalytics, reference: dict) -> bool:
+    volume = {(row.week.date(), row.exercise): (row.sets, round(row.workout_minutes, 3))
+              for row in result.weekly_volume.itertuples()}
+    bests = result.personal_bests
+    return (result.longest_streak == reference["longest_streak"]
+            and volume == reference["weekly_volume"]
+            and all(bests[key] == reference[key] for key in (
+                "longest_session_minutes", "most_rounds", "best_day_workout_minutes",
+                "best_week_workout_minutes", "most_sets_in_a_week")))
+
+
+def _timed_ms(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, round((time.perf_counter() - started) * 1000, 2)
+
+
+def measure(sizes: list[int]) -> list[dict]:
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        store = HistoryStore(os.path.join(tmp, "history.db"))
+        for size in sizes:
+            user_id = f"bench-{size}"
+            populate(store, user_id, size, span_days=730)
+            frames, load_ms = _timed_ms(lambda: analytics.load_frames(store, user_id))
+            vectorized, vectorized_ms = _timed_ms(lambda: analytics.compute(*frames))
+            rows = _rows(store, user_id)
+            reference, loops_ms = _timed_ms(lambda: _loops(*rows))
+            analytics.get_history_analytics(store, user_id)
+            cached = []
+            for _ in range(20):
+                started = time.perf_counter()
+                analytics.get_history_analytics(store, user_id)
+                cached.append((time.perf_counter() - started) * 1000)
+            store.save_session(user_id, synthetic_record(time.time()))
+            after, after_ms = _timed_ms(lambda: analytics.get_history_analytics(store, user_id))
+            results.append({
+                "sessions": size,
+                "load_ms": load_ms,
+                "vectorized_ms": vectorized_ms,
+                "loops_ms": loops_ms,
+                "cached_ms": round(statistics.median(cached), 4),
+                "after_save_ms": after_ms,
+                "recomputed_after_save": after.sessions == size + 1,
+                "agrees": _agrees(vectorized, reference),
+            })
+        store.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    results = measure(args.sizes)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for row in results:
+        print(f"{row['sessions']:>6} sessions  load {row['load_ms']:>7.1f} ms   vectorized {row['vectorized_ms']:>6.1f} ms"
+              f"   loops {row['loops_ms']:>7.1f} ms"
+              f"   cached {row['cached_ms']:>6.4f} ms   after save {row['after_save_ms']:>8.1f} ms"
+              f" (recomputed: {row['recomputed_after_save']}, agrees: {row['agrees']})")
+
+
+if __name__ == "__main__":
+    main()
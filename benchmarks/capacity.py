@@ -0,0 +1,171 @@
+# benchmarks/capacity.py
+"""
+Capacity curve: how many running timers one server process can hold.
+
+Starts `streamlit run Home.py`, then ramps up simulated browser sessions
+(benchmarks/ws_client.py) in steps. Every session presses Start, so each one
+is a live timer. After each step has settled the script samples, over a
+fixed window:
+
+    tick lateness   time from a session's rerun request (e.g. the live timer
+                    fragment firing) to its script_finished, p50/p95/p99/max
+    update gap      longest silence between two finished runs of a session,
+                    minus the expected refresh interval
+    update rate     finished runs per session-second; with the server-side
+                    scheduler (core/scheduler.py) the live timer runs are
+                    started by the server, so tick lateness has no samples
+                    and the update gap is the measure to watch
+
+The ramp stops at the first step where sessions can no longer be started
+within the client timeout; that step is reported with its failure count.
+    server          CPU %, RSS and thread count of the streamlit process
+
+Results go to stdout as a table and, with --output, to JSON so releases can
+be compared curve to curve.
+
+Usage:
+    python -m benchmarks.capacity [--steps 1 10 50 100 200 500] [--window 20]
+        [--timer-mode "Browser countdown"] [--output capacity.json]
+
+Raise the open-file limit (`ulimit -n 4096`) before running large steps.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+
+from benchmarks.server import StreamlitServer
+from benchmarks.ws_client import SimulatedBrowser
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+async def _open_session(server: StreamlitServer, timer_mode: str | None) -> SimulatedBrowser:
+    browser = SimulatedBrowser(url=server.ws_url)
+    await browser.connect()
+    if timer_mode:
+        await browser.set_value("sb_timer_mode", string_value=timer_mode)
+    if not await browser.click("start_button"):
+        raise RuntimeError("Start button not found on the page.")
+    return browser
+
+
+def _sample_window(browsers: list[SimulatedBrowser], since: float, until: float,
+                   refresh: float) -> dict:
+    latencies, gaps = [], []
+    runs = 0
+    for browser in browsers:
+        stats = browser.stats
+        latencies.extend(stats.rerun_latencies)
+        stats.rerun_latencies.clear()
+        finished = [t for t in stats.run_finished_at if t >= since]
+        stats.run_finished_at.clear()
+        runs += len(finished)
+        if len(finished) > 1:
+            gaps.append(max(b - a for a, b in zip(finished, finished[1:])) - refresh)
+    return {
+        "tick_lateness_ms": {
+            "p50": round(_percentile(latencies, 0.50) * 1000, 1),
+            "p95": round(_percentile(latencies, 0.95) * 1000, 1),
+            "p99": round(_percentile(latencies, 0.99) * 1000, 1),
+            "max": round(max(latencies, default=0.0) * 1000, 1),
+            "samples": len(latencies),
+        },
+        "update_gap_over_refresh_ms": {
+            "median": round(statistics.median(gaps) * 1000, 1) if gaps else None,
+            "max": round(max(gaps) * 1000, 1) if gaps else None,
+        },
+        "updates_per_session_second": round(
+            runs / (len(browsers) * (until - since)), 2) if browsers else 0.0,
+    }
+
+
+async def run(steps: list[int], window: float, settle: float, timer_mode: str | None,
+              refresh: float, port: int, app: str) -> list[dict]:
+    curve = []
+    browsers: list[SimulatedBrowser] = []
+    with StreamlitServer(app, port=port) as server:
+        try:
+            for target in steps:
+                ramp_failures = 0
+                while len(browsers) < target and not ramp_failures:
+                    batch = min(target - len(browsers), 10)
+                    opened = await asyncio.gather(
+                        *(_open_session(server, timer_mode) for _ in range(batch)),
+                        return_exceptions=True,
+                    )
+                    browsers.extend(b for b in opened if isinstance(b, SimulatedBrowser))
+                    ramp_failures = sum(not isinstance(b, SimulatedBrowser) for b in opened)
+                await asyncio.sleep(settle)
+                for browser in browsers:
+                    browser.stats.rerun_latencies.clear()
+
+                since = time.monotonic()
+                cpu_before = server.cpu_seconds()
+                await asyncio.sleep(window)
+                until = time.monotonic()
+                cpu_percent = (server.cpu_seconds() - cpu_before) / window * 100
+
+                point = {
+                    "sessions": len(browsers),
+                    "server_cpu_percent": round(cpu_percent, 1),
+                    "server_rss_mb": round(server.rss_bytes() / 2**20, 1),
+                    "server_threads": server.thread_count(),
+                    "ramp_failures": ramp_failures,
+                    **_sample_window(browsers, since, until, refresh),
+                }
+                curve.append(point)
+                lateness = point["tick_lateness_ms"]
+                gap = point["update_gap_over_refresh_ms"]
+                print(
+                    f"{point['sessions']:5d} sessions  cpu {point['server_cpu_percent']:6.1f}%"
+                    f"  rss {point['server_rss_mb']:7.1f} MB  threads {point['server_threads']:4d}"
+                    f"  lateness p50 {lateness['p50']:7.1f} p95 {lateness['p95']:7.1f}"
+                    f" max {lateness['max']:7.1f} ms"
+                    f"  gap median {gap['median']} max {gap['max']} ms"
+                    f"  updates/s {point['updates_per_session_second']}"
+                    + (f"  ({ramp_failures} sessions failed to start)" if ramp_failures else ""),
+                    flush=True,
+                )
+                if ramp_failures:
+                    # The server can no longer start sessions in time: this is
+                    # the end of the curve.
+                    break
+        finally:
+            await asyncio.gather(*(b.close() for b in browsers), return_exceptions=True)
+    return curve
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent running-timer capacity curve.")
+    parser.add_argument("--app", default=os.path.join(ROOT, "Home.py"))
+    parser.add_argument("--steps", type=int, nargs="+", default=[1, 10, 50, 100, 200, 500])
+    parser.add_argument("--window", type=float, default=20, help="sampling seconds per step")
+    parser.add_argument("--settle", type=float, default=5, help="seconds to wait after ramping")
+    parser.add_argument("--timer-mode", default=None, help="value for the sidebar selector")
+    parser.add_argument("--refresh", type=float, default=1.0,
+                        help="expected seconds between timer updates (for the gap metric)")
+    parser.add_argument("--port", type=int, default=8598)
+    parser.add_argument("--output", help="write the curve as JSON here")
+    args = parser.parse_args()
+
+    curve = asyncio.run(run(
+        sorted(args.steps), args.window, args.settle, args.timer_mode,
+        args.refresh, args.port, os.path.abspath(args.app),
+    ))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"app": args.app, "timer_mode": args.timer_mode, "curve": curve}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
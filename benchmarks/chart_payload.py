@@ -0,0 +1,102 @@
+# benchmarks/chart_payload.py
+"""
+Payload of the live workout-vs-rest chart, per chart type.
+
+Renders the insights chart (data_tracking.visualization) for fixed totals
+under Streamlit's AppTest and reports, for every `INSIGHTS_CHART_OPTIONS`
+entry, the serialized size of the chart element (what each chart refresh
+sends over the websocket), the server-side render time, and the frontend
+bundle the element type needs (loaded once per page, from
+streamlit/static). Client-side render time needs a real browser and is not
+measured here.
+
+Usage:
+    python -m benchmarks.chart_payload [--workout 420] [--rest 180] [--json]
+"""
+import argparse
+import glob
+import json
+import os
+import statistics
+import time
+
+import streamlit
+from streamlit.testing.v1 import AppTest
+
+from configs.app_config import INSIGHTS_CHART_OPTIONS
+
+# Element type -> frontend chunk that draws it (lazy-loaded by the page).
+# Markdown is part of the main bundle; the Vega chart pulls in several shared
+# chunks, so it is not attributed here.
+_FRONTEND_CHUNKS = {
+    "plotly_chart": "PlotlyChart.*.js",
+    "markdown": None,
+}
+
+
+def _chart_app(chart_type: str, workout: int, rest: int):
+    import streamlit as st
+
+    from data_tracking.visualization import _render_insights_chart
+
+    class Totals:
+        def get_total_workout_time(self):
+            return workout
+
+        def get_total_rest_time(self):
+            return rest
+
+    st.session_state.insights_chart_type = chart_type
+    _render_insights_chart(Totals())
+
+
+def _chunk_bytes(element_type: str) -> int | None:
+    if element_type not in _FRONTEND_CHUNKS:
+        return None
+    pattern = _FRONTEND_CHUNKS[element_type]
+    if pattern is None:
+        return 0
+    static_js = os.path.join(os.path.dirname(streamlit.__file__), "static", "static", "js")
+    return sum(os.path.getsize(path) for path in glob.glob(os.path.join(static_js, pattern)))
+
+
+def measure(chart_type: str, workout: int, rest: int, runs: int = 10) -> dict:
+    at = AppTest.from_function(_chart_app, args=(chart_type, workout, rest))
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        at.run()
+        timings.append((time.perf_counter() - start) * 1000)
+    element = next(el for el in at.main if getattr(el, "proto", None) is not None)
+    element_type = element.type
+    return {
+        "chart_type": chart_type,
+        "element": element_type,
+        "payload_bytes": element.proto.ByteSize(),
+        "render_ms_median": round(statistics.median(timings), 2),
+        "frontend_bundle_bytes": _chunk_bytes(element_type),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workout", type=int, default=420)
+    parser.add_argument("--rest", type=int, default=180)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    results = [measure(chart_type, args.workout, args.rest) for chart_type in INSIGHTS_CHART_OPTIONS]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for r in results:
+        bundle = r["frontend_bundle_bytes"]
+        bundle = "n/a" if bundle is None else f"{bundle / 1024:.0f} KiB"
+        print(
+            f"{r['chart_type']:<28} {r['element']:<16} payload {r['payload_bytes']:>6} B  "
+            f"server render {r['render_ms_median']:>6.2f} ms  frontend bundle {bundle:>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# benchmarks/downsampling.py
+"""
+Cost and fidelity of the LTTB downsampling behind the all-time history trend.
+
+For each `--sizes` entry, builds a daily-minutes series of that many points
+(a noisy baseline with a few isolated spikes, like a history with the odd
+long session) and reports:
+
+    lttb          time `lttb` takes to pick `--points` points
+    payload       JSON size of the chart data, every point vs downsampled
+    peaks kept    how many of the spikes survive downsampling (LTTB) and
+                  plain decimation (every n-th point) at the same size
+
+Usage:
+    python -m benchmarks.downsampling [--sizes 1826 100000 1000000] [--points 266] [--json]
+"""
+import argparse
+import json
+import statistics
+import time
+
+import numpy as np
+
+from data_tracking.downsampling import lttb
+
+_SPIKES = 12
+
+
+def _series(size: int, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    x = np.arange(size, dtype=float) * 86400
+    y = np.clip(rng.normal(30, 10, size), 0, None)
+    y[rng.random(size) < 0.4] = 0  # rest days
+    spikes = rng.choice(np.arange(1, size - 1), _SPIKES, replace=False)
+    y[spikes] = 300
+    return x, y, spikes
+
+
+def _payload_bytes(x, y) -> int:
+    return len(json.dumps([{"day": int(a), "minutes": round(float(b), 1)} for a, b in zip(x, y)]))
+
+
+def measure(sizes: list[int], points: int) -> list[dict]:
+    results = []
+    for size in sizes:
+        x, y, spikes = _series(size)
+        timings = []
+        for _ in range(5):
+            started = time.perf_counter()
+            keep = lttb(x, y, points)
+            timings.append((time.perf_counter() - started) * 1000)
+        decimated = np.linspace(0, size - 1, min(points, size)).astype(int)
+        results.append({
+            "points_in": size,
+            "points_out": len(keep),
+            "lttb_ms": round(statistics.median(timings), 2),
+            "payload_full_bytes": _payload_bytes(x, y),
+            "payload_downsampled_bytes": _payload_bytes(x[keep], y[keep]),
+            "peaks": _SPIKES,
+            "peaks_kept_lttb": int(np.isin(spikes, keep).sum()),
+            "peaks_kept_decimation": int(np.isin(spikes, decimated).sum()),
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1826, 100000, 1000000])
+    parser.add_argument("--points", type=int, default=266, help="output points (266 = 800 px at 3 px per point)")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    results = measure(args.sizes, args.points)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for row in results:
+        print(f"{row['points_in']:>8} -> {row['points_out']:<4} lttb {row['lttb_ms']:>8.2f} ms   "
+              f"payload {row['payload_full_bytes'] / 1024:>9.1f} KiB -> {row['payload_downsampled_bytes'] / 1024:>6.1f} KiB   "
+              f"peaks kept {row['peaks_kept_lttb']}/{row['peaks']} (decimation {row['peaks_kept_decimation']}/{row['peaks']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+# benchmarks/history_charts.py
+"""
+Cost of the historical charts as the history grows.
+
+For each `--sizes` entry, fills a user with that many sessions spread over
+two years (data_tracking/history_store.py, rollups updated on every batch),
+then reports per granularity:
+
+    rollup read   reading the chart's rollup rows (what the page does)
+    full scan     reading every session of the same window and aggregating
+                  it in Python (what the page would do without rollups)
+
+plus the median time of a full History page render under AppTest, the time
+`rebuild_rollups` takes for that user, and whether the rebuilt rollups equal
+the incrementally maintained ones.
+
+Usage:
+    python -m benchmarks.history_charts [--sizes 1000 10000 50000] [--json]
+"""
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+
+_PERIOD_DAYS = {"day": 1, "week": 7, "month": 31}
+
+
+def _median_ms(fn, runs: int = 10) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return round(statistics.median(timings), 2)
+
+
+def _page(user_id: str, granularity: str):
+    import streamlit as st
+
+    from data_tracking.visualization import render_historical_charts
+
+    st.session_state.history_granularity = granularity
+    render_historical_charts(user_id)
+
+
+def _snapshot(store, user_id: str) -> list:
+    with store.connection() as conn:
+        return [
+            [tuple(round(v, 3) if isinstance(v, float) else v for v in row) for row in conn.execute(sql, (user_id,))]
+            for sql in (
+                "SELECT granularity, period, sessions, rounds, workout_seconds, rest_seconds"
+                " FROM rollups WHERE user_id = ? ORDER BY 1, 2",
+                "SELECT granularity, period, exercise, sets, workout_seconds"
+                " FROM exercise_rollups WHERE user_id = ? ORDER BY 1, 2, 3",
+            )
+        ]
+
+
+def measure(sizes: list[int]) -> list[dict]:
+    from streamlit.testing.v1 import AppTest
+
+    from benchmarks.history_store import populate
+    from configs.app_config import HISTORY_CHART_PERIODS
+    from data_tracking import rollups
+    from data_tracking.history_store import get_history_store
+
+    store = get_history_store()
+    results = []
+    for size in sizes:
+        user_id = f"bench-{size}"
+        populate(store, user_id, size, span_days=730)
+        row = {"sessions": size}
+        for granularity, periods in HISTORY_CHART_PERIODS.items():
+            keys = rollups.recent_periods(granularity, periods)
+            since = time.time() - periods * _PERIOD_DAYS[granularity] * 86400
+
+            def scan():
+                totals = {}
+                for session in store.iter_sessions(user_id, since=since):
+                    period = rollups.period_keys(session["started_at"])[granularity]
+                    entry = totals.setdefault(period, [0, 0.0])
+                    entry[0] += 1
+                    entry[1] += session["workout_seconds"]
+                return totals
+
+            at = AppTest.from_function(_page, args=(user_id, granularity))
+            row[granularity] = {
+                "rollup_read_ms": _median_ms(lambda: (store.rollup_rows(user_id, granularity, keys[0]),
+                                                      store.exercise_rollup_rows(user_id, granularity, keys[0]))),
+                "full_scan_ms": _median_ms(scan, runs=3),
+                "page_render_ms": _median_ms(at.run, runs=5),
+            }
+        incremental = _snapshot(store, user_id)
+        started = time.perf_counter()
+        store.rebuild_rollups(user_id)
+        row["rebuild_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        row["rebuild_matches_incremental"] = _snapshot(store, user_id) == incremental
+        results.append(row)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["WORKOUT_HISTORY_DB"] = os.path.join(tmp, "history.db")  # read when the config is imported
+        results = measure(args.sizes)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for row in results:
+        print(f"{row['sessions']:>6} sessions  rebuild {row['rebuild_ms']:.0f} ms "
+              f"(matches incremental: {row['rebuild_matches_incremental']})")
+        for granularity in ("day", "week", "month"):
+            g = row[granularity]
+            print(f"    {granularity:<6} rollup read {g['rollup_read_ms']:>7.2f} ms   full scan {g['full_scan_ms']:>8.2f} ms"
+                  f"   page render {g['page_render_ms']:>7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+# benchmarks/history_store.py
+"""
+Read and write cost of the SQLite workout history (data_tracking/history_store.py).
+
+Fills a fresh database with `--sessions` sessions for one user, spread over
+`--span-days` days (plus the same number for other users), with batched
+inserts, then measures:
+
+    load last 30 days   `iter_sessions` for the user's last 30 days (median)
+    concurrent saves    `--writers` threads each saving `--saves` sessions at
+                        once, one transaction per save: latency percentiles
+                        and how many saves failed
+
+Usage:
+    python -m benchmarks.history_store [--sessions 10000] [--writers 8] [--json]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+
+from data_tracking.history_store import HistoryStore
+
+_BATCH = 500
+
+
+def synthetic_record(started_at: float, rounds: int = 8, workout: int = 45, rest: int = 15) -> dict:
+    """A session record shaped like `WorkoutSession.get_session_record()`."""
+    schedule = ["Push-ups", "Squats", "Plank", "Lunges"]
+    events = [{"t": 0.0, "kind": "start"},
+              {"t": 0.0, "kind": "phase_enter", "phase": "GET_READY", "exercise_index": 0, "exercise": schedule[0]}]
+    t = 10.0
+    for i in range(rounds):
+        exercise = schedule[i % len(schedule)]
+        events.append({"t": t, "kind": "phase_enter", "phase": "WORKOUT", "exercise_index": i % 4, "exercise": exercise})
+        t += workout
+        events.append({"t": t, "kind": "phase_enter", "phase": "REST", "exercise_index": i % 4, "exercise": exercise})
+        t += rest
+    events.append({"t": t, "kind": "reset"})
+    return {"started_at": started_at, "workout_duration": workout, "rest_duration": rest,
+            "schedule": schedule, "events": events}
+
+
+def populate(store: HistoryStore, user_id: str, sessions: int, span_days: int) -> float:
+    """Inserts `sessions` sessions in batches; returns the seconds it took."""
+    now = time.time()
+    rng = random.Random(user_id)
+    started = time.perf_counter()
+    for first in range(0, sessions, _BATCH):
+        records = [synthetic_record(now - rng.uniform(0, span_days * 86400), rounds=rng.randint(4, 12))
+                   for _ in range(min(_BATCH, sessions - first))]
+        store.save_sessions(user_id, records)
+    return time.perf_counter() - started
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    values = sorted(values)
+    return values[min(int(len(values) * pct), len(values) - 1)]
+
+
+def measure(sessions: int, span_days: int, writers: int, saves: int, runs: int = 20) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        store = HistoryStore(os.path.join(tmp, "history.db"))
+        insert_seconds = populate(store, "bench", sessions, span_days)
+        populate(store, "other", sessions, span_days)
+
+        since = time.time() - 30 * 86400
+        timings, rows = [], 0
+        for _ in range(runs):
+            started = time.perf_counter()
+            rows = len(list(store.iter_sessions("bench", since=since)))
+            timings.append((time.perf_counter() - started) * 1000)
+
+        latencies, errors = [], []
+        barrier = threading.Barrier(writers)
+
+        def writer(n: int):
+            barrier.wait()
+            for _ in range(saves):
+                started = time.perf_counter()
+                try:
+                    store.save_session(f"writer-{n}", synthetic_record(time.time()))
+                except Exception as exc:  # noqa: BLE001 - counted, not raised
+                    errors.append(repr(exc))
+                latencies.append((time.perf_counter() - started) * 1000)
+
+        threads = [threading.Thread(target=writer, args=(n,)) for n in range(writers)]
+        wall = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall = time.perf_counter() - wall
+        store.close()
+    return {
+        "sessions_per_user": sessions,
+        "batched_insert_sessions_per_s": round(sessions / insert_seconds),
+        "last_30_days_rows": rows,
+        "last_30_days_ms_median": round(statistics.median(timings), 2),
+        "concurrent_writers": writers,
+        "concurrent_saves": writers * saves,
+        "save_ms_p50": round(_percentile(latencies, 0.50), 2),
+        "save_ms_p95": round(_percentile(latencies, 0.95), 2),
+        "save_ms_max": round(max(latencies), 2),
+        "saves_per_s": round(writers * saves / wall),
+        "failed_saves": len(errors),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=10000)
+    parser.add_argument("--span-days", type=int, default=730)
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--saves", type=int, default=50)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    result = measure(args.sessions, args.span_days, args.writers, args.saves)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+    print(f"batched insert     {result['batched_insert_sessions_per_s']:>8} sessions/s")
+    print(f"load last 30 days  {result['last_30_days_ms_median']:>8.2f} ms median "
+          f"({result['last_30_days_rows']} of {result['sessions_per_user']} sessions)")
+    print(f"concurrent saves   {result['save_ms_p50']:>8.2f} ms p50  {result['save_ms_p95']:.2f} ms p95  "
+          f"{result['save_ms_max']:.2f} ms max  ({result['concurrent_writers']} writers, "
+          f"{result['saves_per_s']} saves/s, {result['failed_saves']} failed)")
+
+
+if __name__ == "__main__":
+    main()
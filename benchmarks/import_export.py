@@ -0,0 +1,151 @@
+# benchmarks/import_export.py
+"""
+Throughput and memory of the bulk CSV / JSON-lines import and export (data_tracking/transfer.py).
+
+Writes a CSV of `--rows` interval rows (sessions of 25 rows: get-ready,
+then 12 rounds of work and rest), then reports:
+
+    import csv      `import_history` of the whole file into a fresh database:
+                    time and rows per second
+    unbatched       the same for the first `--unbatched-rows` rows with one
+                    transaction per session (`--batch-size 1`), per row
+    export          `export_history` of the imported history, as CSV and as
+                    JSON lines
+    import jsonl    the JSON-lines export imported for another user
+    re-import       the CSV imported again: every session already there
+    heap peak       Python heap allocated by an import (tracemalloc peak),
+                    for a file of `--memory-rows` rows and one 4x as large
+
+Usage:
+    python -m benchmarks.import_export [--rows 1000000] [--json]
+"""
+import argparse
+import csv
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from configs.app_config import HISTORY_IMPORT_BATCH_SIZE
+from data_tracking import transfer
+from data_tracking.history_store import HistoryStore
+
+_EXERCISES = ["Push-ups", "Squats", "Plank", "Lunges"]
+_ROUNDS = 12
+_ROWS_PER_SESSION = 1 + 2 * _ROUNDS
+
+
+def write_csv(path: str, rows: int) -> int:
+    """Writes about `rows` interval rows (whole sessions); returns the sessions written."""
+    started_at = 1.7e9
+    sessions = -(-rows // _ROWS_PER_SESSION)
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(transfer.CSV_COLUMNS)
+        for session in range(sessions):
+            start = f"{started_at + session * 21600:.3f}"
+            writer.writerow((session, start, "GET_READY", _EXERCISES[0], 10))
+            for i in range(_ROUNDS):
+                writer.writerow((session, start, "WORKOUT", _EXERCISES[i % 4], 45))
+                writer.writerow((session, start, "REST", _EXERCISES[i % 4], 15))
+    return sessions
+
+
+def _timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started
+
+
+def _import(store: HistoryStore, user_id: str, path: str, fmt: str, batch_size: int = HISTORY_IMPORT_BATCH_SIZE):
+    with open(path, "rb") as f:
+        return transfer.import_history(store, user_id, f, fmt, batch_size)
+
+
+def _export(store: HistoryStore, user_id: str, path: str, fmt: str) -> int:
+    with open(path, "wb") as f:
+        return transfer.export_history(store, user_id, f, fmt)
+
+
+def _heap_peak(tmp: str, rows: int) -> int:
+    path = os.path.join(tmp, f"memory-{rows}.csv")
+    write_csv(path, rows)
+    store = HistoryStore(os.path.join(tmp, f"memory-{rows}.db"))
+    tracemalloc.start()
+    _import(store, "memory", path, transfer.CSV)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    store.close()
+    return peak
+
+
+def measure(rows: int, unbatched_rows: int, memory_rows: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "history.csv")
+        sessions = write_csv(source, rows)
+        rows = sessions * _ROWS_PER_SESSION
+        store = HistoryStore(os.path.join(tmp, "history.db"))
+
+        imported, import_s = _timed(lambda: _import(store, "csv", source, transfer.CSV))
+
+        small = os.path.join(tmp, "small.csv")
+        small_sessions = write_csv(small, unbatched_rows)
+        _, unbatched_s = _timed(lambda: _import(store, "unbatched", small, transfer.CSV, batch_size=1))
+        _, batched_s = _timed(lambda: _import(store, "batched", small, transfer.CSV))
+
+        exported_csv = os.path.join(tmp, "export.csv")
+        exported_jsonl = os.path.join(tmp, "export.jsonl")
+        _, export_csv_s = _timed(lambda: _export(store, "csv", exported_csv, transfer.CSV))
+        _, export_jsonl_s = _timed(lambda: _export(store, "csv", exported_jsonl, transfer.JSONL))
+        from_jsonl, import_jsonl_s = _timed(lambda: _import(store, "jsonl", exported_jsonl, transfer.JSONL))
+        again, reimport_s = _timed(lambda: _import(store, "csv", exported_csv, transfer.CSV))
+        store.close()
+
+        return {
+            "rows": rows,
+            "sessions": sessions,
+            "csv_bytes": os.path.getsize(source),
+            "jsonl_bytes": os.path.getsize(exported_jsonl),
+            "imported": imported.sessions,
+            "import_csv_s": round(import_s, 2),
+            "import_rows_per_s": round(rows / import_s),
+            "unbatched_us_per_row": round(unbatched_s / (small_sessions * _ROWS_PER_SESSION) * 1e6, 1),
+            "batched_us_per_row": round(batched_s / (small_sessions * _ROWS_PER_SESSION) * 1e6, 1),
+            "export_csv_s": round(export_csv_s, 2),
+            "export_jsonl_s": round(export_jsonl_s, 2),
+            "import_jsonl_s": round(import_jsonl_s, 2),
+            "imported_from_jsonl": from_jsonl.sessions,
+            "reimport_s": round(reimport_s, 2),
+            "reimport_duplicates": again.duplicates,
+            "heap_peak_bytes": {memory_rows: _heap_peak(tmp, memory_rows),
+                                4 * memory_rows: _heap_peak(tmp, 4 * memory_rows)},
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--unbatched-rows", type=int, default=25_000)
+    parser.add_argument("--memory-rows", type=int, default=50_000)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    r = measure(args.rows, args.unbatched_rows, args.memory_rows)
+    if args.json:
+        print(json.dumps(r, indent=2))
+        return
+    print(f"{r['rows']:,} rows, {r['sessions']:,} sessions: CSV {r['csv_bytes'] / 2**20:.1f} MiB, "
+          f"JSON lines {r['jsonl_bytes'] / 2**20:.1f} MiB")
+    print(f"import csv    {r['import_csv_s']:>7.2f} s   {r['import_rows_per_s']:,} rows/s")
+    print(f"unbatched     {r['unbatched_us_per_row']:>7.1f} us per row   "
+          f"(batched: {r['batched_us_per_row']:.1f} us per row)")
+    print(f"export        {r['export_csv_s']:>7.2f} s CSV   {r['export_jsonl_s']:.2f} s JSON lines")
+    print(f"import jsonl  {r['import_jsonl_s']:>7.2f} s   ({r['imported_from_jsonl']:,} sessions)")
+    print(f"re-import     {r['reimport_s']:>7.2f} s   ({r['reimport_duplicates']:,} already in the history)")
+    print("heap peak     " + "   ".join(f"{rows:,} rows: {peak / 1024:,.0f} KiB"
+                                        for rows, peak in r["heap_peak_bytes"].items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# benchmarks/import_profile.py
+"""
+Import-time profile of a page's module imports.
+
+Collects the import statements at the top of each page script, runs them in a
+fresh interpreter under `python -X importtime` (after `import streamlit`,
+which the server has already loaded by the time a page runs), and reports
+the cumulative milliseconds per module, slowest first. Modules that should
+only load on first use (`DEFERRED_MODULES`) are flagged when a page pulls
+them in at import time.
+
+Usage:
+    python -m benchmarks.import_profile [--page Home.py ...] [--top 20] [--json]
+"""
+import argparse
+import ast
+import glob
+import json
+import os
+import subprocess
+import sys
+
+_REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Loaded by the insights chart and the AI features, never by the page itself.
+DEFERRED_MODULES = ("pandas", "plotly", "google.generativeai")
+
+
+def page_imports(page: str) -> list[str]:
+    """The top-level import statements of `page`, as source lines."""
+    with open(page, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    return [ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+
+
+def profile(statements: list[str]) -> list[dict]:
+    """Runs `statements` under -X importtime; one entry per imported module."""
+    code = "import streamlit\n" + "\n".join(s for s in statements if s != "import streamlit as st")
+    baseline = {entry["module"] for entry in _importtime("import streamlit")}
+    return [entry for entry in _importtime(code) if entry["module"] not in baseline]
+
+
+def _importtime(code: str) -> list[dict]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=_REPO_DIR, capture_output=True, text=True,
+    )
+    if result.returncode:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return _parse(result.stderr)
+
+
+def _parse(stderr: str) -> list[dict]:
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        entries.append({
+            "module": name.strip(),
+            "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+        })
+    return entries
+
+
+def report(page: str) -> dict:
+    entries = profile(page_imports(page))
+    loaded = {entry["module"] for entry in entries}
+    return {
+        "page": os.path.relpath(page, _REPO_DIR),
+        "total_ms": round(sum(entry["self_ms"] for entry in entries), 1),
+        "modules": sorted(entries, key=lambda entry: entry["cumulative_ms"], reverse=True),
+        "deferred_loaded": [name for name in DEFERRED_MODULES if name in loaded],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--page", action="append",
+                        help="page script (default: Home.py and every page in pages/)")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    pages = args.page or [os.path.join(_REPO_DIR, "Home.py"),
+                          *sorted(glob.glob(os.path.join(_REPO_DIR, "pages", "*.py")))]
+    results = [report(page) for page in pages]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for result in results:
+        print(f"{result['page']}: {result['total_ms']:.1f} ms of imports beyond streamlit")
+        print(f"  {'cumulative':>12} {'self':>10}  module")
+        for entry in result["modules"][:args.top]:
+            print(f"  {entry['cumulative_ms']:>9.1f} ms {entry['self_ms']:>7.1f} ms  {entry['module']}")
+        deferred = ", ".join(result["deferred_loaded"]) or "none"
+        print(f"  loaded at import time, should be deferred: {deferred}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# benchmarks/live_timer_cost.py
+"""
+Measures what one running timer costs the server per session-second.
+
+Starts `streamlit run <app>` headless, connects one simulated browser,
+presses Start and lets the timer run. Reports server CPU seconds and
+websocket bytes per session-second.
+
+Usage:
+    python -m benchmarks.live_timer_cost [--app Home.py] [--seconds 30]
+        [--timer-mode "Browser countdown"] [--json]
+"""
+import argparse
+import asyncio
+import json
+import os
+
+from benchmarks.server import StreamlitServer
+from benchmarks.ws_client import SimulatedBrowser
+
+
+async def measure(app: str, seconds: float, port: int, timer_mode: str | None = None) -> dict:
+    with StreamlitServer(app, port=port) as server:
+        browser = SimulatedBrowser(url=server.ws_url)
+        await browser.connect()
+        if timer_mode and not await browser.set_value("sb_timer_mode", string_value=timer_mode):
+            raise RuntimeError("Timer mode selector not found on the page.")
+        if not await browser.click("start_button"):
+            raise RuntimeError("Start button not found on the page.")
+        # Skip past the start-up burst before sampling.
+        await asyncio.sleep(2)
+
+        cpu_before = server.cpu_seconds()
+        bytes_before = browser.stats.bytes_received
+        await asyncio.sleep(seconds)
+        cpu_used = server.cpu_seconds() - cpu_before
+        bytes_sent = browser.stats.bytes_received - bytes_before
+
+        result = {
+            "app": app,
+            "timer_mode": timer_mode,
+            "session_seconds": seconds,
+            "server_cpu_ms_per_session_second": round(cpu_used / seconds * 1000, 2),
+            "ws_bytes_per_session_second": round(bytes_sent / seconds),
+            "rss_mb": round(server.rss_bytes() / 2**20, 1),
+            "full_runs": browser.stats.full_runs,
+            "script_runs": browser.stats.script_runs,
+            "fragment_runs": browser.stats.fragment_runs,
+            "pushed_runs": browser.stats.pushed_runs,
+        }
+        await browser.close()
+        return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--app", default="Home.py")
+    parser.add_argument("--seconds", type=float, default=30)
+    parser.add_argument("--port", type=int, default=8599)
+    parser.add_argument("--timer-mode", default=None, help="value for the sidebar selector")
+    parser.add_argument("--json", action="store_true", help="print JSON only")
+    args = parser.parse_args()
+
+    result = asyncio.run(measure(os.path.abspath(args.app), args.seconds, args.port, args.timer_mode))
+    if args.json:
+        print(json.dumps(result))
+    else:
+        for key, value in result.items():
+            print(f"{key:36} {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# benchmarks/read_cache.py
+"""
+What the history read cache (data_tracking/read_cache.py) saves.
+
+For each `--sizes` entry, fills a user with that many sessions over two
+years, then reports:
+
+    load_workout_history   median time for the last 30 days and for the
+                           whole history: a miss (read from SQLite) and a hit
+    History page           database connections checked out by a full render
+                           (AppTest): the first run, each of `--reruns`
+                           reruns that change nothing, and the first rerun
+                           after a save
+
+plus the cache's hit and miss counters at the end.
+
+Usage:
+    python -m benchmarks.read_cache [--sizes 1000 10000 50000] [--reruns 10] [--json]
+"""
+import argparse
+import contextlib
+import json
+import os
+import statistics
+import tempfile
+import time
+
+
+def _page(user_id: str):
+    from data_tracking.visualization import render_historical_charts
+
+    render_historical_charts(user_id)
+
+
+def _median_ms(fn, runs: int = 9) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return round(statistics.median(timings), 4)
+
+
+def measure(sizes: list[int], reruns: int) -> dict:
+    from streamlit.testing.v1 import AppTest
+
+    from benchmarks.history_store import populate, synthetic_record
+    from data_tracking import storage
+    from data_tracking.history_store import get_history_store
+    from data_tracking.read_cache import get_read_cache
+
+    store = get_history_store()
+    checkouts = 0
+    connection = store.connection
+
+    @contextlib.contextmanager
+    def counted():
+        nonlocal checkouts
+        checkouts += 1
+        with connection() as conn:
+            yield conn
+
+    store.connection = counted
+    cache = get_read_cache()
+    results = []
+    for size in sizes:
+        user_id = f"bench-{size}"
+        populate(store, user_id, size, span_days=730)
+        row = {"sessions": size}
+        for label, days in (("last_30_days", 30), ("all", None)):
+            def miss():
+                cache.clear()
+                storage.load_workout_history(days, user_id)
+
+            row[label] = {
+                "rows": len(storage.load_workout_history(days, user_id)),
+                "miss_ms": _median_ms(miss, runs=3 if days is None else 9),
+                "hit_ms": _median_ms(lambda: storage.load_workout_history(days, user_id)),
+            }
+
+        at = AppTest.from_function(_page, args=(user_id,), default_timeout=60)
+        checkouts = 0
+        at.run()
+        first = checkouts
+        per_rerun = []
+        for _ in range(reruns):
+            checkouts = 0
+            at.run()
+            per_rerun.append(checkouts)
+        store.save_session(user_id, synthetic_record(time.time()))
+        checkouts = 0
+        at.run()
+        row["page_connections"] = {"first_run": first, "unchanged_reruns": per_rerun, "after_save": checkouts}
+        results.append(row)
+    return {"sizes": results, "cache": cache.stats()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--reruns", type=int, default=10)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["WORKOUT_HISTORY_DB"] = os.path.join(tmp, "history.db")  # read when the config is imported
+        r = measure(args.sizes, args.reruns)
+    if args.json:
+        print(json.dumps(r, indent=2))
+        return
+    for row in r["sizes"]:
+        print(f"{row['sessions']:>6} sessions")
+        for label in ("last_30_days", "all"):
+            g = row[label]
+            print(f"    load_workout_history {label:<12} ({g['rows']:>6} rows)  miss {g['miss_ms']:>9.3f} ms"
+                  f"   hit {g['hit_ms']:>7.4f} ms")
+        p = row["page_connections"]
+        print(f"    History page connections: first run {p['first_run']}, unchanged reruns "
+              f"{sum(p['unchanged_reruns'])} over {len(p['unchanged_reruns'])}, after a save {p['after_save']}")
+    c = r["cache"]
+    print(f"cache: {c['entries']} entries, {c['hits']} hits, {c['misses']} misses, {c['evictions']} evictions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# benchmarks/rerun_bytes.py
+"""
+Websocket bytes the server sends per full rerun of the Home page.
+
+Starts `streamlit run <app>` headless, connects one simulated browser and
+records the bytes of every message in each run, for three cases:
+
+    first load      the session's first run
+    idle rerun      a plain rerun with the timer stopped
+    running rerun   a plain rerun with the timer running (fragment runs in
+                    between are not counted)
+
+Usage:
+    python -m benchmarks.rerun_bytes [--app Home.py] [--reruns 20] [--json]
+"""
+import argparse
+import asyncio
+import json
+import statistics
+
+from benchmarks.server import StreamlitServer
+from benchmarks.ws_client import SimulatedBrowser
+
+
+async def _run_bytes(browser: SimulatedBrowser, reruns: int) -> list[int]:
+    sizes = []
+    for _ in range(reruns):
+        before = browser.stats.bytes_received
+        await browser.rerun()
+        sizes.append(browser.stats.bytes_received - before)
+    return sizes
+
+
+def _summary(sizes: list[int]) -> dict:
+    return {"median": int(statistics.median(sizes)), "max": max(sizes), "runs": len(sizes)}
+
+
+async def measure(app: str, reruns: int, port: int) -> dict:
+    with StreamlitServer(app, port=port) as server:
+        browser = SimulatedBrowser(url=server.ws_url)
+        await browser.connect()  # the first run
+        first_load = browser.stats.bytes_received
+        idle = await _run_bytes(browser, reruns)
+        if not await browser.click("start_button"):
+            raise RuntimeError("Start button not found on the page.")
+        running = await _run_bytes(browser, reruns)
+        await browser.close()
+    return {
+        "app": app,
+        "first_load_bytes": first_load,
+        "idle_rerun_bytes": _summary(idle),
+        "running_rerun_bytes": _summary(running),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--app", default="Home.py")
+    parser.add_argument("--reruns", type=int, default=20)
+    parser.add_argument("--port", type=int, default=8599)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    result = asyncio.run(measure(args.app, args.reruns, args.port))
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+    print(f"first load     {result['first_load_bytes']:>8} B")
+    for case in ("idle_rerun_bytes", "running_rerun_bytes"):
+        summary = result[case]
+        label = case.replace("_bytes", "").replace("_", " ")
+        print(f"{label:<14} {summary['median']:>8} B median  {summary['max']:>8} B max  ({summary['runs']} runs)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+# benchmarks/rerun_cost.py
+"""
+Per-rerun cost of the Home page, split by render path.
+
+Drives Home.py headlessly with Streamlit's AppTest through the idle,
+GET_READY, WORKOUT, REST and PAUSED states and times every rerun, plus the
+sections that make it up:
+
+    sidebar      ui.sidebar_controls.render_sidebar_controls
+    main_display ui.main_display.render_main_display (contains the three below)
+    live_timer   ui.main_display._render_live_timer   (the per-second fragment)
+    insights     data_tracking.visualization.display_workout_insights
+    ai_feedback  ui.main_display._render_ai_feedback + the Gemini call in Home.py
+
+The timer is moved between phases by shifting its start timestamp, so no
+real waiting is needed; `time.sleep` is patched out and the Gemini call is
+replaced by a constant string. Timings are taken in one pass and memory
+(tracemalloc, net and peak KiB per section) in a second pass so tracing
+does not distort the timings.
+
+Usage:
+    python -m benchmarks.rerun_cost [--reruns 30] [--output results.json]
+        [--compare baseline.json --tolerance 0.25]
+
+With --compare the script exits with status 1 if the median rerun time or
+the median live_timer time of any scenario regressed by more than the
+tolerance.
+"""
+import argparse
+import functools
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+import warnings
+from collections import defaultdict
+from unittest import mock
+
+from streamlit.testing.v1 import AppTest
+
+from core.session_log import SessionLog
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HOME = os.path.join(ROOT, "Home.py")
+SCENARIOS = ["idle", "get_ready", "workout", "rest", "paused"]
+HOT_SECTIONS = ["total", "live_timer"]
+
+
+class SectionRecorder:
+    """Collects wall time and (optionally) tracemalloc figures per section."""
+
+    def __init__(self):
+        self.times = defaultdict(list)
+        self.net_kib = defaultdict(list)
+        self.peak_kib = defaultdict(list)
+        self.trace_memory = False
+        self._stack = []  # [start_current, max_absolute_peak]
+
+    def _begin(self):
+        if not self.trace_memory:
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        if self._stack:
+            self._stack[-1][1] = max(self._stack[-1][1], peak)
+        tracemalloc.reset_peak()
+        self._stack.append([current, current])
+
+    def _end(self, section: str):
+        if not self.trace_memory:
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        start, max_peak = self._stack.pop()
+        absolute_peak = max(max_peak, peak)
+        if self._stack:
+            self._stack[-1][1] = max(self._stack[-1][1], absolute_peak)
+        self.net_kib[section].append((current - start) / 1024)
+        self.peak_kib[section].append((absolute_peak - start) / 1024)
+
+    def measure(self, section: str, func, *args, **kwargs):
+        self._begin()
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            self._end(section)
+            if not self.trace_memory:
+                self.times[section].append(elapsed * 1000)
+
+    def wrap(self, module, name: str, section: str):
+        original = getattr(module, name)
+
+        @functools.wraps(original)
+        def wrapper(*args, **kwargs):
+            return self.measure(section, original, *args, **kwargs)
+
+        return mock.patch.object(module, name, wrapper)
+
+    def reset(self):
+        self.times.clear()
+        self.net_kib.clear()
+        self.peak_kib.clear()
+
+
+def _summary(values: list[float]) -> dict:
+    if not values:
+        return {}
+    ordered = sorted(values)
+    return {
+        "count": len(values),
+        "median": round(statistics.median(values), 3),
+        "mean": round(statistics.fmean(values), 3),
+        "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
+def _enter_scenario(at: AppTest, scenario: str):
+    """Put a fresh app into `scenario` with as few reruns as possible."""
+    if scenario == "idle":
+        return
+    at.button(key="start_button").click().run()
+    timer = at.session_state.timer_state
+    shift = {
+        "get_ready": 0,
+        "workout": 12,
+        "rest": 10 + timer.workout_duration + 2,
+        "paused": 12,
+    }[scenario]
+    timer.session_started_at -= shift
+    # Move the session's event log along with the clock.
+    timer.log = SessionLog.from_records(
+        timer.log.to_records(), timer.session_started_at, timer.log.wall_started_at
+    )
+    at.run()
+    if scenario == "paused":
+        at.button(key="pause_button").click().run()
+
+
+def run_scenario(scenario: str, reruns: int, recorder: SectionRecorder) -> dict:
+    import ai_components.agent_rag_pipeline as agent_rag_pipeline
+    import data_tracking.visualization as visualization
+    import ui.main_display as main_display
+    import ui.sidebar_controls as sidebar_controls
+
+    at = AppTest.from_file(HOME, default_timeout=60)
+    at.session_state["workout_schedule"] = ["Push-ups", "Squats", "Plank"]
+
+    patches = [
+        mock.patch("time.sleep"),
+        recorder.wrap(sidebar_controls, "render_sidebar_controls", "sidebar"),
+        recorder.wrap(main_display, "render_main_display", "main_display"),
+        recorder.wrap(main_display, "_render_live_timer", "live_timer"),
+        recorder.wrap(main_display, "display_workout_insights", "insights"),
+        recorder.wrap(main_display, "_render_ai_feedback", "ai_feedback"),
+        mock.patch.object(
+            agent_rag_pipeline,
+            "get_ai_feedback_for_session",
+            lambda session: recorder.measure("ai_feedback", lambda: "Benchmark feedback."),
+        ),
+    ]
+    for patch in patches:
+        patch.start()
+    try:
+        at.run()
+        _enter_scenario(at, scenario)
+        if at.exception:
+            raise RuntimeError(f"{scenario}: {at.exception[0].message}")
+
+        expected_phase = {"idle": "GET_READY", "get_ready": "GET_READY", "workout": "WORKOUT",
+                          "rest": "REST", "paused": "PAUSED"}[scenario]
+        phase = at.session_state.timer_state.current_phase
+        if phase != expected_phase:
+            raise RuntimeError(f"{scenario}: expected {expected_phase}, got {phase}")
+
+        result = {}
+        for trace_memory in (False, True):
+            recorder.reset()
+            recorder.trace_memory = trace_memory
+            if trace_memory:
+                tracemalloc.start()
+            for _ in range(reruns):
+                recorder.measure("total", at.run)
+            if trace_memory:
+                tracemalloc.stop()
+                for section in recorder.net_kib:
+                    result.setdefault(section, {})["net_kib"] = _summary(recorder.net_kib[section])
+                    result[section]["peak_kib"] = _summary(recorder.peak_kib[section])
+            else:
+                for section, values in recorder.times.items():
+                    result.setdefault(section, {})["ms"] = _summary(values)
+        return result
+    finally:
+        for patch in reversed(patches):
+            patch.stop()
+        recorder.trace_memory = False
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+    for scenario, sections in results["scenarios"].items():
+        for section in HOT_SECTIONS:
+            new = sections.get(section, {}).get("ms", {}).get("median")
+            old = baseline.get("scenarios", {}).get(scenario, {}).get(section, {}).get("ms", {}).get("median")
+            if new is None or not old:
+                continue
+            if new > old * (1 + tolerance):
+                regressions.append(
+                    f"{scenario}/{section}: median {new:.2f} ms vs baseline {old:.2f} ms "
+                    f"(+{(new / old - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-rerun cost of the Home page.")
+    parser.add_argument("--reruns", type=int, default=30, help="reruns per scenario")
+    parser.add_argument("--scenarios", nargs="+", default=SCENARIOS, choices=SCENARIOS)
+    parser.add_argument("--output", help="write the JSON results here")
+    parser.add_argument("--compare", help="baseline JSON produced by --output")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    warnings.filterwarnings("ignore")
+    sys.path.insert(0, ROOT)
+
+    recorder = SectionRecorder()
+    results = {
+        "python": sys.version.split()[0],
+        "reruns": args.reruns,
+        "scenarios": {s: run_scenario(s, args.reruns, recorder) for s in args.scenarios},
+    }
+
+    for scenario, sections in results["scenarios"].items():
+        print(f"\n{scenario}")
+        for section, figures in sections.items():
+            ms = figures.get("ms", {})
+            peak = figures.get("peak_kib", {})
+            print(
+                f"  {section:13} median {ms.get('median', 0):8.2f} ms"
+                f"  p95 {ms.get('p95', 0):8.2f} ms"
+                f"  peak {peak.get('median', 0):9.1f} KiB"
+            )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# benchmarks/startup.py
+"""
+Cold-start time to first render of the timer page, with a budget.
+
+Starts a fresh `streamlit run Home.py` per sample, connects one simulated
+browser as soon as the port is open, and times:
+
+    server ready     process launch -> port accepting connections
+    first timer      first run requested -> the live timer digits arrive
+                     (the page's modules are imported during this run)
+    first run        first run requested -> script finished
+
+Exits with status 1 if the median "first timer" time is over `--budget-ms`
+(default `TTFR_BUDGET_MS`), so it can gate a CI job.
+
+Usage:
+    python -m benchmarks.startup [--samples 3] [--budget-ms 1000] [--json]
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+
+from benchmarks.server import StreamlitServer
+from benchmarks.ws_client import SimulatedBrowser
+
+TTFR_BUDGET_MS = 1000
+_TIMER_MARKER = "live-timer-digits"  # class of the digits in ui/main_display.py
+
+
+async def _sample(app: str, port: int) -> dict:
+    launched = time.monotonic()
+    with StreamlitServer(app, port=port) as server:
+        ready = time.monotonic()
+        browser = SimulatedBrowser(url=server.ws_url)
+        first_timer = []
+
+        def on_message(msg, size, received_at):
+            if not first_timer and msg.WhichOneof("type") == "delta":
+                element = msg.delta.new_element
+                if element.WhichOneof("type") == "markdown" and _TIMER_MARKER in element.markdown.body:
+                    first_timer.append(received_at)
+
+        browser.on_message(on_message)
+        requested = time.monotonic()
+        await browser.connect()  # the first run
+        finished = browser.stats.run_finished_at[0]
+        await browser.close()
+    if not first_timer:
+        raise RuntimeError("The timer digits were not rendered on the first run.")
+    return {
+        "server_ready_ms": (ready - launched) * 1000,
+        "first_timer_ms": (first_timer[0] - requested) * 1000,
+        "first_run_ms": (finished - requested) * 1000,
+    }
+
+
+def measure(app: str, samples: int, port: int) -> dict:
+    runs = [asyncio.run(_sample(app, port)) for _ in range(samples)]
+    return {
+        "app": app,
+        "samples": samples,
+        **{key: round(statistics.median(run[key] for run in runs), 1) for key in runs[0]},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--app", default="Home.py")
+    parser.add_argument("--samples", type=int, default=3)
+    parser.add_argument("--budget-ms", type=float, default=TTFR_BUDGET_MS)
+    parser.add_argument("--port", type=int, default=8599)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    result = measure(args.app, args.samples, args.port)
+    result["budget_ms"] = args.budget_ms
+    result["within_budget"] = result["first_timer_ms"] <= args.budget_ms
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(f"server ready   {result['server_ready_ms']:>8.1f} ms")
+        print(f"first timer    {result['first_timer_ms']:>8.1f} ms  (budget {args.budget_ms:.0f} ms)")
+        print(f"first run      {result['first_run_ms']:>8.1f} ms  (median of {args.samples} cold starts)")
+    if not result["within_budget"]:
+        print(f"FAIL: time to first timer render is over the {args.budget_ms:.0f} ms budget", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
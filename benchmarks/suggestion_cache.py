@@ -0,0 +1,97 @@
+# benchmarks/suggestion_cache.py
+"""
+Latency of AI workout suggestions served from the cache (ai_components/suggestion_cache.py).
+
+Stores `--prompts` suggestion lists (as a Gemini answer would be stored),
+then reports:
+
+    memory hit   `get_ai_workout_suggestions` for a cached request, through
+                 the process-wide cache (median)
+    variant hit  the same with the description re-spelled (case, spacing,
+                 trailing punctuation)
+    disk hit     the first lookup after a restart (a fresh cache on the same
+                 SQLite file), i.e. read from disk
+    miss         a lookup for a request never seen (what a new request pays
+                 before going to the API)
+    store        `put` of a new answer, disk write included
+
+The Gemini round trip itself is not measured (no API key in the benchmark
+setup); the generator only calls the API on a miss.
+
+Usage:
+    python -m benchmarks.suggestion_cache [--prompts 500] [--json]
+"""
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+
+_EXERCISES = ["Push-ups", "Squats", "Plank", "Lunges", "Burpees", "Mountain Climbers", "Glute Bridges"]
+
+
+def _median_us(fn, items) -> float:
+    timings = []
+    for item in items:
+        started = time.perf_counter()
+        fn(item)
+        timings.append((time.perf_counter() - started) * 1e6)
+    return round(statistics.median(timings), 1)
+
+
+def measure(prompts: int) -> dict:
+    from ai_components import suggestion_cache
+    from ai_components.workout_generator import get_ai_workout_suggestions
+    from configs.app_config import GEMINI_API_MODEL_NAME
+
+    requests = [(f"{minutes} minute full body, no equipment, level {level}", 45, 15)
+                for minutes in range(5, 65, 5) for level in range(prompts)][:prompts]
+    cache = suggestion_cache.get_suggestion_cache()
+
+    def key(description, workout, rest):
+        return suggestion_cache.cache_key(description, workout, rest, GEMINI_API_MODEL_NAME)
+
+    store_us = _median_us(lambda request: cache.put(key(*request), _EXERCISES), requests)
+    memory_us = _median_us(lambda request: get_ai_workout_suggestions(*request), requests)
+    variants = [(f"  {description.upper()}!! ", workout, rest) for description, workout, rest in requests]
+    variant_results = [get_ai_workout_suggestions(*request) for request in variants]
+
+    restarted = suggestion_cache.SuggestionCache(cache.path)
+    disk_us = _median_us(lambda request: restarted.get(key(*request)), requests)
+    miss_us = _median_us(lambda request: restarted.get(key(*request)),
+                         [(f"never asked {n}", 30, 10) for n in range(prompts)])
+    restarted.close()
+    return {
+        "prompts": len(requests),
+        "store_us": store_us,
+        "memory_hit_us": memory_us,
+        "variant_hits": sum(result == _EXERCISES for result in variant_results),
+        "disk_hit_us": disk_us,
+        "miss_us": miss_us,
+        "cache_file_bytes": os.path.getsize(cache.path),
+        "stats": cache.stats(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--prompts", type=int, default=500)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["AI_SUGGESTION_CACHE_DB"] = os.path.join(tmp, "suggestions.db")  # read when the config is imported
+        r = measure(args.prompts)
+    if args.json:
+        print(json.dumps(r, indent=2))
+        return
+    print(f"{r['prompts']} cached requests ({r['cache_file_bytes'] / 1024:.0f} KiB on disk)")
+    print(f"memory hit   {r['memory_hit_us']:>8.1f} us   (re-spelled variants served: {r['variant_hits']}/{r['prompts']})")
+    print(f"disk hit     {r['disk_hit_us']:>8.1f} us   (after a restart)")
+    print(f"miss         {r['miss_us']:>8.1f} us   (then the API round trip)")
+    print(f"store        {r['store_us']:>8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+# benchmarks/telemetry.py
+"""
+Size and scan cost of the per-second telemetry archive (data_tracking/telemetry.py).
+
+Saves `--days` days of one session a day (20-45 rounds of 45 s work / 15 s
+rest, so ~20-45 minutes each) through the history store, which appends every
+session's trace to the archive, then reports:
+
+    archive size   bytes on disk, against the same seconds stored as one
+                   SQLite row each (session_id, second, phase, exercise,
+                   paused) in a WITHOUT ROWID table
+    append         time `TelemetryArchive.append` takes per session
+    year scan      active seconds per phase over every trace (`scan` +
+                   `seconds_by_phase`), and the Python heap it allocates
+                   (tracemalloc peak), against expanding every trace to
+                   per-second arrays first
+
+Usage:
+    python -m benchmarks.telemetry [--days 365] [--json]
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from benchmarks.history_store import synthetic_record
+from data_tracking import telemetry
+from data_tracking.history_store import HistoryStore
+
+
+def _dir_bytes(root: str) -> int:
+    return sum(os.path.getsize(os.path.join(path, name)) for path, _, names in os.walk(root) for name in names)
+
+
+def _traced(fn):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = fn()
+    elapsed = (time.perf_counter() - started) * 1000
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, round(elapsed, 1), peak
+
+
+def measure(days: int) -> dict:
+    rng = random.Random(days)
+    now = time.time()
+    records = [synthetic_record(now - day * 86400, rounds=rng.randint(20, 45)) for day in range(days, 0, -1)]
+    with tempfile.TemporaryDirectory() as tmp:
+        store = HistoryStore(os.path.join(tmp, "history.db"))
+        store.save_sessions("bench", records)
+        archive = store.telemetry
+        archive_bytes = _dir_bytes(archive.root)
+
+        sessions = [("append", n, record["started_at"], record["events"]) for n, record in enumerate(records)]
+        started = time.perf_counter()
+        archive.append(sessions)
+        append_us = (time.perf_counter() - started) / len(sessions) * 1e6
+
+        traces = list(archive.scan("bench"))
+        seconds = sum(trace.seconds for trace in traces)
+        runs = sum(len(trace.lengths) for trace in traces)
+        rows = sqlite3.connect(os.path.join(tmp, "rows.db"))
+        rows.execute("CREATE TABLE trace (session_id INTEGER, second INTEGER, phase INTEGER, exercise INTEGER,"
+                     " paused INTEGER, PRIMARY KEY (session_id, second)) WITHOUT ROWID")
+        for trace in traces:
+            expanded = trace.expand()
+            rows.executemany("INSERT INTO trace VALUES (?, ?, ?, ?, ?)", zip(
+                [trace.session_id] * trace.seconds, range(trace.seconds),
+                expanded["phase"].tolist(), expanded["exercise"].tolist(), expanded["paused"].tolist()))
+        rows.commit()
+        rows.close()
+        rows_bytes = os.path.getsize(os.path.join(tmp, "rows.db"))
+        del traces
+
+        by_phase, scan_ms, scan_peak = _traced(lambda: telemetry.seconds_by_phase(archive.scan("bench")))
+
+        def expanded_totals():
+            per_second = [trace.expand() for trace in archive.scan("bench")]
+            phases = np.concatenate([second["phase"][second["paused"] == 0] for second in per_second])
+            return np.bincount(phases, minlength=len(telemetry.PHASES))
+
+        _, expand_ms, expand_peak = _traced(expanded_totals)
+        store.close()
+    return {
+        "days": days,
+        "sessions": len(records),
+        "seconds": seconds,
+        "runs": runs,
+        "archive_bytes": archive_bytes,
+        "row_table_bytes": rows_bytes,
+        "append_us_per_session": round(append_us, 1),
+        "scan_ms": scan_ms,
+        "scan_heap_peak_bytes": scan_peak,
+        "expanded_scan_ms": expand_ms,
+        "expanded_heap_peak_bytes": expand_peak,
+        "seconds_by_phase": {str(phase): value for phase, value in by_phase.items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    r = measure(args.days)
+    if args.json:
+        print(json.dumps(r, indent=2))
+        return
+    print(f"{r['sessions']} sessions, {r['seconds']:,} seconds in {r['runs']:,} runs")
+    print(f"archive      {r['archive_bytes'] / 1024:>9.1f} KiB   (one SQLite row per second: "
+          f"{r['row_table_bytes'] / 1024:,.1f} KiB)")
+    print(f"append       {r['append_us_per_session']:>9.1f} us per session")
+    print(f"year scan    {r['scan_ms']:>9.1f} ms   heap peak {r['scan_heap_peak_bytes'] / 1024:>9.1f} KiB")
+    print(f"expanded     {r['expanded_scan_ms']:>9.1f} ms   heap peak {r['expanded_heap_peak_bytes'] / 1024:>9.1f} KiB")
+    print("active seconds by phase: " + ", ".join(f"{k} {v:,}" for k, v in r["seconds_by_phase"].items()))
+
+
+if __name__ == "__main__":
+    main()
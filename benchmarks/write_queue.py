@@ -0,0 +1,153 @@
+# benchmarks/write_queue.py
+"""
+Caller-side cost of saving a session, with and without the write-behind queue.
+
+`--writers` threads (stand-ins for concurrent Streamlit script threads) each
+save `--saves` sessions into a fresh database, first directly through the
+history store and then through `WriteBehindQueue.put`, and report the
+latency the *caller* sees, plus the queue's own counters (queue depth, flush
+latency, batches).
+
+Two more checks:
+
+    lock contention   another connection holds the write lock for
+                      `--lock-ms` while sessions are queued; the writer must
+                      retry and save all of them
+    shutdown flush    a child process queues sessions and exits right away;
+                      all of them must be in the database
+
+Usage:
+    python -m benchmarks.write_queue [--writers 8] [--saves 50] [--json]
+"""
+import argparse
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks.history_store import _percentile, synthetic_record
+from data_tracking.history_store import HistoryStore
+from data_tracking.write_queue import WriteBehindQueue
+
+_CHILD = """
+import sys, time
+from benchmarks.history_store import synthetic_record
+from data_tracking.history_store import HistoryStore
+from data_tracking.write_queue import WriteBehindQueue
+queue = WriteBehindQueue(HistoryStore(sys.argv[1]))
+for _ in range(int(sys.argv[2])):
+    queue.put("shutdown", synthetic_record(time.time()))
+"""
+
+
+def _caller_latencies(save, writers: int, saves: int) -> list[float]:
+    latencies = []
+    barrier = threading.Barrier(writers)
+
+    def writer(n: int):
+        barrier.wait()
+        for _ in range(saves):
+            record = synthetic_record(time.time())
+            started = time.perf_counter()
+            save(f"writer-{n}", record)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies
+
+
+def _summary(latencies: list[float]) -> dict:
+    return {
+        "p50_ms": round(_percentile(latencies, 0.50), 3),
+        "p95_ms": round(_percentile(latencies, 0.95), 3),
+        "max_ms": round(max(latencies), 3),
+    }
+
+
+def measure(writers: int, saves: int, lock_ms: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        store = HistoryStore(os.path.join(tmp, "direct.db"))
+        direct = _caller_latencies(store.save_session, writers, saves)
+        store.close()
+
+        store = HistoryStore(os.path.join(tmp, "queued.db"))
+        write_queue = WriteBehindQueue(store)
+        queued = _caller_latencies(write_queue.put, writers, saves)
+        write_queue.drain()
+        queued_stats = write_queue.stats()
+        saved = sum(store.count_sessions(f"writer-{n}") for n in range(writers))
+
+        # Hold the write lock from another connection while sessions arrive.
+        contention_queue = WriteBehindQueue(store)
+        blocker = sqlite3.connect(store.path, isolation_level=None)
+        blocker.execute("BEGIN IMMEDIATE")
+        # A short busy timeout makes the writer see the lock instead of waiting it out.
+        with store.connection() as conn:
+            conn.execute("PRAGMA busy_timeout = 10")
+        for _ in range(20):
+            contention_queue.put("contention", synthetic_record(time.time()))
+        time.sleep(lock_ms / 1000)
+        blocker.execute("COMMIT")
+        blocker.close()
+        contention_queue.drain()
+        contention_stats = contention_queue.stats()
+        contention_saved = store.count_sessions("contention")
+        store.close()
+
+        shutdown_db = os.path.join(tmp, "shutdown.db")
+        subprocess.run([sys.executable, "-c", _CHILD, shutdown_db, "200"], check=True,
+                       cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        shutdown_saved = HistoryStore(shutdown_db).count_sessions("shutdown")
+    return {
+        "writers": writers,
+        "saves": writers * saves,
+        "direct_save": _summary(direct),
+        "queued_save": _summary(queued),
+        "queued_saved": saved,
+        "queue": queued_stats,
+        "contention": {
+            "lock_ms": lock_ms,
+            "saved": contention_saved,
+            "retries": contention_stats["retries"],
+            "failed": contention_stats["failed"],
+        },
+        "shutdown_flush": {"queued": 200, "saved": shutdown_saved},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--saves", type=int, default=50)
+    parser.add_argument("--lock-ms", type=int, default=300)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    result = measure(args.writers, args.saves, args.lock_ms)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+    for case in ("direct_save", "queued_save"):
+        s = result[case]
+        print(f"{case.replace('_', ' '):<12} caller {s['p50_ms']:>8.3f} ms p50 {s['p95_ms']:>8.3f} ms p95 "
+              f"{s['max_ms']:>8.3f} ms max  ({result['saves']} saves, {result['writers']} writers)")
+    q = result["queue"]
+    print(f"queue        {result['queued_saved']}/{result['saves']} saved in {q['batches']} batches, "
+          f"max depth {q['max_depth']}, flush {q['flush_ms_mean']:.2f} ms mean / {q['flush_ms_max']:.2f} ms max")
+    c = result["contention"]
+    print(f"contention   {c['saved']}/20 saved with the lock held {c['lock_ms']} ms "
+          f"({c['retries']} retries, {c['failed']} failed)")
+    f = result["shutdown_flush"]
+    print(f"shutdown     {f['saved']}/{f['queued']} saved by the atexit flush")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+# benchmarks/ws_client.py
+"""
+A minimal headless "browser" for a running `streamlit run` server.
+
+It speaks Streamlit's websocket protocol directly (protobuf BackMsg /
+ForwardMsg), so benchmarks can measure what really goes over the wire
+without a real browser:
+
+* counts the bytes and messages received,
+* clicks buttons and sets widget values by widget key,
+* honours fragment auto-reruns (`st.fragment(run_every=...)`) the way the
+  frontend does, by sending a fragment-scoped rerun on each interval,
+* counts the fragment runs the server starts by itself (core/scheduler.py).
+
+Custom components (the browser bridge in ui/bridge/) are not executed.
+"""
+import asyncio
+import time
+from dataclasses import dataclass, field
+
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+
+@dataclass
+class TrafficStats:
+    bytes_received: int = 0
+    messages_received: int = 0
+    full_runs: int = 0  # full app runs started by the server
+    script_runs: int = 0  # finished runs, full and fragment-scoped
+    fragment_runs: int = 0  # fragment auto-reruns requested by this client
+    pushed_runs: int = 0  # fragment runs the server started on its own (scheduler)
+    # Seconds from sending a rerun request to receiving its script_finished.
+    # Requests the server coalesces into one run are all answered by it.
+    rerun_latencies: list = field(default_factory=list)
+    run_finished_at: list = field(default_factory=list)  # monotonic timestamps
+
+
+@dataclass
+class SimulatedBrowser:
+    url: str = "ws://127.0.0.1:8501/_stcore/stream"
+    stats: TrafficStats = field(default_factory=TrafficStats)
+
+    def __post_init__(self):
+        self._ws = None
+        self._reader = None
+        self._auto_reruns: dict[str, asyncio.Task] = {}
+        self._widget_ids: dict[str, str] = {}  # widget key -> widget id
+        self._widget_values: dict[str, WidgetState] = {}  # sticky, like the frontend
+        self._run_finished = asyncio.Event()
+        self._pending_since: float | None = None
+        self._message_listeners = []
+
+    # ----- connection ---------------------------------------------------
+    async def connect(self):
+        self._ws = await websockets.connect(
+            self.url, max_size=None, subprotocols=["streamlit"]
+        )
+        self._reader = asyncio.create_task(self._read_loop())
+        await self.rerun()
+
+    async def close(self):
+        self._cancel_auto_reruns()
+        if self._reader:
+            self._reader.cancel()
+        if self._ws:
+            await self._ws.close()
+
+    # ----- outgoing -----------------------------------------------------
+    async def _send_rerun(self, widget_states=None, fragment_id="", is_auto_rerun=False):
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        msg.rerun_script.page_script_hash = ""
+        msg.rerun_script.fragment_id = fragment_id
+        msg.rerun_script.is_auto_rerun = is_auto_rerun
+        for widget in [*self._widget_values.values(), *(widget_states or [])]:
+            msg.rerun_script.widget_states.widgets.append(widget)
+        if self._pending_since is None:
+            self._pending_since = time.monotonic()
+        await self._ws.send(msg.SerializeToString())
+
+    async def rerun(self, widget_states=None, timeout: float = 30):
+        self._run_finished.clear()
+        await self._send_rerun(widget_states)
+        await asyncio.wait_for(self._run_finished.wait(), timeout)
+
+    async def click(self, key: str, timeout: float = 30) -> bool:
+        """Click the button whose widget key is `key`. Returns False if absent."""
+        widget_id = self._widget_ids.get(key)
+        if widget_id is None:
+            return False
+        await self.rerun([WidgetState(id=widget_id, trigger_value=True)], timeout)
+        return True
+
+    async def set_value(self, key: str, timeout: float = 30, **value) -> bool:
+        """Set a widget's value, e.g. `set_value("sb_mode", string_value="x")`."""
+        widget_id = self._widget_ids.get(key)
+        if widget_id is None:
+            return False
+        self._widget_values[key] = WidgetState(id=widget_id, **value)
+        await self.rerun(timeout=timeout)
+        return True
+
+    def on_message(self, callback):
+        """Register `callback(ForwardMsg, size_in_bytes, received_at)`."""
+        self._message_listeners.append(callback)
+
+    # ----- incoming -----------------------------------------------------
+    async def _read_loop(self):
+        async for raw in self._ws:
+            received_at = time.monotonic()
+            self.stats.bytes_received += len(raw)
+            self.stats.messages_received += 1
+            msg = ForwardMsg()
+            msg.ParseFromString(raw)
+            self._handle(msg)
+            for callback in self._message_listeners:
+                callback(msg, len(raw), received_at)
+
+    def _handle(self, msg: ForwardMsg):
+        kind = msg.WhichOneof("type")
+        if kind == "delta":
+            element = msg.delta.new_element
+            kind_of_element = element.WhichOneof("type")
+            widget_id = getattr(getattr(element, kind_of_element, None), "id", "") if kind_of_element else ""
+            if widget_id.startswith("$$ID-"):
+                self._widget_ids[widget_id.split("-", 2)[-1]] = widget_id
+        elif kind == "new_session" and not msg.new_session.fragment_ids_this_run:
+            # A full app run: the frontend drops fragment timers and waits
+            # for the script to re-register them.
+            self.stats.full_runs += 1
+            self._widget_ids.clear()
+            self._cancel_auto_reruns()
+        elif kind == "new_session" and self._pending_since is None:
+            self.stats.pushed_runs += 1
+        elif kind == "script_finished":
+            self.stats.script_runs += 1
+            self.stats.run_finished_at.append(time.monotonic())
+            if self._pending_since is not None:
+                self.stats.rerun_latencies.append(time.monotonic() - self._pending_since)
+                self._pending_since = None
+            self._run_finished.set()
+        elif kind == "auto_rerun":
+            fragment_id = msg.auto_rerun.fragment_id
+            old = self._auto_reruns.pop(fragment_id, None)
+            if old:
+                old.cancel()
+            self._auto_reruns[fragment_id] = asyncio.create_task(
+                self._auto_rerun_loop(fragment_id, msg.auto_rerun.interval)
+            )
+        elif kind == "stop_auto_rerun":
+            self._cancel_auto_reruns()
+
+    def _cancel_auto_reruns(self):
+        for task in self._auto_reruns.values():
+            task.cancel()
+        self._auto_reruns.clear()
+
+    async def _auto_rerun_loop(self, fragment_id: str, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            self.stats.fragment_runs += 1
+            await self._send_rerun(fragment_id=fragment_id, is_auto_rerun=True)
@@ -1,10 +1,36 @@
 # configs/app_config.py
+import os
 
 # Default timer settings (in seconds)
 DEFAULT_WORKOUT_DURATION = 45
 DEFAULT_REST_DURATION = 15
 GET_READY_DURATION = 10
 
+# How often the live timer fragment (digits, phase header, progress bar)
+# refreshes while running. The rest of the page only reruns on real changes.
+LIVE_TIMER_REFRESH_SECONDS = 1.0
+
+# Timer update modes
+# - Server: the live timer fragment reruns every LIVE_TIMER_REFRESH_SECONDS.
+# - Browser: the page receives the upcoming phase plan and animates the
+#   countdown itself; the server only wakes up at phase boundaries.
+TIMER_MODE_SERVER = "Server refresh"
+TIMER_MODE_CLIENT = "Browser countdown"
+TIMER_MODE_OPTIONS = [TIMER_MODE_SERVER, TIMER_MODE_CLIENT]
+DEFAULT_TIMER_MODE = TIMER_MODE_SERVER
+# Phases sent ahead to the browser in client mode (current one included).
+CLIENT_PHASE_PLAN_LENGTH = 3
+# Slack added to the phase-boundary wake-up so the server is never early.
+CLIENT_SYNC_MARGIN_SECONDS = 0.25
+
+# Under `streamlit run`, wake the live timers of all sessions from one
+# server-side scheduler (core/scheduler.py) instead of a browser timer per
+# session. Server mode then refreshes exactly when the displayed second
+# changes; browser-countdown mode at the phase boundary.
+USE_SERVER_SCHEDULER = True
+# Slack added to scheduled wake-ups so the countdown has already moved.
+SCHEDULER_WAKE_MARGIN_SECONDS = 0.02
+
 # Slider options
 MIN_DURATION = 5
 MAX_DURATION = 180
@@ -35,12 +61,97 @@ JS_SOUND_OPTIONS = [
 DEFAULT_WORKOUT_START_SOUND = "Beep_High"
 DEFAULT_REST_START_SOUND = "Beep_Low"
 DEFAULT_SESSION_START_SOUND = "Success"
+# Phase-transition beeps sent ahead to the page and scheduled on its Web
+# Audio clock, so they land on the boundary instead of on the next rerun.
+AUDIO_CUE_LOOKAHEAD_PHASES = 4
 
 # --- Insights Chart Configuration ---
 CHART_TYPE_BAR = "Bar Chart"
 CHART_TYPE_DOUGHNUT = "Doughnut Chart"
-INSIGHTS_CHART_OPTIONS = [CHART_TYPE_DOUGHNUT, CHART_TYPE_BAR]
+CHART_TYPE_LIGHT = "Lightweight Doughnut (SVG)" # inline SVG, no chart library
+INSIGHTS_CHART_OPTIONS = [CHART_TYPE_DOUGHNUT, CHART_TYPE_BAR, CHART_TYPE_LIGHT]
 DEFAULT_INSIGHTS_CHART_TYPE = CHART_TYPE_DOUGHNUT
+# While the timer runs in server mode the insights panel refreshes on its own
+# cadences: the metrics every INSIGHTS_METRICS_REFRESH_SECONDS, the chart
+# every INSIGHTS_CHART_GRANULARITY_SECONDS, drawn from totals rounded down to
+# that granularity (booked with the server scheduler when it is in use). In
+# browser-countdown mode, and in both modes on every phase change, it
+# refreshes with the whole page.
+# Built charts are cached on those rounded totals, at most
+# INSIGHTS_CHART_CACHE_SIZE of them per process.
+INSIGHTS_METRICS_REFRESH_SECONDS = 5
+INSIGHTS_CHART_GRANULARITY_SECONDS = 10
+INSIGHTS_CHART_CACHE_SIZE = 128
+
+# --- Workout History Storage ---
+# SQLite database (WAL mode) behind data_tracking/storage.py; relative paths
+# are resolved against the working directory `streamlit run` is started from.
+HISTORY_DB_PATH = os.environ.get("WORKOUT_HISTORY_DB", "workout_history.db")
+# Connections kept open per process and shared by all sessions.
+HISTORY_DB_POOL_SIZE = 4
+# Seconds a writer waits for another session's write to finish.
+HISTORY_DB_BUSY_TIMEOUT_SECONDS = 5.0
+HISTORY_PAGE_SIZE = 200
+# Finished sessions are queued and written by a background thread
+# (data_tracking/write_queue.py), in batches of up to HISTORY_WRITE_BATCH_SIZE.
+# At most HISTORY_WRITE_QUEUE_SIZE records wait in memory; past that a save
+# waits up to HISTORY_WRITE_ENQUEUE_TIMEOUT_SECONDS for room, then writes
+# directly. A batch that hits a locked database is retried up to
+# HISTORY_WRITE_RETRIES times with exponential backoff. At interpreter
+# shutdown the queue is flushed for up to HISTORY_WRITE_FLUSH_TIMEOUT_SECONDS.
+HISTORY_WRITE_QUEUE_SIZE = 1000
+HISTORY_WRITE_BATCH_SIZE = 100
+HISTORY_WRITE_ENQUEUE_TIMEOUT_SECONDS = 0.05
+HISTORY_WRITE_RETRIES = 5
+HISTORY_WRITE_RETRY_BACKOFF_SECONDS = 0.05
+HISTORY_WRITE_FLUSH_TIMEOUT_SECONDS = 10.0
+# History reads first wait for queued sessions to be written, so a session
+# just saved shows up, but for at most HISTORY_READ_DRAIN_TIMEOUT_SECONDS:
+# with a busy database the page renders without it rather than stalling.
+HISTORY_READ_DRAIN_TIMEOUT_SECONDS = 0.25
+# How far back `load_workout_history` (and the AI feedback) looks by default.
+HISTORY_DEFAULT_DAYS = 30
+# History reads (sessions, rollups) are cached per user until the user's
+# next save (data_tracking/read_cache.py); at most HISTORY_READ_CACHE_ENTRIES
+# reads are kept per process, least recently used dropped first.
+HISTORY_READ_CACHE_ENTRIES = 256
+# Periods shown by the history charts per rollup granularity (day, ISO week,
+# month); the charts read at most this many rollup rows.
+HISTORY_CHART_PERIODS = {"day": 30, "week": 26, "month": 24}
+# The all-time trend on the History page is downsampled (LTTB) to one point
+# per HISTORY_TREND_PX_PER_POINT pixels of chart width, as reported by the
+# browser (HISTORY_TREND_DEFAULT_WIDTH_PX until it has), and never below
+# HISTORY_TREND_MIN_POINTS. Zooming into a shorter range shows more detail.
+HISTORY_TREND_PX_PER_POINT = 3
+HISTORY_TREND_MIN_POINTS = 60
+HISTORY_TREND_DEFAULT_WIDTH_PX = 800
+# History analytics (data_tracking/analytics.py): the rest-to-work trend is
+# averaged over HISTORY_ANALYTICS_TREND_WEEKS weeks, the longest
+# HISTORY_ANALYTICS_TOP_SESSIONS sessions are listed, and results are cached
+# for up to HISTORY_ANALYTICS_CACHE_USERS users per process.
+HISTORY_ANALYTICS_TREND_WEEKS = 4
+HISTORY_ANALYTICS_TOP_SESSIONS = 5
+HISTORY_ANALYTICS_CACHE_USERS = 32
+# Bulk CSV / JSON-lines imports (data_tracking/transfer.py) save
+# HISTORY_IMPORT_BATCH_SIZE sessions per transaction and report at most
+# HISTORY_IMPORT_MAX_ERRORS invalid lines. Uploads on the Import / Export
+# page are limited to HISTORY_IMPORT_MAX_UPLOAD_MB; larger files go through
+# `python -m data_tracking import`.
+HISTORY_IMPORT_BATCH_SIZE = 1000
+HISTORY_IMPORT_MAX_ERRORS = 20
+HISTORY_IMPORT_MAX_UPLOAD_MB = 200
+# Sessions are stored per user; there is no sign-in, so every session of a
+# deployment shares this id unless `st.session_state.user_id` is set.
+DEFAULT_USER_ID = "local"
 
 # --- AI Configuration ---
-GEMINI_API_MODEL_NAME = "gemini-1.5-flash"
\ No newline at end of file
+GEMINI_API_MODEL_NAME = "gemini-1.5-flash"
+# AI workout suggestions are cached (ai_components/suggestion_cache.py) per
+# normalized description, workout/rest seconds and model, for
+# AI_SUGGESTION_CACHE_TTL_SECONDS; at most AI_SUGGESTION_CACHE_MAX_ENTRIES
+# are kept, least recently used dropped first. The cache is shared by all
+# sessions in memory and, unless AI_SUGGESTION_CACHE_PATH is empty, kept in
+# a SQLite file so it survives restarts.
+AI_SUGGESTION_CACHE_PATH = os.environ.get("AI_SUGGESTION_CACHE_DB", "ai_suggestion_cache.db")
+AI_SUGGESTION_CACHE_TTL_SECONDS = 7 * 86400
+AI_SUGGESTION_CACHE_MAX_ENTRIES = 1000
\ No newline at end of file
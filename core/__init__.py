@@ -1,4 +1,5 @@
 # core/__init__.py
 # This file makes the 'core' directory a Python package.
 
-from .session_manager import WorkoutSession
\ No newline at end of file
+from .session_manager import WorkoutSession
+from .session_state import TimerState
@@ -0,0 +1,263 @@
+# workout_app/core/scheduler.py
+"""
+One process-wide scheduler for every running workout timer.
+
+`TimerScheduler` keeps a heap of (due time, key) entries and a single
+daemon thread that sleeps until the earliest one is due, then wakes exactly
+the keys whose next update has arrived. Registering a key again replaces its
+previous entry, so each key has at most one live wake-up.
+The class itself knows nothing about Streamlit and can be driven with any
+callbacks.
+
+`schedule_fragment_rerun` is the Streamlit side: called from inside a
+fragment, it books a fragment-scoped rerun of that fragment for the current
+browser session (keyed on the session and the fragment, so the live timer
+and the insights panel each keep their own wake-up), delivered through the runtime the same way a rerun request
+from the browser is. It returns False when there is no server runtime to
+deliver it (e.g. under AppTest), so callers can fall back to the browser
+timer (`st.fragment(run_every=...)`). `use_server_scheduler` and
+`book_fragment_rerun` wrap that fallback: when a booking fails while the
+page is already set up without browser timers (no event loop, the session
+gone, a shutdown race), the browser session is marked and the app rerun, so
+its fragments go back to `run_every` instead of freezing.
+"""
+import heapq
+import itertools
+import logging
+import threading
+import time
+from collections.abc import Callable, Hashable
+
+from configs.app_config import USE_SERVER_SCHEDULER
+
+_LOGGER = logging.getLogger(__name__)
+
+# Trigger values (button clicks) are one-shot: re-sending them with a
+# scheduled rerun would click the button again.
+_TRIGGER_VALUE_KINDS = {"trigger_value", "string_trigger_value", "chat_input_value"}
+# Session state flag: booking failed, use browser timers for this session.
+_UNSCHEDULED_KEY = "timer_scheduler_unavailable"
+
+
+class TimerScheduler:
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._heap: list[tuple[float, int, Hashable]] = []  # (due_at, seq, key)
+        self._entries: dict[Hashable, tuple[float, int, Callable[[], None]]] = {}
+        self._seq = itertools.count()
+        self._thread: threading.Thread | None = None
+        # Counters, for benchmarks and diagnostics.
+        self.wakeups = 0
+        self.dispatched = 0
+
+    def schedule(self, key: Hashable, due_at: float, callback: Callable[[], None]) -> None:
+        """Call `callback` at `due_at` (on this scheduler's clock), replacing
+        any wake-up already booked under `key`."""
+        with self._cond:
+            seq = next(self._seq)
+            self._entries[key] = (due_at, seq, callback)
+            heapq.heappush(self._heap, (due_at, seq, key))
+            self._compact()
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="workout-timer-scheduler", daemon=True
+                )
+                self._thread.start()
+            elif self._heap[0][1] == seq:
+                self._cond.notify()  # new earliest entry: shorten the sleep
+
+    def schedule_in(self, key: Hashable, delay: float, callback: Callable[[], None]) -> None:
+        self.schedule(key, self._clock() + max(delay, 0.0), callback)
+
+    def cancel(self, key: Hashable) -> None:
+        with self._cond:
+            self._entries.pop(key, None)  # its heap entry is dropped when it surfaces
+
+    def cancel_where(self, predicate: Callable[[Hashable], bool]) -> None:
+        """Cancel every wake-up whose key matches `predicate`."""
+        with self._cond:
+            for key in [key for key in self._entries if predicate(key)]:
+                del self._entries[key]
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._entries)
+
+    def due_at(self, key: Hashable) -> float | None:
+        with self._cond:
+            entry = self._entries.get(key)
+            return entry[0] if entry else None
+
+    def _is_live(self, seq: int, key: Hashable) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and entry[1] == seq
+
+    def _compact(self):
+        # Replaced and cancelled entries stay in the heap until they reach
+        # the top; rebuild it if they start to dominate.
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._heap = [(due, seq, key) for key, (due, seq, _) in self._entries.items()]
+            heapq.heapify(self._heap)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    while self._heap and not self._is_live(self._heap[0][1], self._heap[0][2]):
+                        heapq.heappop(self._heap)
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    delay = self._heap[0][0] - self._clock()
+                    if delay <= 0:
+                        break
+                    self._cond.wait(delay)
+
+                now = self._clock()
+                due = []
+                while self._heap and self._heap[0][0] <= now:
+                    _, seq, key = heapq.heappop(self._heap)
+                    if self._is_live(seq, key):
+                        due.append(self._entries.pop(key)[2])
+                self.wakeups += 1
+
+            for callback in due:
+                try:
+                    callback()
+                except Exception:
+                    _LOGGER.exception("Scheduled timer callback failed.")
+                self.dispatched += 1
+
+
+_scheduler: TimerScheduler | None = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> TimerScheduler:
+    """The scheduler shared by every session in this process."""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = TimerScheduler()
+    return _scheduler
+
+
+# ----------------------------------------------------------------------
+# Streamlit adapter
+# ----------------------------------------------------------------------
+def _session_target():
+    """(runtime, event loop, script run context, fragment id) or None."""
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.scriptrunner_utils.script_run_context import (
+        ThreadState,
+        get_script_run_ctx,
+    )
+
+    ctx = get_script_run_ctx(suppress_warning=True)
+    fragment_id = ThreadState.get().fragment_id
+    if ctx is None or not fragment_id or not Runtime.exists():
+        return None
+    runtime = Runtime.instance()
+    try:
+        loop = runtime._get_async_objs().eventloop
+    except Exception:
+        return None
+    return runtime, loop, ctx, fragment_id
+
+
+def _fragment_rerun_callback(runtime, loop, ctx, fragment_id: str) -> Callable[[], None]:
+    from streamlit.proto.BackMsg_pb2 import BackMsg
+
+    session_id = ctx.session_id
+    session_state = ctx.session_state
+    page_script_hash = ctx.page_script_hash
+
+    def deliver():
+        # Runs on the runtime's event loop, like a BackMsg from the browser.
+        if not runtime.is_active_session(session_id):
+            return
+        msg = BackMsg()
+        msg.rerun_script.page_script_hash = page_script_hash
+        msg.rerun_script.fragment_id = fragment_id
+        msg.rerun_script.is_auto_rerun = True
+        # Current widget values, so a rerun coalesced with a pending one from
+        # the browser does not drop the user's latest input.
+        for widget in session_state.get_widget_states():
+            if widget.WhichOneof("value") not in _TRIGGER_VALUE_KINDS:
+                msg.rerun_script.widget_states.widgets.append(widget)
+        try:
+            runtime.handle_backmsg(session_id, msg)
+        except Exception:
+            _LOGGER.debug("Dropped scheduled rerun for session %s", session_id, exc_info=True)
+
+    def wake():
+        try:
+            loop.call_soon_threadsafe(deliver)
+        except RuntimeError:  # event loop closed: the server is shutting down
+            pass
+
+    return wake
+
+
+def schedule_fragment_rerun(delay: float) -> bool:
+    """
+    Rerun the calling fragment in `delay` seconds, from the shared scheduler.
+
+    Must be called from inside an `st.fragment`. Replaces the wake-up booked
+    earlier for the same fragment of the same browser session. Returns False (booking nothing)
+    when there is no server runtime to deliver the rerun.
+    """
+    target = _session_target()
+    if target is None:
+        return False
+    runtime, loop, ctx, fragment_id = target
+    get_scheduler().schedule_in(
+        (ctx.session_id, fragment_id), delay, _fragment_rerun_callback(runtime, loop, ctx, fragment_id)
+    )
+    return True
+
+
+def cancel_session_reruns() -> None:
+    """Drop the wake-ups booked for the current browser session's fragments, if any."""
+    from streamlit.runtime.scriptrunner_utils.script_run_context import get_script_run_ctx
+
+    ctx = get_script_run_ctx(suppress_warning=True)
+    if ctx is not None and _scheduler is not None:
+        session_id = ctx.session_id
+        _scheduler.cancel_where(lambda key: key[0] == session_id)
+
+
+def server_scheduler_available() -> bool:
+    """True when running under `streamlit run` (there is a runtime to wake)."""
+    from streamlit.runtime import Runtime
+
+    return Runtime.exists()
+
+
+def use_server_scheduler() -> bool:
+    """
+    True when the current browser session's fragments should book their
+    reruns with the shared scheduler (`book_fragment_rerun`) rather than
+    use `run_every`.
+    """
+    import streamlit as st
+
+    return (USE_SERVER_SCHEDULER and server_scheduler_available()
+            and not st.session_state.get(_UNSCHEDULED_KEY, False))
+
+
+def book_fragment_rerun(delay: float) -> None:
+    """
+    `schedule_fragment_rerun`, for fragments set up without `run_every`
+    because `use_server_scheduler()` was True. When nothing could be booked,
+    marks the browser session unscheduled and reruns the app, which sets
+    the fragments up with browser timers again.
+    """
+    import streamlit as st
+
+    if not schedule_fragment_rerun(delay):
+        _LOGGER.warning("Could not book a scheduled rerun; falling back to browser timers for this session.")
+        st.session_state[_UNSCHEDULED_KEY] = True
+        st.rerun(scope="app")
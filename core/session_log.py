@@ -0,0 +1,228 @@
+# workout_app/core/session_log.py
+"""
+Append-only event log of a workout session.
+
+`TimerState` appends one `SessionEvent` per transition:
+
+    start             the timer starts (or restarts after stop)
+    phase_enter       a GET_READY / WORKOUT / REST phase begins
+    exercise_advance  the schedule moves to another exercise
+    pause, resume     the user pauses / resumes
+    stop              the timer stops without resetting
+    reset             the session ends
+
+Phase boundaries are logged at the moment they actually happened on the
+session clock, not when a rerun noticed them.
+
+Rounds, workout time, prep/rest time and per-exercise time are not stored
+anywhere else: they are folded from the events. The fold is incremental (new
+events are applied once, on the next query) and only the still-open interval
+is added at query time, so asking for stats every rerun costs O(1). The
+events, as `to_records()`, are also what gets persisted.
+"""
+from typing import NamedTuple
+
+from configs.app_config import PHASE_WORKOUT
+
+START = "start"
+PHASE_ENTER = "phase_enter"
+EXERCISE_ADVANCE = "exercise_advance"
+PAUSE = "pause"
+RESUME = "resume"
+STOP = "stop"
+RESET = "reset"
+EVENT_KINDS = (START, PHASE_ENTER, EXERCISE_ADVANCE, PAUSE, RESUME, STOP, RESET)
+
+
+class SessionEvent(NamedTuple):
+    at: float  # session clock (monotonic seconds)
+    kind: str
+    phase: str | None = None
+    exercise_index: int | None = None
+    exercise: str | None = None
+
+
+class _Totals:
+    """Running fold of the events applied so far."""
+
+    __slots__ = (
+        "workout", "rest", "paused", "rounds", "phases", "per_exercise",
+        "running", "phase", "exercise", "since", "paused_since", "closed",
+    )
+
+    def __init__(self, closed: list | None = None):
+        self.workout = 0.0
+        self.rest = 0.0  # get-ready and rest phases
+        self.paused = 0.0
+        self.rounds = 0
+        self.phases = 0  # phases entered, get-ready included
+        self.per_exercise: dict[str, float] = {}  # workout seconds by exercise
+        self.running = False
+        self.phase: str | None = None
+        self.exercise: str | None = None
+        self.since: float | None = None  # start of the open interval
+        self.paused_since: float | None = None
+        self.closed = closed  # when a list, every closed interval is recorded
+
+    def close_interval(self, at: float):
+        if self.since is None:
+            return
+        seconds = max(at - self.since, 0.0)
+        if self.phase == PHASE_WORKOUT:
+            self.workout += seconds
+            if self.exercise is not None:
+                self.per_exercise[self.exercise] = self.per_exercise.get(self.exercise, 0.0) + seconds
+        elif self.phase is not None:
+            self.rest += seconds
+        if self.closed is not None and self.phase is not None and seconds > 0:
+            self.closed.append((self.phase, self.exercise, self.since, seconds))
+        self.since = None
+
+    def apply(self, event: SessionEvent):
+        kind, at = event.kind, event.at
+        if kind == START:
+            self.running = True
+            self.since = at
+        elif kind == PHASE_ENTER:
+            self.close_interval(at)
+            if self.phase == PHASE_WORKOUT:
+                self.rounds += 1
+            self.phases += 1
+            self.phase = event.phase
+            self.exercise = event.exercise
+            if self.running and self.paused_since is None:
+                self.since = at
+        elif kind == EXERCISE_ADVANCE:
+            if self.since is not None:
+                self.close_interval(at)
+                self.since = at
+            self.exercise = event.exercise
+        elif kind == PAUSE:
+            self.close_interval(at)
+            self.paused_since = at
+        elif kind == RESUME:
+            if self.paused_since is not None:
+                self.paused += max(at - self.paused_since, 0.0)
+                self.paused_since = None
+            self.since = at
+        elif kind == STOP:
+            if self.paused_since is not None:
+                self.paused += max(at - self.paused_since, 0.0)
+                self.paused_since = None
+            self.close_interval(at)
+            self.running = False
+        elif kind == RESET:
+            self.__init__(self.closed)
+
+    def open_seconds(self, now: float) -> float:
+        return max(now - self.since, 0.0) if self.since is not None else 0.0
+
+
+class SessionLog:
+    __slots__ = ("events", "wall_started_at", "_totals", "_applied")
+
+    def __init__(self, events=(), wall_started_at: float | None = None):
+        self.events: list[SessionEvent] = list(events)
+        self.wall_started_at = wall_started_at  # epoch seconds of the first event
+        self._totals = _Totals()
+        self._applied = 0
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def append(self, at: float, kind: str, phase: str | None = None,
+               exercise_index: int | None = None, exercise: str | None = None):
+        self.events.append(SessionEvent(at, kind, phase, exercise_index, exercise))
+
+    def clear(self):
+        self.events.clear()
+        self.wall_started_at = None
+        self._totals = _Totals()
+        self._applied = 0
+
+    def _folded(self) -> _Totals:
+        totals = self._totals
+        events = self.events
+        while self._applied < len(events):
+            totals.apply(events[self._applied])
+            self._applied += 1
+        return totals
+
+    # ----- derived statistics --------------------------------------------
+    def completed_rounds(self) -> int:
+        return self._folded().rounds
+
+    def phases_entered(self) -> int:
+        """Ordinal of the current phase (1 for get-ready, 0 before start)."""
+        return self._folded().phases
+
+    def workout_seconds(self, now: float) -> float:
+        totals = self._folded()
+        if totals.phase == PHASE_WORKOUT:
+            return totals.workout + totals.open_seconds(now)
+        return totals.workout
+
+    def rest_seconds(self, now: float) -> float:
+        """Prep and rest time; time spent paused is reported here too."""
+        totals = self._folded()
+        rest = totals.rest + totals.paused
+        if totals.phase is not None and totals.phase != PHASE_WORKOUT:
+            rest += totals.open_seconds(now)
+        if totals.paused_since is not None:
+            rest += max(now - totals.paused_since, 0.0)
+        return rest
+
+    def exercise_seconds(self, now: float) -> dict[str, float]:
+        """Workout seconds per exercise name."""
+        totals = self._folded()
+        per_exercise = dict(totals.per_exercise)
+        if totals.phase == PHASE_WORKOUT and totals.exercise is not None:
+            per_exercise[totals.exercise] = per_exercise.get(totals.exercise, 0.0) + totals.open_seconds(now)
+        return per_exercise
+
+    def intervals(self, now: float) -> list[tuple[str, str | None, float, float]]:
+        """
+        Every (phase, exercise, start, seconds) interval actually spent in a
+        phase, paused time excluded; a still-open interval ends at `now`.
+        """
+        totals = _Totals(closed=[])
+        for event in self.events:
+            totals.apply(event)
+        totals.close_interval(now)
+        return totals.closed
+
+    # ----- persistence ---------------------------------------------------
+    def to_records(self) -> list[dict]:
+        """The events as plain dicts, `t` being seconds since the first event."""
+        if not self.events:
+            return []
+        origin = self.events[0].at
+        records = []
+        for event in self.events:
+            record = {"t": round(event.at - origin, 3), "kind": event.kind}
+            if event.phase is not None:
+                record["phase"] = event.phase
+            if event.exercise_index is not None:
+                record["exercise_index"] = event.exercise_index
+            if event.exercise is not None:
+                record["exercise"] = event.exercise
+            records.append(record)
+        return records
+
+    @classmethod
+    def from_records(cls, records, started_at: float = 0.0,
+                     wall_started_at: float | None = None) -> "SessionLog":
+        """Rebuild a log from `to_records()` output, with the first event at `started_at`."""
+        return cls(
+            (
+                SessionEvent(
+                    started_at + record["t"],
+                    record["kind"],
+                    record.get("phase"),
+                    record.get("exercise_index"),
+                    record.get("exercise"),
+                )
+                for record in records
+            ),
+            wall_started_at=wall_started_at,
+        )
@@ -1,16 +1,14 @@
 # workout_app/core/session_manager.py
+import time
+
 import streamlit as st
 from configs.app_config import (
-    PHASE_GET_READY,
     PHASE_WORKOUT,
     PHASE_REST,
     PHASE_PAUSED,
-    GET_READY_DURATION,
 )
+from core.session_state import TimerState
 from utils.helpers import format_time
-# --- CHANGED IMPORT PATH ---
-from utils.streamlit_push_notifications import send_push
-# ---------------------------
 
 
 # ----------------------------------------------------------------------
@@ -26,256 +24,232 @@ _SOUND_URLS: dict[str, str] = {
 
 
 # ----------------------------------------------------------------------
-# Core helper – plays sound with two fallbacks
+# Core helper – queues the sound for the page's sound channel
 # ----------------------------------------------------------------------
-def _play_sound_js(sound_name_or_id: str | None) -> None:
+def _play_sound_js(sound_name_or_id: str | None, cue: str | None = None) -> None:
     """
     Play the chosen sound.
 
-    1. Fire a push-notification that embeds <audio> (works even when
-       AudioContext is still locked on iOS/Android).
-    2. ALSO trigger the legacy `window.playJsSound()` Synth-beep so you
-       still get feedback if notifications are blocked or throttled.
+    The sound is queued in `st.session_state.sound_to_play` and `Home.py`
+    sends it to the page's long-lived sound channel (utils/sound_assets.py),
+    which plays the registered MP3 and falls back to the `window.playJsSound()`
+    synth beep when audio playback is blocked. `cue` names the transition
+    (see `WorkoutSession.get_audio_cues`); the channel skips the sound if
+    it already scheduled that cue on the audio clock.
     """
     if not st.session_state.get("sound_master_enabled", True):
         return
     if not sound_name_or_id or sound_name_or_id.lower() == "none":
         return
 
-    # ------------------------------------------------------------------ #
-    # 1️⃣ Push-notification with UNIQUE TAG (prevents browser merging)
-    # ------------------------------------------------------------------ #
-    import time, random, string
-
-    tag = f"beep-{time.time_ns()}-{random.choice(string.ascii_lowercase)}"
-    sound_url = _SOUND_URLS.get(sound_name_or_id, _SOUND_URLS["Beep_High"])
-
-    # Empty title/body ⇒ no popup text, just invisible notification + audio
-    send_push(
-        title="",
-        body="",
-        sound_path=sound_url,
-        tag=tag,                      # 👈 guarantees a fresh notification
-        only_when_on_other_tab=False,
-    )
-
-    # ------------------------------------------------------------------ #
-    # 2️⃣ Legacy Synth fallback – still used by Home.py
-    # ------------------------------------------------------------------ #
-    st.session_state.sound_to_play = {
-        "name": sound_name_or_id,
-        "trigger": st.session_state.get("sound_trigger_count", 0) + 1,
-    }
     st.session_state.sound_trigger_count = st.session_state.get(
         "sound_trigger_count", 0
     ) + 1
+    st.session_state.sound_to_play = {
+        "name": sound_name_or_id,
+        "trigger": st.session_state.sound_trigger_count,
+        "cue": cue,
+    }
 
 # ----------------------------------------------------------------------
-# Workout-timer state machine (with corrected index logic)
+# Workout-timer state machine (Streamlit adapter)
 # ----------------------------------------------------------------------
+# All timer state lives in one `TimerState` object (core/session_state.py)
+# stored at st.session_state.timer_state. It is driven by the wall clock:
+# a monotonic start timestamp plus the total time spent paused, so a rerun
+# that arrives late simply catches up with every phase boundary it missed.
+# This class supplies the clock, the exercise schedule and the sounds.
 class WorkoutSession:
-    def __init__(self):
-        pass
+    def __init__(self, state: TimerState | None = None, clock=time.monotonic):
+        self.state = st.session_state.timer_state if state is None else state
+        self._clock = clock
+        self.state.set_schedule(tuple(self._schedule()), self._clock())
 
     # ----- utility -----------------------------------------------------
-    def _clear_pause_state(self):
-        st.session_state.phase_before_pause = None
-        st.session_state.time_before_pause = 0
-
-    def _set_time_for_current_phase(self):
-        if st.session_state.current_phase == PHASE_WORKOUT:
-            st.session_state.current_time = st.session_state.workout_duration
-        elif st.session_state.current_phase == PHASE_REST:
-            st.session_state.current_time = st.session_state.rest_duration
-        elif st.session_state.current_phase == PHASE_GET_READY:
-            st.session_state.current_time = GET_READY_DURATION
+    @staticmethod
+    def _schedule() -> list[str]:
+        return st.session_state.get("workout_schedule", [])
 
     # ----- external API ------------------------------------------------
     def update_durations(self, workout_duration: int, rest_duration: int):
-        st.session_state.workout_duration = workout_duration
-        st.session_state.rest_duration = rest_duration
-        if (
-            not st.session_state.get("timer_running", False)
-            and st.session_state.current_phase != PHASE_PAUSED
-        ):
-            st.session_state.current_phase = PHASE_GET_READY
-            st.session_state.current_time = GET_READY_DURATION
-            st.session_state.session_stats_initialized_for_run = False
-            self._clear_pause_state()
+        self.state.set_durations(workout_duration, rest_duration, self._clock())
+
+    def restart_schedule(self):
+        """Go back to the first exercise (used after the schedule is edited)."""
+        self.state.restart_schedule(self._clock())
 
     def start_session(self):
-        if (
-            not st.session_state.get("timer_running", False)
-            and st.session_state.current_phase != PHASE_PAUSED
-        ):
-            st.session_state.timer_running = True
-            if not st.session_state.get("session_stats_initialized_for_run", False):
-                st.session_state.current_phase = PHASE_GET_READY
-                st.session_state.current_time = GET_READY_DURATION
-                st.session_state.accumulated_workout_seconds = 0
-                st.session_state.accumulated_rest_seconds = 0
-                st.session_state.completed_rounds = 0
-                st.session_state.current_exercise_index = 0
-                self._clear_pause_state()
-                _play_sound_js(st.session_state.get("sound_on_session_start"))
-            elif st.session_state.current_time == 0:
-                self._set_time_for_current_phase()
+        if self.state.start(self._clock()):
+            self.state.log.wall_started_at = time.time()
+            _play_sound_js(st.session_state.get("sound_on_session_start"))
 
     def pause_session(self):
-        if (
-            st.session_state.timer_running
-            and st.session_state.current_phase != PHASE_PAUSED
-        ):
-            st.session_state.phase_before_pause = st.session_state.current_phase
-            st.session_state.time_before_pause = st.session_state.current_time
-            st.session_state.current_phase = PHASE_PAUSED
+        self.state.pause(self._clock())
 
     def resume_session(self):
-        if (
-            st.session_state.timer_running
-            and st.session_state.current_phase == PHASE_PAUSED
-        ):
-            st.session_state.current_phase = st.session_state.phase_before_pause
-            st.session_state.current_time = st.session_state.time_before_pause
-            self._clear_pause_state()
+        self.state.resume(self._clock())
 
     def stop_session(self):
-        st.session_state.timer_running = False
-        if st.session_state.current_phase == PHASE_PAUSED:
-            st.session_state.current_phase = st.session_state.phase_before_pause
-            st.session_state.current_time = st.session_state.time_before_pause
-            self._clear_pause_state()
+        self.state.stop(self._clock())
 
     def reset_session_stats(self):
-        st.session_state.timer_running = False
-        st.session_state.current_phase = PHASE_GET_READY
-        st.session_state.current_time = GET_READY_DURATION
-        st.session_state.accumulated_workout_seconds = 0
-        st.session_state.accumulated_rest_seconds = 0
-        st.session_state.completed_rounds = 0
-        st.session_state.current_exercise_index = 0
-        st.session_state.session_stats_initialized_for_run = False
-        self._clear_pause_state()
+        """End the session; a session that got past GET_READY is saved."""
+        finished = self.state.session_stats_initialized_for_run
+        self.state.reset(self._clock())
+        if finished:
+            # Imported here: the history store imports core.session_log.
+            from data_tracking.storage import save_workout_session_data
+
+            save_workout_session_data(self.get_session_record())
+
+    # ----- sounds ------------------------------------------------------
+    @staticmethod
+    def _phase_sound(phase: str) -> str | None:
+        if phase == PHASE_WORKOUT:
+            return st.session_state.get("sound_on_workout_start")
+        if phase == PHASE_REST:
+            return st.session_state.get("sound_on_rest_start")
+        return None
+
+    def _cue_key(self, ordinal: int) -> str:
+        return f"{self.state.log.wall_started_at or 0:.3f}:{ordinal}"
 
     # ----- main tick ---------------------------------------------------
     def tick(self):
-        if not st.session_state.get("timer_running", False):
-            return
-
-        current_phase = st.session_state.current_phase
-
-        if current_phase == PHASE_PAUSED:
-            st.session_state.accumulated_rest_seconds += 1
-            return
-
-        if (
-            current_phase in (PHASE_REST, PHASE_GET_READY)
-            and st.session_state.current_time > 0
-        ):
-            st.session_state.accumulated_rest_seconds += 1
-        elif current_phase == PHASE_WORKOUT and st.session_state.current_time > 0:
-            st.session_state.accumulated_workout_seconds += 1
-
-        if st.session_state.current_time > 0:
-            st.session_state.current_time -= 1
-            return  # still counting down
-
-        # -------------------------------- phase finished ---------------
-        previous_phase = st.session_state.current_phase
-
-        if previous_phase == PHASE_GET_READY:
-            st.session_state.current_phase = PHASE_WORKOUT
-            st.session_state.current_time = st.session_state.workout_duration
-            st.session_state.session_stats_initialized_for_run = True
-            _play_sound_js(st.session_state.get("sound_on_workout_start"))
-
-        elif previous_phase == PHASE_WORKOUT:
-            st.session_state.current_phase = PHASE_REST
-            st.session_state.current_time = st.session_state.rest_duration
-            st.session_state.completed_rounds += 1
-            _play_sound_js(st.session_state.get("sound_on_rest_start"))
-            # Index increment removed from here
-
-        elif previous_phase == PHASE_REST:
-            # Index increment added here
-            schedule = st.session_state.get("workout_schedule", [])
-            if schedule:
-                current_idx = st.session_state.get("current_exercise_index", 0)
-                st.session_state.current_exercise_index = (current_idx + 1) % len(
-                    schedule
-                )
-
-            st.session_state.current_phase = PHASE_WORKOUT
-            st.session_state.current_time = st.session_state.workout_duration
-            _play_sound_js(st.session_state.get("sound_on_workout_start"))
+        entered = self.state.sync(self._clock())
+        if entered in (PHASE_WORKOUT, PHASE_REST):
+            cue = self._cue_key(self.state.log.phases_entered())
+            _play_sound_js(self._phase_sound(entered), cue=cue)
+
+    def phase_change_due(self) -> bool:
+        """True once the clock has run past the end of the current phase."""
+        return self.state.phase_change_due(self._clock())
+
+    def seconds_until_phase_end(self) -> float:
+        """Seconds of real time left in the current phase (0 when idle)."""
+        return self.state.seconds_until_phase_end(self._clock())
+
+    def seconds_until_tick(self) -> float:
+        """Seconds until the displayed countdown next changes (0 when idle)."""
+        return self.state.seconds_until_tick(self._clock())
+
+    def get_phase_plan(self, count: int = 3) -> list[dict]:
+        """
+        The current phase followed by the next `count` phases.
+
+        Each entry has `phase`, `exercise`, `duration` and `ends_in`, the
+        seconds from now until that phase ends. This is what the browser
+        needs to animate the countdown on its own between server syncs.
+        """
+        if not self.is_running_or_paused():
+            return []
+
+        schedule = self._schedule()
+
+        def exercise(idx):
+            return schedule[idx] if 0 <= idx < len(schedule) else None
+
+        now = self._clock()
+        ends_in = self.state.seconds_until_phase_end(now)
+        phase = self.state.running_phase()
+        plan = [{
+            "phase": phase,
+            "exercise": exercise(self.state.current_exercise_index),
+            "duration": self.state.phase_duration(phase),
+            "ends_in": round(ends_in, 3),
+        }]
+        for starts_in, phase, idx, duration in self.state.upcoming_phases(now, count):
+            plan.append({
+                "phase": phase,
+                "exercise": exercise(idx),
+                "duration": duration,
+                "ends_in": round(starts_in + duration, 3),
+            })
+        return plan
+
+    def get_audio_cues(self, count: int) -> list[dict]:
+        """
+        Beeps for the next `count` phase transitions, for the page to
+        schedule on its audio clock.
+
+        Each entry has `key` (stable for that transition across reruns),
+        `in` (seconds from now) and `sound`. Empty unless running with
+        sound enabled.
+        """
+        if not self.is_running() or not st.session_state.get("sound_master_enabled", True):
+            return []
+        ordinal = self.state.log.phases_entered()
+        cues = []
+        for k, (starts_in, phase, _, _) in enumerate(self.state.upcoming_phases(self._clock(), count), 1):
+            sound = self._phase_sound(phase)
+            if sound and sound.lower() != "none":
+                cues.append({"key": self._cue_key(ordinal + k), "in": round(starts_in, 3), "sound": sound})
+        return cues
 
     # ----- getters -----------------------------------------------------
     def get_current_time_display(self) -> str:
-        if st.session_state.get("current_phase") == PHASE_PAUSED:
-            return format_time(st.session_state.get("time_before_pause", 0))
-        return format_time(st.session_state.get("current_time", 0))
+        if self.state.current_phase == PHASE_PAUSED:
+            return format_time(self.state.time_before_pause)
+        return format_time(self.state.current_time)
 
     def get_current_exercise(self) -> str | None:
-        schedule = st.session_state.get("workout_schedule", [])
+        schedule = self._schedule()
         if not schedule:
             return None
-        idx = st.session_state.get("current_exercise_index", 0)
+        idx = self.state.current_exercise_index
         return schedule[idx] if 0 <= idx < len(schedule) else None
 
     def get_next_exercise(self) -> str | None:
-        schedule = st.session_state.get("workout_schedule", [])
+        schedule = self._schedule()
         if len(schedule) < 2:
             return None
-        idx = st.session_state.get("current_exercise_index", 0)
+        idx = self.state.current_exercise_index
         return schedule[(idx + 1) % len(schedule)]
 
     def get_current_phase(self) -> str:
-        return st.session_state.get("current_phase", PHASE_GET_READY)
+        return self.state.current_phase
+
+    def get_durations(self) -> tuple[int, int]:
+        return self.state.workout_duration, self.state.rest_duration
 
     def is_running(self) -> bool:
-        return st.session_state.get("timer_running", False) and st.session_state.get(
-            "current_phase"
-        ) != PHASE_PAUSED
+        return self.state.is_running()
 
     def is_running_or_paused(self) -> bool:
-        return st.session_state.get("timer_running", False)
+        return self.state.timer_running
 
     def is_paused(self) -> bool:
-        return st.session_state.get("timer_running", False) and st.session_state.get(
-            "current_phase"
-        ) == PHASE_PAUSED
+        return self.state.is_paused()
 
     def get_progress_value(self) -> float:
-        phase = st.session_state.current_phase
-        secs_left = st.session_state.current_time
-
-        if phase == PHASE_PAUSED:
-            phase = st.session_state.phase_before_pause
-            secs_left = st.session_state.time_before_pause
-
-        total = (
-            st.session_state.get("workout_duration", 1)
-            if phase == PHASE_WORKOUT
-            else st.session_state.get("rest_duration", 1)
-            if phase == PHASE_REST
-            else GET_READY_DURATION
-            if phase == PHASE_GET_READY
-            else 1
-        )
-        # Handle division by zero or negative total gracefully
-        if total <= 0:
-            return 0.0
-
-        return min(max((total - secs_left) / total, 0.0), 1.0)
+        return self.state.progress()
 
+    # Statistics are derived from the session's event log (core/session_log.py).
     def get_completed_rounds(self) -> int:
-        return st.session_state.get("completed_rounds", 0)
+        return self.state.log.completed_rounds()
 
     def get_total_workout_time(self) -> int:
-        return st.session_state.get("accumulated_workout_seconds", 0)
+        return int(self.state.log.workout_seconds(self._clock()))
 
     def get_total_rest_time(self) -> int:
-        return st.session_state.get("accumulated_rest_seconds", 0)
+        return int(self.state.log.rest_seconds(self._clock()))
+
+    def get_exercise_times(self) -> dict[str, int]:
+        """Workout seconds per exercise name."""
+        return {
+            name: int(seconds)
+            for name, seconds in self.state.log.exercise_seconds(self._clock()).items()
+        }
 
     def get_total_elapsed_active_time(self) -> int:
-        return self.get_total_workout_time() + self.get_total_rest_time()
\ No newline at end of file
+        return self.get_total_workout_time() + self.get_total_rest_time()
+
+    def get_session_record(self) -> dict:
+        """The session as it is persisted: settings plus the raw event log."""
+        return {
+            "started_at": self.state.log.wall_started_at,
+            "workout_duration": self.state.workout_duration,
+            "rest_duration": self.state.rest_duration,
+            "schedule": list(self.state.schedule),
+            "events": self.state.log.to_records(),
+        }
@@ -0,0 +1,367 @@
+# workout_app/core/session_state.py
+"""
+Pure-Python timer state for a workout session.
+
+`TimerState` holds everything the timer needs in one slotted object and
+exposes an explicit transition API (start / pause / resume / stop / reset /
+sync). Every method that depends on time takes `now` (a monotonic timestamp
+in seconds) as an argument, so the state machine can be driven by tests,
+simulations or other front-ends without a Streamlit runtime.
+
+The session position itself comes from a compiled `PhaseTimeline`
+(core/timeline.py): the state only keeps the timeline's origin (where and
+in which phase it was anchored), and every query is one binary search into
+the timeline. Every transition is also appended to `log`, a `SessionLog`
+(core/session_log.py) that the session statistics are derived from.
+
+`core.session_manager.WorkoutSession` is the Streamlit adapter around it: it
+stores one `TimerState` in `st.session_state.timer_state`, supplies the clock
+and plays the sounds.
+"""
+import math
+from dataclasses import dataclass, field
+
+from configs.app_config import (
+    DEFAULT_WORKOUT_DURATION,
+    DEFAULT_REST_DURATION,
+    GET_READY_DURATION,
+    PHASE_GET_READY,
+    PHASE_WORKOUT,
+    PHASE_REST,
+    PHASE_PAUSED,
+)
+from core.session_log import (
+    EXERCISE_ADVANCE,
+    PAUSE,
+    PHASE_ENTER,
+    RESET,
+    RESUME,
+    START,
+    STOP,
+    SessionLog,
+)
+from core.timeline import PhaseTimeline, TimelinePosition
+
+
+@dataclass(slots=True)
+class TimerState:
+    workout_duration: int = DEFAULT_WORKOUT_DURATION
+    rest_duration: int = DEFAULT_REST_DURATION
+    schedule: tuple[str, ...] = ()
+
+    timer_running: bool = False
+    current_phase: str = PHASE_GET_READY
+    current_time: int = GET_READY_DURATION
+    current_exercise_index: int = 0
+    session_stats_initialized_for_run: bool = False
+
+    phase_before_pause: str | None = None
+    time_before_pause: int = 0
+
+    # Wall clock: the session position is always derived from these.
+    session_started_at: float | None = None
+    pause_started_at: float | None = None
+    paused_seconds: float = 0.0
+    stopped_active_seconds: float | None = None
+
+    # Timeline anchor, moved when durations or the schedule change mid-run.
+    timeline_origin: float = 0.0  # active seconds at timeline t=0
+    origin_phase: str = PHASE_GET_READY
+    origin_exercise_index: int = 0
+    phase_segment: int = 0  # timeline segment of the phase last synced
+    _timeline: PhaseTimeline | None = field(default=None, repr=False, compare=False)
+    # [start, end) of the synced phase on the timeline: sync() inside this
+    # window is just a subtraction, no lookup.
+    _synced_start: float = field(default=0.0, repr=False, compare=False)
+    _synced_end: float = field(default=-1.0, repr=False, compare=False)
+    log: SessionLog = field(default_factory=SessionLog, repr=False, compare=False)
+
+    # ----- utility -----------------------------------------------------
+    @property
+    def schedule_length(self) -> int:
+        return len(self.schedule)
+
+    def exercise_name(self, idx: int) -> str | None:
+        return self.schedule[idx] if 0 <= idx < len(self.schedule) else None
+
+    def _log(self, at: float, kind: str, phase: str | None = None, idx: int | None = None):
+        self.log.append(at, kind, phase, idx, None if idx is None else self.exercise_name(idx))
+
+    def phase_duration(self, phase: str | None) -> int:
+        if phase == PHASE_WORKOUT:
+            return self.workout_duration
+        if phase == PHASE_REST:
+            return self.rest_duration
+        if phase == PHASE_GET_READY:
+            return GET_READY_DURATION
+        return 0
+
+    def running_phase(self) -> str:
+        """Phase the clock is in, looking through a pause."""
+        if self.current_phase == PHASE_PAUSED:
+            return self.phase_before_pause
+        return self.current_phase
+
+    def active_elapsed(self, now: float) -> float:
+        """Seconds the session has actually been running (pauses excluded)."""
+        if self.session_started_at is None:
+            return 0.0
+        if self.stopped_active_seconds is not None:
+            return self.stopped_active_seconds
+        paused = self.paused_seconds
+        if self.pause_started_at is not None:
+            paused += now - self.pause_started_at
+        return max(now - self.session_started_at - paused, 0.0)
+
+    def _clear_pause_state(self):
+        self.phase_before_pause = None
+        self.time_before_pause = 0
+        self.pause_started_at = None
+
+    def _reset_clock(self):
+        self.session_started_at = None
+        self.paused_seconds = 0.0
+        self.stopped_active_seconds = None
+        self.timeline_origin = 0.0
+        self.origin_phase = PHASE_GET_READY
+        self.origin_exercise_index = self.current_exercise_index
+        self.phase_segment = 0
+        self._invalidate_timeline()
+
+    def _invalidate_timeline(self):
+        self._timeline = None
+        self._synced_end = -1.0
+
+    def timeline(self) -> PhaseTimeline:
+        """The compiled timeline for the current settings (built on demand)."""
+        if self._timeline is None:
+            self._timeline = PhaseTimeline(
+                self.workout_duration,
+                self.rest_duration,
+                self.schedule_length,
+                self.origin_phase,
+                self.origin_exercise_index,
+            )
+        return self._timeline
+
+    def position(self, now: float) -> TimelinePosition:
+        return self.timeline().position(self.active_elapsed(now) - self.timeline_origin)
+
+    def _rebase(self, now: float):
+        """
+        Re-anchor the timeline at the start of the current phase.
+
+        Called before the durations or schedule change mid-run, so the phases
+        already completed keep their old lengths and the current phase is
+        re-timed from its start with the new settings.
+        """
+        if self.timer_running and self.session_started_at is not None:
+            pos = self.position(now)
+            self.timeline_origin += pos.phase_start
+            self.origin_phase = pos.phase
+            self.origin_exercise_index = pos.exercise_index
+            self.phase_segment = 0
+        else:
+            self.origin_exercise_index = self.current_exercise_index
+        self._invalidate_timeline()
+
+    def _close_pause(self, now: float):
+        if self.pause_started_at is not None:
+            self.paused_seconds += now - self.pause_started_at
+        self.current_phase = self.phase_before_pause
+        self.current_time = self.time_before_pause
+        self._clear_pause_state()
+
+    # ----- transitions -------------------------------------------------
+    def set_durations(self, workout_duration: int, rest_duration: int, now: float):
+        if (workout_duration, rest_duration) != (self.workout_duration, self.rest_duration):
+            self._rebase(now)
+        self.workout_duration = workout_duration
+        self.rest_duration = rest_duration
+        if not self.timer_running and self.current_phase != PHASE_PAUSED:
+            self.current_phase = PHASE_GET_READY
+            self.current_time = GET_READY_DURATION
+            self.session_stats_initialized_for_run = False
+            self._clear_pause_state()
+            self._reset_clock()
+
+    def set_schedule(self, schedule: tuple[str, ...], now: float):
+        if len(schedule) != len(self.schedule):
+            self._rebase(now)
+            self.schedule = schedule
+            if not 0 <= self.origin_exercise_index < max(len(schedule), 1):
+                self._move_to_exercise(0, now)
+        else:
+            self.schedule = schedule
+
+    def restart_schedule(self, now: float):
+        """Continue with the first exercise of the schedule."""
+        self._rebase(now)
+        self._move_to_exercise(0, now)
+
+    def _move_to_exercise(self, idx: int, now: float):
+        changed = idx != self.current_exercise_index
+        self.origin_exercise_index = self.current_exercise_index = idx
+        if changed and self.timer_running and self.session_started_at is not None:
+            self._log(now, EXERCISE_ADVANCE, idx=idx)
+
+    def start(self, now: float) -> bool:
+        """Start (or restart after stop()). Returns True for a fresh session."""
+        if self.timer_running or self.current_phase == PHASE_PAUSED:
+            return False
+        self.timer_running = True
+        if not self.session_stats_initialized_for_run:
+            self.current_phase = PHASE_GET_READY
+            self.current_time = GET_READY_DURATION
+            self.current_exercise_index = 0
+            self._clear_pause_state()
+            self._reset_clock()
+            self.session_started_at = now
+            self.log.clear()
+            self._log(now, START)
+            self._log(now, PHASE_ENTER, PHASE_GET_READY, 0)
+            return True
+        # Restart after stop(): rebase the clock so the stopped interval is
+        # neither counted nor lost.
+        stopped = self.stopped_active_seconds or 0.0
+        self.stopped_active_seconds = None
+        self.session_started_at = now - stopped - self.paused_seconds
+        self._log(now, START)
+        self.sync(now)
+        return False
+
+    def pause(self, now: float):
+        if self.timer_running and self.current_phase != PHASE_PAUSED:
+            self.sync(now)
+            self.phase_before_pause = self.current_phase
+            self.time_before_pause = self.current_time
+            self.pause_started_at = now
+            self.current_phase = PHASE_PAUSED
+            self._log(now, PAUSE)
+
+    def resume(self, now: float):
+        if self.timer_running and self.current_phase == PHASE_PAUSED:
+            self._close_pause(now)
+            self._log(now, RESUME)
+
+    def stop(self, now: float):
+        if self.timer_running:
+            if self.current_phase == PHASE_PAUSED:
+                self._close_pause(now)
+            self.sync(now)
+            if self.session_started_at is not None:
+                self.stopped_active_seconds = self.active_elapsed(now)
+                self._log(now, STOP)
+        self.timer_running = False
+
+    def reset(self, now: float):
+        """End the session. The log keeps its events until the next start."""
+        if self.session_started_at is not None:
+            self._log(now, RESET)
+        self.timer_running = False
+        self.current_phase = PHASE_GET_READY
+        self.current_time = GET_READY_DURATION
+        self.current_exercise_index = 0
+        self.session_stats_initialized_for_run = False
+        self._clear_pause_state()
+        self._reset_clock()
+
+    def sync(self, now: float) -> str | None:
+        """
+        Catch the state up with the clock.
+
+        Looks the session up on the timeline. If one or more phase boundaries
+        were passed since the last call, each is logged at the time it
+        actually happened, and the phase entered by the *last* transition is
+        returned (otherwise None), so a delayed caller gets a single, current
+        event instead of a burst of stale ones.
+        """
+        if not self.timer_running or self.session_started_at is None:
+            return None
+        t = self.active_elapsed(now) - self.timeline_origin
+        if self._synced_start <= t < self._synced_end:
+            self.current_time = math.ceil(self._synced_end - t)
+            return None
+
+        pos = self.timeline().position(t)
+        self._synced_start = pos.phase_start
+        self._synced_end = pos.phase_start + pos.phase_duration
+        if pos.segment != self.phase_segment:
+            self._log_transitions(pos.segment, now - t)
+        self.current_exercise_index = pos.exercise_index
+        self.current_time = max(math.ceil(pos.remaining), 0)
+        if self.current_phase != PHASE_PAUSED:
+            self.current_phase = pos.phase
+
+        if pos.segment == self.phase_segment:
+            return None
+        self.phase_segment = pos.segment
+        if pos.phase != PHASE_GET_READY:
+            self.session_stats_initialized_for_run = True
+        return pos.phase
+
+    def _log_transitions(self, segment: int, clock_origin: float):
+        """Log the phases entered after the last synced one, up to `segment`.
+
+        `clock_origin` is the clock reading at timeline t=0 for the current
+        running stretch (pause() syncs first, so no pause lies in between).
+        """
+        timeline = self.timeline()
+        idx = self.current_exercise_index
+        for k in range(self.phase_segment + 1, segment + 1):
+            starts_at, phase, exercise_index, _ = timeline.segment(k)
+            at = clock_origin + starts_at
+            if exercise_index != idx:
+                idx = exercise_index
+                self._log(at, EXERCISE_ADVANCE, idx=idx)
+            self._log(at, PHASE_ENTER, phase, idx)
+
+    def upcoming_phases(self, now: float, count: int) -> list[tuple[float, str, int, int]]:
+        """
+        The next `count` phases as (starts_in, phase, exercise index,
+        duration), `starts_in` being seconds of active time from now.
+        """
+        if self.session_started_at is None:
+            return []
+        t = self.active_elapsed(now) - self.timeline_origin
+        return [
+            (starts_at - t, phase, idx, duration)
+            for starts_at, phase, idx, duration in self.timeline().upcoming(t, count)
+        ]
+
+    # ----- queries -----------------------------------------------------
+    def is_running(self) -> bool:
+        return self.timer_running and self.current_phase != PHASE_PAUSED
+
+    def is_paused(self) -> bool:
+        return self.timer_running and self.current_phase == PHASE_PAUSED
+
+    def phase_change_due(self, now: float) -> bool:
+        """True once the clock has run past the end of the synced phase."""
+        return self.is_running() and self.position(now).segment != self.phase_segment
+
+    def seconds_until_phase_end(self, now: float) -> float:
+        """Seconds of real time left in the current phase (0 when idle)."""
+        if not self.timer_running or self.session_started_at is None:
+            return 0.0
+        return max(self.position(now).remaining, 0.0)
+
+    def seconds_until_tick(self, now: float) -> float:
+        """Seconds until the displayed countdown next changes (0 when idle)."""
+        remaining = self.seconds_until_phase_end(now)
+        if remaining <= 0:
+            return 0.0
+        return remaining % 1.0 or 1.0
+
+    def progress(self) -> float:
+        phase = self.current_phase
+        secs_left = self.current_time
+        if phase == PHASE_PAUSED:
+            phase = self.phase_before_pause
+            secs_left = self.time_before_pause
+
+        total = self.phase_duration(phase) if phase else 1
+        # Handle division by zero or negative total gracefully
+        if total <= 0:
+            return 0.0
+        return min(max((total - secs_left) / total, 0.0), 1.0)
@@ -0,0 +1,188 @@
+# workout_app/core/timeline.py
+"""
+Compiled phase timeline for a workout session.
+
+Given the durations, the schedule length and the phase the timeline starts
+in, the rest of the session is fully deterministic: an optional GET_READY
+segment followed by an endlessly repeating cycle of WORKOUT/REST segments,
+one pair per exercise. `PhaseTimeline` compiles that cycle once into compact
+arrays (segment start offsets, durations, phase codes, exercise indices and
+cumulative workout/rest/round counts) and answers "where is the session at
+elapsed t" with a single binary search, for any t.
+"""
+from array import array
+from bisect import bisect_right
+from typing import NamedTuple
+
+from configs.app_config import (
+    GET_READY_DURATION,
+    PHASE_GET_READY,
+    PHASE_WORKOUT,
+    PHASE_REST,
+)
+
+_PHASES = (PHASE_GET_READY, PHASE_WORKOUT, PHASE_REST)
+_CODE = {phase: code for code, phase in enumerate(_PHASES)}
+_WORKOUT = _CODE[PHASE_WORKOUT]
+
+
+class TimelinePosition(NamedTuple):
+    """The session at one instant, relative to the timeline start."""
+
+    phase: str
+    exercise_index: int
+    segment: int  # phase number since the timeline start (0-based)
+    elapsed: float
+    phase_start: float
+    phase_duration: int
+    workout_before: float  # workout seconds in phases before this one
+    rest_before: float  # get-ready/rest seconds in phases before this one
+    completed_rounds: int
+
+    @property
+    def remaining(self) -> float:
+        return self.phase_start + self.phase_duration - self.elapsed
+
+    @property
+    def workout_seconds(self) -> float:
+        if self.phase == PHASE_WORKOUT:
+            return self.workout_before + self.elapsed - self.phase_start
+        return self.workout_before
+
+    @property
+    def rest_seconds(self) -> float:
+        if self.phase != PHASE_WORKOUT:
+            return self.rest_before + self.elapsed - self.phase_start
+        return self.rest_before
+
+
+class PhaseTimeline:
+    __slots__ = (
+        "_starts", "_durations", "_phases", "_exercises",
+        "_workout_before", "_rest_before", "_rounds_before",
+        "_prefix_count", "_prefix_seconds", "_cycle_count",
+        "_period", "_period_workout", "_period_rest", "_period_rounds",
+    )
+
+    def __init__(
+        self,
+        workout_duration: int,
+        rest_duration: int,
+        schedule_length: int,
+        start_phase: str = PHASE_GET_READY,
+        start_index: int = 0,
+        get_ready_duration: int = GET_READY_DURATION,
+    ):
+        if workout_duration + rest_duration <= 0:
+            raise ValueError("Workout and rest durations cannot both be zero.")
+        exercises = max(schedule_length, 1)
+
+        segments = []  # (phase code, duration, exercise index)
+        phase, idx = start_phase, start_index % exercises
+        if phase == PHASE_GET_READY:
+            segments.append((_CODE[PHASE_GET_READY], get_ready_duration, idx))
+            phase = PHASE_WORKOUT
+        prefix_count = len(segments)
+        for _ in range(2 * exercises):
+            if phase == PHASE_WORKOUT:
+                segments.append((_WORKOUT, workout_duration, idx))
+                phase = PHASE_REST
+            else:
+                segments.append((_CODE[PHASE_REST], rest_duration, idx))
+                idx = (idx + 1) % exercises
+                phase = PHASE_WORKOUT
+
+        self._starts = array("d")
+        self._durations = array("l")
+        self._phases = array("b")
+        self._exercises = array("l")
+        self._workout_before = array("d")
+        self._rest_before = array("d")
+        self._rounds_before = array("l")
+
+        offset = workout = rest = 0.0
+        rounds = 0
+        for code, duration, exercise in segments:
+            self._starts.append(offset)
+            self._durations.append(duration)
+            self._phases.append(code)
+            self._exercises.append(exercise)
+            self._workout_before.append(workout)
+            self._rest_before.append(rest)
+            self._rounds_before.append(rounds)
+            offset += duration
+            if code == _WORKOUT:
+                workout += duration
+                rounds += 1
+            else:
+                rest += duration
+
+        self._prefix_count = prefix_count
+        self._prefix_seconds = self._starts[prefix_count] if prefix_count else 0.0
+        self._cycle_count = len(segments) - prefix_count
+        self._period = offset - self._prefix_seconds
+        self._period_workout = workout
+        self._period_rest = rest - (self._rest_before[prefix_count] if prefix_count else 0.0)
+        self._period_rounds = rounds
+
+    def _locate(self, t: float) -> tuple[int, int, float]:
+        """(segment slot, completed cycles, t folded into the first cycle)."""
+        if t < self._prefix_seconds:
+            return bisect_right(self._starts, t) - 1, 0, t
+        cycles, into = divmod(t - self._prefix_seconds, self._period)
+        local = self._prefix_seconds + into
+        return bisect_right(self._starts, local) - 1, int(cycles), local
+
+    def position(self, t: float) -> TimelinePosition:
+        """Where the session is `t` seconds after the timeline start."""
+        t = max(t, 0.0)
+        i, cycles, local = self._locate(t)
+        shift = cycles * self._period
+        return TimelinePosition(
+            phase=_PHASES[self._phases[i]],
+            exercise_index=self._exercises[i],
+            segment=i + cycles * self._cycle_count,
+            elapsed=t,
+            phase_start=self._starts[i] + shift,
+            phase_duration=self._durations[i],
+            workout_before=self._workout_before[i] + cycles * self._period_workout,
+            rest_before=self._rest_before[i] + cycles * self._period_rest,
+            completed_rounds=self._rounds_before[i] + cycles * self._period_rounds,
+        )
+
+    def segment(self, k: int) -> tuple[float, str, int, int]:
+        """Segment number `k` as (starts_at, phase, exercise index, duration)."""
+        cycles = 0
+        i = k
+        if k >= self._prefix_count:
+            cycles, j = divmod(k - self._prefix_count, self._cycle_count)
+            i = self._prefix_count + j
+        return (
+            self._starts[i] + cycles * self._period,
+            _PHASES[self._phases[i]],
+            self._exercises[i],
+            self._durations[i],
+        )
+
+    def upcoming(self, t: float, count: int) -> list[tuple[float, str, int, int]]:
+        """
+        The next `count` transitions after `t`.
+
+        Each entry is (starts_at, phase, exercise index, duration), with
+        `starts_at` on the same scale as `t`.
+        """
+        i, cycles, _ = self._locate(max(t, 0.0))
+        end = len(self._starts)
+        transitions = []
+        for _ in range(count):
+            i += 1
+            if i == end:
+                i = self._prefix_count
+                cycles += 1
+            transitions.append((
+                self._starts[i] + cycles * self._period,
+                _PHASES[self._phases[i]],
+                self._exercises[i],
+                self._durations[i],
+            ))
+        return transitions
@@ -0,0 +1,121 @@
+# data_tracking/__main__.py
+"""
+Maintenance commands for the workout history database.
+
+Usage:
+    python -m data_tracking rebuild-rollups [--user USER_ID] [--db PATH]
+    python -m data_tracking rebuild-telemetry [--user USER_ID] [--db PATH]
+    python -m data_tracking import FILE [--format csv|jsonl] [--user USER_ID] [--batch-size N] [--db PATH]
+    python -m data_tracking export FILE [--format csv|jsonl] [--user USER_ID] [--db PATH]
+
+FILE may be "-" for stdin / stdout.
+"""
+import argparse
+import contextlib
+import os
+import sys
+import time
+
+from configs.app_config import DEFAULT_USER_ID, HISTORY_DB_PATH, HISTORY_IMPORT_BATCH_SIZE
+from data_tracking import transfer
+from data_tracking.history_store import HistoryStore
+
+
+def rebuild_rollups(args) -> None:
+    store = HistoryStore(args.db)
+    started = time.perf_counter()
+    count = store.rebuild_rollups(args.user)
+    scope = f"user {args.user!r}" if args.user else "all users"
+    print(f"Rebuilt rollups for {scope} from {count} session(s) in {time.perf_counter() - started:.2f} s.")
+
+
+def rebuild_telemetry(args) -> None:
+    store = HistoryStore(args.db)
+    started = time.perf_counter()
+    count = store.rebuild_telemetry(args.user)
+    scope = f"user {args.user!r}" if args.user else "all users"
+    print(f"Rebuilt the telemetry archive for {scope} from {count} session(s) in "
+          f"{time.perf_counter() - started:.2f} s ({store.telemetry.root}).")
+
+
+def _format(args) -> str:
+    fmt = args.format or transfer.detect_format(args.file)
+    if fmt is None:
+        sys.exit(f"Cannot tell the format of {args.file!r}; pass --format csv or --format jsonl.")
+    return fmt
+
+
+def import_history(args) -> None:
+    fmt = _format(args)
+    store = HistoryStore(args.db)
+    size = os.path.getsize(args.file) if args.file != "-" else None
+    started = time.perf_counter()
+
+    def progress(sessions: int, bytes_read: int) -> None:
+        done = f" ({bytes_read / size:.0%})" if size else ""
+        print(f"\r{sessions:,} session(s) imported{done}", end="", file=sys.stderr, flush=True)
+
+    with contextlib.ExitStack() as stack:
+        file = sys.stdin.buffer if args.file == "-" else stack.enter_context(open(args.file, "rb"))
+        result = transfer.import_history(store, args.user, file, fmt, args.batch_size, progress)
+    print(file=sys.stderr)
+    print(f"Imported {result.sessions:,} session(s) for user {args.user!r} in {time.perf_counter() - started:.2f} s"
+          f" ({result.duplicates:,} already in the history, {result.skipped:,} invalid).")
+    for error in result.errors:
+        print(f"  {error}", file=sys.stderr)
+    store.close()
+
+
+def export_history(args) -> None:
+    fmt = _format(args)
+    store = HistoryStore(args.db)
+    started = time.perf_counter()
+
+    def progress(sessions: int, total: int) -> None:
+        print(f"\r{sessions:,} / {total:,} session(s) exported", end="", file=sys.stderr, flush=True)
+
+    with contextlib.ExitStack() as stack:
+        file = sys.stdout.buffer if args.file == "-" else stack.enter_context(open(args.file, "wb"))
+        count = transfer.export_history(store, args.user, file, fmt, progress)
+    print(file=sys.stderr)
+    print(f"Exported {count:,} session(s) of user {args.user!r} in {time.perf_counter() - started:.2f} s.",
+          file=sys.stderr)
+    store.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m data_tracking", description=__doc__.splitlines()[1])
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--db", default=HISTORY_DB_PATH, help=f"history database (default: {HISTORY_DB_PATH})")
+    transfer_options = argparse.ArgumentParser(add_help=False)
+    transfer_options.add_argument("file", metavar="FILE", help='"-" for stdin / stdout')
+    transfer_options.add_argument("--format", choices=transfer.FORMATS, help="default: from the file extension")
+    transfer_options.add_argument("--user", default=DEFAULT_USER_ID, help=f"user id (default: {DEFAULT_USER_ID})")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rebuild = commands.add_parser("rebuild-rollups", parents=[common],
+                                  help="recompute the day/week/month rollups from the sessions")
+    rebuild.add_argument("--user", help="only this user (default: every user)")
+    rebuild.set_defaults(handler=rebuild_rollups)
+
+    telemetry = commands.add_parser("rebuild-telemetry", parents=[common],
+                                    help="rewrite the per-second telemetry archive from the stored event logs")
+    telemetry.add_argument("--user", help="only this user (default: every user)")
+    telemetry.set_defaults(handler=rebuild_telemetry)
+
+    load = commands.add_parser("import", parents=[common, transfer_options],
+                               help="load a CSV or JSON-lines file into a user's history, in batched transactions")
+    load.add_argument("--batch-size", type=int, default=HISTORY_IMPORT_BATCH_SIZE,
+                      help=f"sessions per transaction (default: {HISTORY_IMPORT_BATCH_SIZE})")
+    load.set_defaults(handler=import_history)
+
+    dump = commands.add_parser("export", parents=[common, transfer_options],
+                               help="write a user's history to a CSV or JSON-lines file")
+    dump.set_defaults(handler=export_history)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
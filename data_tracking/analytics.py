@@ -0,0 +1,204 @@
+# data_tracking/analytics.py
+"""
+Metrics over a user's whole workout history, computed on columnar frames.
+
+`load_frames` reads two pandas DataFrames from the history store, one query
+each: the user's sessions (one column per field, the local day computed by
+SQLite) and the per-exercise weekly rollups (data_tracking/rollups.py),
+which already hold sets and workout seconds per exercise and ISO week, so
+no interval rows are read. Every metric is then a vectorized group-by, diff
+or rolling window over those columns, with no Python loop per session:
+
+    streaks            current and longest run of consecutive training days
+    weekly volume      sets and workout minutes per exercise and ISO week
+    rest-to-work       prep/rest vs. workout time per week, and its rolling
+                       value over `HISTORY_ANALYTICS_TREND_WEEKS` weeks
+    longest sessions   the `HISTORY_ANALYTICS_TOP_SESSIONS` longest sessions
+    personal bests     longest session, most rounds, most workout time in a
+                       day and in a week, most sets of each exercise in a week
+
+Days and weeks are in the server's local time, like the rollups; weeks are
+labelled by their Monday.
+
+`get_history_analytics` caches the result per user (at most
+`HISTORY_ANALYTICS_CACHE_USERS` users, least recently used dropped first),
+keyed on `HistoryStore.history_version` and the date (the current streak
+depends on it), so the next request after a save recomputes it and every
+other request is a dictionary lookup.
+"""
+import collections
+import datetime
+import threading
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from configs.app_config import (
+    HISTORY_ANALYTICS_CACHE_USERS,
+    HISTORY_ANALYTICS_TOP_SESSIONS,
+    HISTORY_ANALYTICS_TREND_WEEKS,
+)
+from data_tracking import rollups
+from data_tracking.history_store import HistoryStore
+
+_SESSION_COLUMNS = {"id": "int64", "started_at": "float64", "duration": "float64", "workout_seconds": "float64",
+                    "rest_seconds": "float64", "rounds": "int64", "day": "int64"}
+_EXERCISE_COLUMNS = {"period": "object", "exercise": "object", "sets": "int64", "workout_seconds": "float64"}
+# Days since 1970-01-01 of the local date a session started on.
+_LOCAL_DAY = "CAST(julianday(started_at, 'unixepoch', 'localtime') + 0.5 AS INTEGER) - 2440588"
+
+
+class HistoryAnalytics(NamedTuple):
+    sessions: int
+    current_streak: int  # days, counting today or, if not trained yet today, yesterday
+    longest_streak: int
+    weekly_volume: pd.DataFrame  # week, exercise, sets, workout_minutes
+    rest_to_work: pd.DataFrame  # indexed by week: workout_minutes, rest_minutes, ratio, ratio_rolling
+    longest_sessions: pd.DataFrame  # started, minutes, workout_minutes, rounds
+    personal_bests: dict
+
+    def summary(self) -> dict:
+        """The headline numbers, as plain values (for prompts and metrics)."""
+        recent = self.rest_to_work["ratio_rolling"].dropna()
+        last_week = self.weekly_volume[self.weekly_volume["week"] == self.weekly_volume["week"].max()]
+        return {
+            "sessions": self.sessions,
+            "current_streak_days": self.current_streak,
+            "longest_streak_days": self.longest_streak,
+            "rest_to_work_ratio": round(float(recent.iloc[-1]), 2) if len(recent) else None,
+            "last_week_minutes_by_exercise": {
+                row.exercise: round(row.workout_minutes, 1) for row in last_week.itertuples()
+            },
+            "personal_bests": self.personal_bests,
+        }
+
+
+# ----- loading --------------------------------------------------------------
+def _frame(conn, sql: str, params: tuple, columns: dict) -> pd.DataFrame:
+    cursor = conn.cursor()
+    cursor.row_factory = None  # plain tuples: much cheaper to fetch than sqlite3.Row
+    rows = cursor.execute(sql, params).fetchall()
+    return pd.DataFrame.from_records(rows, columns=list(columns)).astype(columns)
+
+
+def load_frames(store: HistoryStore, user_id: str) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    The user's sessions (id, started_at, duration, workout_seconds,
+    rest_seconds, rounds, day, week), oldest first, and weekly exercise
+    rollups (week, exercise, sets, workout_seconds).
+    """
+    with store.connection() as conn:
+        sessions = _frame(
+            conn,
+            "SELECT id, started_at, duration, workout_seconds, rest_seconds, rounds, " + _LOCAL_DAY +
+            " FROM sessions WHERE user_id = ? ORDER BY started_at, id",
+            (user_id,), _SESSION_COLUMNS,
+        )
+        exercises = _frame(
+            conn,
+            "SELECT period, exercise, sets, workout_seconds FROM exercise_rollups"
+            " WHERE user_id = ? AND granularity = ? ORDER BY period, exercise",
+            (user_id, rollups.WEEK), _EXERCISE_COLUMNS,
+        )
+    sessions["day"] = pd.to_datetime(sessions["day"].to_numpy().astype("datetime64[D]"))
+    sessions["week"] = sessions["day"] - pd.to_timedelta(sessions["day"].dt.weekday, unit="D")
+    # "2025-W23" -> the Monday of ISO week 23 of ISO year 2025
+    exercises.insert(0, "week", pd.to_datetime(exercises.pop("period") + "-1", format="%G-W%V-%u"))
+    return sessions, exercises
+
+
+# ----- metrics --------------------------------------------------------------
+def streaks(days: pd.Series, today: datetime.date | None = None) -> tuple[int, int]:
+    """(current, longest) runs of consecutive dates among `days`."""
+    unique = np.unique(days.to_numpy(dtype="datetime64[D]"))
+    if not len(unique):
+        return 0, 0
+    ordinal = unique.astype(np.int64)
+    run_ids = np.concatenate(([0], np.cumsum(np.diff(ordinal) != 1)))
+    lengths = np.bincount(run_ids)
+    today = np.datetime64(today or datetime.date.today(), "D").astype(np.int64)
+    current = int(lengths[-1]) if ordinal[-1] >= today - 1 else 0
+    return current, int(lengths.max())
+
+
+def weekly_volume(exercises: pd.DataFrame) -> pd.DataFrame:
+    """Sets and workout minutes per (week, exercise)."""
+    return exercises.assign(workout_minutes=exercises["workout_seconds"] / 60).drop(columns="workout_seconds")
+
+
+def rest_to_work(sessions: pd.DataFrame, window: int = HISTORY_ANALYTICS_TREND_WEEKS) -> pd.DataFrame:
+    """
+    Workout and prep/rest minutes per week (weeks without sessions are
+    zero), their ratio, and the ratio over the last `window` weeks.
+    """
+    weekly = sessions.groupby("week")[["workout_seconds", "rest_seconds"]].sum() / 60
+    weekly.columns = ["workout_minutes", "rest_minutes"]
+    if not weekly.empty:
+        weekly = weekly.reindex(pd.date_range(weekly.index.min(), weekly.index.max(), freq="7D"), fill_value=0.0)
+    weekly.index.name = "week"
+    rolling = weekly.rolling(window, min_periods=1).sum()
+    weekly["ratio"] = weekly["rest_minutes"] / weekly["workout_minutes"].replace(0, np.nan)
+    weekly["ratio_rolling"] = rolling["rest_minutes"] / rolling["workout_minutes"].replace(0, np.nan)
+    return weekly
+
+
+def longest_sessions(sessions: pd.DataFrame, count: int = HISTORY_ANALYTICS_TOP_SESSIONS) -> pd.DataFrame:
+    top = sessions.nlargest(count, "duration")
+    return pd.DataFrame({
+        "started": [datetime.datetime.fromtimestamp(started_at) for started_at in top["started_at"]],
+        "minutes": top["duration"] / 60,
+        "workout_minutes": top["workout_seconds"] / 60,
+        "rounds": top["rounds"],
+    }).reset_index(drop=True)
+
+
+def personal_bests(sessions: pd.DataFrame, exercises: pd.DataFrame) -> dict:
+    if sessions.empty:
+        return {}
+    return {
+        "longest_session_minutes": round(float(sessions["duration"].max()) / 60, 1),
+        "most_rounds": int(sessions["rounds"].max()),
+        "best_day_workout_minutes": round(float(sessions.groupby("day")["workout_seconds"].sum().max()) / 60, 1),
+        "best_week_workout_minutes": round(float(sessions.groupby("week")["workout_seconds"].sum().max()) / 60, 1),
+        "most_sets_in_a_week": {
+            exercise: int(sets) for exercise, sets in exercises.groupby("exercise")["sets"].max().items()
+        },
+    }
+
+
+def compute(sessions: pd.DataFrame, exercises: pd.DataFrame, today: datetime.date | None = None) -> HistoryAnalytics:
+    current, longest = streaks(sessions["day"], today)
+    return HistoryAnalytics(
+        sessions=len(sessions),
+        current_streak=current,
+        longest_streak=longest,
+        weekly_volume=weekly_volume(exercises),
+        rest_to_work=rest_to_work(sessions),
+        longest_sessions=longest_sessions(sessions),
+        personal_bests=personal_bests(sessions, exercises),
+    )
+
+
+# ----- cache ----------------------------------------------------------------
+_cache: collections.OrderedDict = collections.OrderedDict()  # (db path, store instance, user) -> ((version, date), analytics)
+_cache_lock = threading.Lock()
+
+
+def get_history_analytics(store: HistoryStore, user_id: str) -> HistoryAnalytics:
+    """The user's analytics, recomputed only after the user's history changed."""
+    key = (store.path, store.instance, user_id)
+    today = datetime.date.today()
+    stamp = (store.history_version(user_id), today)
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None and cached[0] == stamp:
+            _cache.move_to_end(key)
+            return cached[1]
+    analytics = compute(*load_frames(store, user_id), today)
+    with _cache_lock:
+        _cache[key] = (stamp, analytics)
+        _cache.move_to_end(key)
+        while len(_cache) > HISTORY_ANALYTICS_CACHE_USERS:
+            _cache.popitem(last=False)
+    return analytics
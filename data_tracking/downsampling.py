@@ -0,0 +1,56 @@
+# data_tracking/downsampling.py
+"""
+Shape-preserving downsampling of long series before they are sent to a chart.
+
+`lttb` is Largest-Triangle-Three-Buckets (Steinarsson, 2013): the first and
+last points are kept, the rest is split into equal buckets, and from each
+bucket the point forming the largest triangle with the point kept from the
+previous bucket and the average of the next bucket is kept. Peaks, dips and
+trend changes survive, unlike with plain decimation or bucket averages.
+
+The bucket bounds, the next-bucket averages (`np.add.reduceat`) and the
+triangle areas within a bucket are computed with NumPy; only the walk from
+one bucket to the next is a Python loop (one iteration per output point).
+"""
+import numpy as np
+
+
+def lttb(x, y, threshold: int) -> np.ndarray:
+    """
+    Indices of the `threshold` points of (x, y) that LTTB keeps, ascending.
+    Returns every index when the series is not longer than `threshold`.
+    `x` must be increasing.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if threshold >= n:
+        return np.arange(n)
+    if threshold < 3:
+        raise ValueError("LTTB keeps at least 3 points (first, last and one per bucket).")
+
+    # Buckets for the n - 2 inner points; bounds[i]:bounds[i + 1] is bucket i.
+    bounds = np.floor(np.linspace(1, n - 1, threshold - 1)).astype(int)
+    sizes = np.diff(bounds)
+    avg_x = np.add.reduceat(x[1:n - 1], bounds[:-1] - 1) / sizes
+    avg_y = np.add.reduceat(y[1:n - 1], bounds[:-1] - 1) / sizes
+    # The point after the last bucket is the last point itself.
+    avg_x = np.append(avg_x, x[-1])
+    avg_y = np.append(avg_y, y[-1])
+
+    keep = np.empty(threshold, dtype=int)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = bounds[i], bounds[i + 1]
+        bx, by = x[start:end], y[start:end]
+        # Twice the triangle area; the constant factor does not change the argmax.
+        area = np.abs((x[a] - avg_x[i + 1]) * (by - y[a]) - (x[a] - bx) * (avg_y[i + 1] - y[a]))
+        a = start + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+
+def target_points(width_px: int | None, px_per_point: float, minimum: int, default_width_px: int) -> int:
+    """How many points a chart `width_px` wide can show (the default width when unknown)."""
+    return max(minimum, int((width_px or default_width_px) / px_per_point))
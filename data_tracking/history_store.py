@@ -0,0 +1,433 @@
+# data_tracking/history_store.py
+"""
+SQLite store for the workout history (the backend of data_tracking/storage.py).
+
+Schema (`_SCHEMA`):
+
+    sessions    one row per finished session: user, start time (epoch
+                seconds), settings, the totals folded from its event log, the
+                schedule and the raw events (JSON)
+    intervals   every (phase, exercise, start, seconds) interval of a session,
+                from `SessionLog.intervals`
+    settings    per-user key/value settings (JSON values)
+
+plus the day/week/month rollups of data_tracking/rollups.py, which are
+updated in the same transaction as every save. Once a batch is committed,
+the per-second traces of its sessions are appended to the telemetry archive
+(data_tracking/telemetry.py) next to the database.
+
+Sessions are indexed on (user_id, started_at), so a user's date range is an
+index range scan however long the history gets.
+
+The database runs in WAL mode: readers never block the writer and the writer
+never blocks readers. Writes from concurrent Streamlit sessions are short
+`BEGIN IMMEDIATE` transactions that wait on each other for at most
+`HISTORY_DB_BUSY_TIMEOUT_SECONDS` instead of failing. A process keeps a small
+pool of open connections (`HISTORY_DB_POOL_SIZE`) shared by all sessions;
+`get_history_store()` returns the process-wide store.
+"""
+import contextlib
+import itertools
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+from configs.app_config import (
+    HISTORY_DB_BUSY_TIMEOUT_SECONDS,
+    HISTORY_DB_PATH,
+    HISTORY_DB_POOL_SIZE,
+    HISTORY_PAGE_SIZE,
+)
+from core.session_log import RESET, SessionLog
+from data_tracking import rollups, telemetry
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 3  # 2: rollup tables, 3: telemetry archive
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id               INTEGER PRIMARY KEY,
+    user_id          TEXT    NOT NULL,
+    started_at       REAL    NOT NULL,
+    duration         REAL    NOT NULL,
+    workout_duration INTEGER NOT NULL,
+    rest_duration    INTEGER NOT NULL,
+    workout_seconds  REAL    NOT NULL,
+    rest_seconds     REAL    NOT NULL,
+    rounds           INTEGER NOT NULL,
+    schedule         TEXT    NOT NULL,
+    events           TEXT    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_user_started ON sessions (user_id, started_at);
+
+CREATE TABLE IF NOT EXISTS intervals (
+    session_id INTEGER NOT NULL REFERENCES sessions (id) ON DELETE CASCADE,
+    seq        INTEGER NOT NULL,
+    phase      TEXT    NOT NULL,
+    exercise   TEXT,
+    start      REAL    NOT NULL,
+    seconds    REAL    NOT NULL,
+    PRIMARY KEY (session_id, seq)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS settings (
+    user_id    TEXT NOT NULL,
+    key        TEXT NOT NULL,
+    value      TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (user_id, key)
+) WITHOUT ROWID;
+""" + rollups.SCHEMA
+
+_SUMMARY_COLUMNS = (
+    "id", "started_at", "duration", "workout_duration", "rest_duration",
+    "workout_seconds", "rest_seconds", "rounds", "schedule",
+)
+
+
+def summarize(record: dict) -> tuple[dict, list[tuple]]:
+    """
+    The stored form of one `WorkoutSession.get_session_record()`: the
+    session's summary columns and its intervals, folded from the events.
+    """
+    events = record.get("events") or []
+    end = events[-1]["t"] if events else 0.0
+    # The closing reset clears the running fold, so the totals are taken
+    # from the events before it, at the time of the reset.
+    log = SessionLog.from_records([event for event in events if event["kind"] != RESET])
+    summary = summary_columns(record, end, log.workout_seconds(end), log.rest_seconds(end), log.completed_rounds())
+    return summary, log.intervals(end)
+
+
+def summary_columns(record: dict, duration: float, workout_seconds: float, rest_seconds: float,
+                    rounds: int) -> dict:
+    """The sessions row of a session record, given the totals of its events."""
+    return {
+        "started_at": record.get("started_at") or time.time(),
+        "duration": duration,
+        "workout_duration": int(record.get("workout_duration") or 0),
+        "rest_duration": int(record.get("rest_duration") or 0),
+        "workout_seconds": round(workout_seconds, 3),
+        "rest_seconds": round(rest_seconds, 3),
+        "rounds": rounds,
+        "schedule": json.dumps(list(record.get("schedule") or [])),
+        "events": json.dumps(record.get("events") or [], separators=(",", ":")),
+    }
+
+
+_instances = itertools.count(1)
+
+
+class HistoryStore:
+    def __init__(self, path: str = HISTORY_DB_PATH, pool_size: int = HISTORY_DB_POOL_SIZE,
+                 telemetry_root: str | None = None):
+        self.path = path
+        # Tells stores apart even at the same path: their versions both start at 0.
+        self.instance = next(_instances)
+        self.telemetry = telemetry.TelemetryArchive(telemetry_root or telemetry.default_root(path))
+        self._pool: queue.LifoQueue = queue.LifoQueue(maxsize=pool_size)
+        self._opened = 0
+        self._lock = threading.Lock()
+        self._versions: dict[str, int] = {}  # per user, bumped on every save
+        with self.connection() as conn:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            conn.executescript(_SCHEMA)
+        if 0 < version < 2:
+            self.rebuild_rollups()  # sessions saved before the rollup tables existed
+        if 0 < version < 3:
+            self.rebuild_telemetry()  # sessions saved before the telemetry archive existed
+        with self.connection() as conn:
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    # ----- connections ----------------------------------------------------
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.path,
+            timeout=HISTORY_DB_BUSY_TIMEOUT_SECONDS,
+            isolation_level=None,  # transactions are explicit
+            check_same_thread=False,  # pooled: used by one thread at a time
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA foreign_keys = ON")
+        return conn
+
+    @contextlib.contextmanager
+    def connection(self):
+        """A pooled connection, returned to the pool afterwards."""
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                opened = self._opened < self._pool.maxsize
+                if opened:
+                    self._opened += 1
+            conn = self._connect() if opened else self._pool.get()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self._pool.put(conn)
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """A write transaction; the write lock is taken up front."""
+        with self.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+        self._opened = 0
+
+    # ----- sessions -------------------------------------------------------
+    def save_sessions(self, user_id: str, records: list[dict]) -> list[int]:
+        """Stores `records` (session records) in one transaction; returns their ids."""
+        return self.save_entries([(user_id, record) for record in records])
+
+    def save_entries(self, entries: list[tuple[str, dict]]) -> list[int]:
+        """Stores (user_id, record) pairs in one transaction; returns their ids."""
+        return self.save_summarized([(user_id, record, *summarize(record)) for user_id, record in entries])
+
+    def save_summarized(self, entries: list[tuple[str, dict, dict, list[tuple]]]) -> list[int]:
+        """
+        `save_entries` for (user_id, record, summary, intervals) entries
+        whose record is already summarized (`summarize`).
+        """
+        rows = [(user_id, summary, intervals) for user_id, _, summary, intervals in entries]
+        ids = []
+        interval_rows = []
+        with self.transaction() as conn:
+            for user_id, summary, intervals in rows:
+                cursor = conn.execute(
+                    "INSERT INTO sessions (user_id, started_at, duration, workout_duration, rest_duration,"
+                    " workout_seconds, rest_seconds, rounds, schedule, events)"
+                    " VALUES (:user_id, :started_at, :duration, :workout_duration, :rest_duration,"
+                    " :workout_seconds, :rest_seconds, :rounds, :schedule, :events)",
+                    {"user_id": user_id, **summary},
+                )
+                session_id = cursor.lastrowid
+                interval_rows.extend((session_id, seq, *interval) for seq, interval in enumerate(intervals))
+                ids.append(session_id)
+            conn.executemany(
+                "INSERT INTO intervals (session_id, seq, phase, exercise, start, seconds) VALUES (?, ?, ?, ?, ?, ?)",
+                interval_rows,
+            )
+            rollups.add_sessions(conn, rows)
+        with self._lock:
+            for user_id in {user_id for user_id, *_ in entries}:
+                self._versions[user_id] = self._versions.get(user_id, 0) + 1
+        try:
+            self.telemetry.append(
+                (user_id, session_id, summary["started_at"], record.get("events") or [])
+                for (user_id, record, summary, _), session_id in zip(entries, ids)
+            )
+        except (OSError, ValueError, OverflowError) as exc:
+            # The sessions are saved; only their traces are missing (see rebuild_telemetry).
+            logger.error("Could not archive the telemetry of %d session(s): %s", len(ids), exc)
+        return ids
+
+    def save_session(self, user_id: str, record: dict) -> int:
+        return self.save_sessions(user_id, [record])[0]
+
+    def sessions_page(self, user_id: str, since: float | None = None, until: float | None = None,
+                      limit: int = HISTORY_PAGE_SIZE, cursor: tuple | None = None,
+                      include_events: bool = False) -> tuple[list[dict], tuple | None]:
+        """
+        One page of a user's sessions, newest first, started in [since, until).
+
+        Returns the rows and the cursor of the next page (None on the last
+        one). Paging is keyset-based, so every page costs the same.
+        """
+        columns = _SUMMARY_COLUMNS + (("events",) if include_events else ())
+        sql = [f"SELECT {', '.join(columns)} FROM sessions WHERE user_id = ?"]
+        params: list = [user_id]
+        if since is not None:
+            sql.append("AND started_at >= ?")
+            params.append(since)
+        if until is not None:
+            sql.append("AND started_at < ?")
+            params.append(until)
+        if cursor is not None:
+            sql.append("AND (started_at, id) < (?, ?)")
+            params.extend(cursor)
+        sql.append("ORDER BY started_at DESC, id DESC LIMIT ?")
+        params.append(limit)
+        with self.connection() as conn:
+            rows = [_session_dict(row) for row in conn.execute(" ".join(sql), params)]
+        next_cursor = (rows[-1]["started_at"], rows[-1]["id"]) if len(rows) == limit else None
+        return rows, next_cursor
+
+    def iter_sessions(self, user_id: str, since: float | None = None, until: float | None = None,
+                      page_size: int = HISTORY_PAGE_SIZE, include_events: bool = False):
+        """Every matching session, newest first, fetched a page at a time."""
+        cursor = None
+        while True:
+            rows, cursor = self.sessions_page(user_id, since, until, page_size, cursor, include_events)
+            yield from rows
+            if cursor is None:
+                return
+
+    def session_intervals(self, session_id: int) -> list[dict]:
+        with self.connection() as conn:
+            return [
+                dict(row) for row in conn.execute(
+                    "SELECT phase, exercise, start, seconds FROM intervals WHERE session_id = ? ORDER BY seq",
+                    (session_id,),
+                )
+            ]
+
+    def history_version(self, user_id: str) -> int:
+        """
+        Changes whenever sessions of `user_id` are saved through this store,
+        so results derived from a user's history can be cached on it. Saves
+        made by other processes are not seen. Versions are per store: key
+        caches on `instance` too.
+        """
+        return self._versions.get(user_id, 0)
+
+    def iter_session_records(self, user_id: str):
+        """
+        Every session of a user as a session record (the shape
+        `save_entries` takes), oldest first, read a page at a time on one
+        cursor.
+        """
+        with self.connection() as conn:
+            rows = conn.execute(
+                "SELECT started_at, workout_duration, rest_duration, schedule, events FROM sessions"
+                " WHERE user_id = ? ORDER BY started_at, id",
+                (user_id,),
+            )
+            while batch := rows.fetchmany(HISTORY_PAGE_SIZE):
+                for row in batch:
+                    yield {
+                        "started_at": row["started_at"],
+                        "workout_duration": row["workout_duration"],
+                        "rest_duration": row["rest_duration"],
+                        "schedule": json.loads(row["schedule"]),
+                        "events": json.loads(row["events"]),
+                    }
+
+    def iter_interval_rows(self, user_id: str):
+        """(session id, started_at, phase, exercise, seconds) of every interval of a user, oldest session first."""
+        with self.connection() as conn:
+            rows = conn.execute(
+                "SELECT s.id, s.started_at, i.phase, i.exercise, i.seconds FROM sessions s"
+                " JOIN intervals i ON i.session_id = s.id WHERE s.user_id = ? ORDER BY s.started_at, s.id, i.seq",
+                (user_id,),
+            )
+            while batch := rows.fetchmany(HISTORY_PAGE_SIZE):
+                yield from (tuple(row) for row in batch)
+
+    def count_sessions(self, user_id: str) -> int:
+        with self.connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM sessions WHERE user_id = ?", (user_id,)).fetchone()[0]
+
+    # ----- rollups --------------------------------------------------------
+    def rebuild_rollups(self, user_id: str | None = None) -> int:
+        """Recomputes the rollups from the sessions; returns the sessions read."""
+        with self.transaction() as conn:
+            return rollups.rebuild(conn, user_id)
+
+    def rollup_rows(self, user_id: str, granularity: str, since_period: str,
+                    until_period: str | None = None) -> list[dict]:
+        """A user's rollups of one granularity in [since_period, until_period], oldest first."""
+        sql = ("SELECT period, sessions, rounds, workout_seconds, rest_seconds FROM rollups"
+               " WHERE user_id = ? AND granularity = ? AND period >= ?")
+        params = [user_id, granularity, since_period]
+        if until_period is not None:
+            sql += " AND period <= ?"
+            params.append(until_period)
+        with self.connection() as conn:
+            return [dict(row) for row in conn.execute(sql + " ORDER BY period", params)]
+
+    def rollup_bounds(self, user_id: str, granularity: str) -> tuple[str, str] | None:
+        """The first and last period a user has rollups for (None without history)."""
+        with self.connection() as conn:
+            first, last = conn.execute(
+                "SELECT MIN(period), MAX(period) FROM rollups WHERE user_id = ? AND granularity = ?",
+                (user_id, granularity),
+            ).fetchone()
+        return (first, last) if first is not None else None
+
+    def exercise_rollup_rows(self, user_id: str, granularity: str, since_period: str) -> list[dict]:
+        with self.connection() as conn:
+            return [
+                dict(row) for row in conn.execute(
+                    "SELECT period, exercise, sets, workout_seconds FROM exercise_rollups"
+                    " WHERE user_id = ? AND granularity = ? AND period >= ? ORDER BY period, exercise",
+                    (user_id, granularity, since_period),
+                )
+            ]
+
+    # ----- telemetry ------------------------------------------------------
+    def rebuild_telemetry(self, user_id: str | None = None) -> int:
+        """Rewrites the telemetry archive from the stored event logs; returns the sessions read."""
+        where, params = ("WHERE user_id = ?", (user_id,)) if user_id is not None else ("", ())
+        self.telemetry.remove(user_id)
+        count = 0
+        with self.connection() as conn:
+            rows = conn.execute(f"SELECT id, user_id, started_at, events FROM sessions {where} ORDER BY id", params)
+            while batch := rows.fetchmany(HISTORY_PAGE_SIZE):
+                self.telemetry.append(
+                    (row["user_id"], row["id"], row["started_at"], json.loads(row["events"])) for row in batch
+                )
+                count += len(batch)
+        return count
+
+    # ----- settings -------------------------------------------------------
+    def save_settings(self, user_id: str, settings: dict) -> None:
+        now = time.time()
+        with self.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO settings (user_id, key, value, updated_at) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT (user_id, key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at",
+                [(user_id, key, json.dumps(value), now) for key, value in settings.items()],
+            )
+
+    def load_settings(self, user_id: str) -> dict:
+        with self.connection() as conn:
+            return {
+                row["key"]: json.loads(row["value"])
+                for row in conn.execute("SELECT key, value FROM settings WHERE user_id = ?", (user_id,))
+            }
+
+
+def _session_dict(row: sqlite3.Row) -> dict:
+    session = dict(row)
+    session["schedule"] = json.loads(session["schedule"])
+    if "events" in session:
+        session["events"] = json.loads(session["events"])
+    return session
+
+
+_store: HistoryStore | None = None
+_store_pid: int | None = None
+_store_lock = threading.Lock()
+
+
+def get_history_store() -> HistoryStore:
+    """The process-wide store (reopened in a forked child)."""
+    global _store, _store_pid
+    if _store is None or _store_pid != os.getpid():
+        with _store_lock:
+            if _store is None or _store_pid != os.getpid():
+                _store = HistoryStore()
+                _store_pid = os.getpid()
+    return _store
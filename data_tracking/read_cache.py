@@ -0,0 +1,96 @@
+# data_tracking/read_cache.py
+"""
+Read-through cache of history reads, shared by every session of the process.
+
+Each entry is keyed on (user, read), e.g. ("local", ("sessions", 30)), and
+stamped with the user's `HistoryStore.history_version`, which every save
+through the store bumps (the write-behind queue and bulk imports included).
+A read whose stamp still matches is answered from memory; the first read
+after a save goes to the database and replaces the entry. So a rerun that
+changed nothing never touches SQLite.
+
+* Bounded: at most `HISTORY_READ_CACHE_ENTRIES` entries, the least recently
+  used dropped first.
+* Shared: cached values are handed to every caller as they are, so callers
+  must not modify them.
+* Per process: like `history_version`, saves made by another process are
+  not seen.
+
+`stats()` reports hits, misses and evictions.
+"""
+import collections
+import threading
+
+from configs.app_config import HISTORY_READ_CACHE_ENTRIES
+from data_tracking.history_store import HistoryStore, get_history_store
+
+
+class HistoryReadCache:
+    def __init__(self, store: HistoryStore, max_entries: int = HISTORY_READ_CACHE_ENTRIES):
+        self.store = store
+        self.max_entries = max_entries
+        self._entries: collections.OrderedDict = collections.OrderedDict()  # (user, key) -> (version, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def read(self, user_id: str, key: tuple, load):
+        """
+        The cached result of the read `key` of `user_id`'s history, or
+        `load()` (stored for the next call) when the user saved since.
+        """
+        entry_key = (user_id, key)
+        # Taken before loading: a save that lands while `load` runs leaves
+        # the entry stamped with the older version, so the next read misses.
+        version = self.store.history_version(user_id)
+        with self._lock:
+            entry = self._entries.get(entry_key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(entry_key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        value = load()
+        with self._lock:
+            entry = self._entries.get(entry_key)
+            if entry is not None and entry[0] > version:
+                # A newer read finished while this one ran: keep its entry.
+                return value
+            self._entries[entry_key] = (version, value)
+            self._entries.move_to_end(entry_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            }
+
+
+_read_cache: HistoryReadCache | None = None
+_read_cache_lock = threading.Lock()
+
+
+def get_read_cache() -> HistoryReadCache:
+    """The process-wide cache in front of `get_history_store()`."""
+    global _read_cache
+    store = get_history_store()
+    if _read_cache is None or _read_cache.store is not store:
+        with _read_cache_lock:
+            if _read_cache is None or _read_cache.store is not store:
+                _read_cache = HistoryReadCache(store)
+    return _read_cache
@@ -0,0 +1,183 @@
+# data_tracking/rollups.py
+"""
+Pre-aggregated history per day, ISO week and month.
+
+    rollups            per (user, granularity, period): sessions, rounds,
+                       workout seconds, prep/rest seconds
+    exercise_rollups   per (user, granularity, period, exercise): sets and
+                       workout seconds
+
+Period keys sort as text: "2025-06-03" (day), "2025-W23" (ISO week, ISO
+year), "2025-06" (month), all in the server's local time.
+
+`HistoryStore.save_entries` adds every saved session to the rollups in the
+same transaction (`add_sessions`), so they never drift from the sessions
+table, and the historical charts read a bounded number of rollup rows
+instead of scanning sessions. `rebuild` recomputes them from the stored
+sessions for backfills (`python -m data_tracking rebuild-rollups`).
+"""
+import datetime
+import itertools
+import sqlite3
+
+from configs.app_config import PHASE_WORKOUT
+
+DAY = "day"
+WEEK = "week"
+MONTH = "month"
+GRANULARITIES = (DAY, WEEK, MONTH)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rollups (
+    user_id         TEXT    NOT NULL,
+    granularity     TEXT    NOT NULL,
+    period          TEXT    NOT NULL,
+    sessions        INTEGER NOT NULL,
+    rounds          INTEGER NOT NULL,
+    workout_seconds REAL    NOT NULL,
+    rest_seconds    REAL    NOT NULL,
+    PRIMARY KEY (user_id, granularity, period)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS exercise_rollups (
+    user_id         TEXT    NOT NULL,
+    granularity     TEXT    NOT NULL,
+    period          TEXT    NOT NULL,
+    exercise        TEXT    NOT NULL,
+    sets            INTEGER NOT NULL,
+    workout_seconds REAL    NOT NULL,
+    PRIMARY KEY (user_id, granularity, period, exercise)
+) WITHOUT ROWID;
+"""
+
+
+def period_key(granularity: str, day: datetime.date) -> str:
+    if granularity == DAY:
+        return day.isoformat()
+    if granularity == WEEK:
+        iso = day.isocalendar()
+        return f"{iso.year}-W{iso.week:02d}"
+    return f"{day.year}-{day.month:02d}"
+
+
+def period_keys(started_at: float) -> dict[str, str]:
+    """The day, week and month a session started at `started_at` falls in."""
+    day = datetime.datetime.fromtimestamp(started_at).date()
+    return {granularity: period_key(granularity, day) for granularity in GRANULARITIES}
+
+
+def recent_periods(granularity: str, count: int, today: datetime.date | None = None) -> list[str]:
+    """The last `count` period keys up to and including today's, oldest first."""
+    day = today or datetime.date.today()
+    keys = []
+    while len(keys) < count:
+        key = period_key(granularity, day)
+        if not keys or keys[-1] != key:
+            keys.append(key)
+        if granularity == DAY:
+            day -= datetime.timedelta(days=1)
+        elif granularity == WEEK:
+            day -= datetime.timedelta(weeks=1)
+        else:
+            day = day.replace(day=1) - datetime.timedelta(days=1)
+    return keys[::-1]
+
+
+def exercise_sets(intervals) -> dict[str, list]:
+    """
+    {exercise: [sets, workout seconds]} from (phase, exercise, seconds)
+    intervals in order. A workout interval that directly continues one of
+    the same exercise (split by a pause) is the same set.
+    """
+    sets: dict[str, list] = {}
+    previous = None
+    for phase, exercise, seconds in intervals:
+        current = (phase, exercise)
+        if phase == PHASE_WORKOUT and exercise is not None:
+            entry = sets.setdefault(exercise, [0, 0.0])
+            if current != previous:
+                entry[0] += 1
+            entry[1] += seconds
+        previous = current
+    return sets
+
+
+class RollupBatch:
+    """Rollup increments for a batch of sessions, applied with one upsert per row."""
+
+    def __init__(self):
+        self.totals: dict[tuple, list] = {}
+        self.exercises: dict[tuple, list] = {}
+
+    def add(self, user_id: str, started_at: float, rounds: int, workout_seconds: float,
+            rest_seconds: float, sets: dict[str, list]) -> None:
+        for granularity, period in period_keys(started_at).items():
+            totals = self.totals.setdefault((user_id, granularity, period), [0, 0, 0.0, 0.0])
+            totals[0] += 1
+            totals[1] += rounds
+            totals[2] += workout_seconds
+            totals[3] += rest_seconds
+            for exercise, (count, seconds) in sets.items():
+                entry = self.exercises.setdefault((user_id, granularity, period, exercise), [0, 0.0])
+                entry[0] += count
+                entry[1] += seconds
+
+    def apply(self, conn: sqlite3.Connection) -> None:
+        conn.executemany(
+            "INSERT INTO rollups (user_id, granularity, period, sessions, rounds, workout_seconds, rest_seconds)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)"
+            " ON CONFLICT (user_id, granularity, period) DO UPDATE SET"
+            " sessions = sessions + excluded.sessions, rounds = rounds + excluded.rounds,"
+            " workout_seconds = workout_seconds + excluded.workout_seconds,"
+            " rest_seconds = rest_seconds + excluded.rest_seconds",
+            [(*key, *values) for key, values in self.totals.items()],
+        )
+        conn.executemany(
+            "INSERT INTO exercise_rollups (user_id, granularity, period, exercise, sets, workout_seconds)"
+            " VALUES (?, ?, ?, ?, ?, ?)"
+            " ON CONFLICT (user_id, granularity, period, exercise) DO UPDATE SET"
+            " sets = sets + excluded.sets, workout_seconds = workout_seconds + excluded.workout_seconds",
+            [(*key, *values) for key, values in self.exercises.items()],
+        )
+
+
+def add_sessions(conn: sqlite3.Connection, sessions) -> None:
+    """
+    Adds saved sessions to the rollups (inside the caller's transaction).
+    `sessions` yields (user_id, summary, intervals) as stored by the history store.
+    """
+    batch = RollupBatch()
+    for user_id, summary, intervals in sessions:
+        batch.add(
+            user_id, summary["started_at"], summary["rounds"], summary["workout_seconds"],
+            summary["rest_seconds"], exercise_sets((phase, exercise, seconds) for phase, exercise, _, seconds in intervals),
+        )
+    batch.apply(conn)
+
+
+def rebuild(conn: sqlite3.Connection, user_id: str | None = None) -> int:
+    """
+    Recomputes the rollups of `user_id` (every user for None) from the
+    stored sessions, inside the caller's transaction. Returns the number of
+    sessions read. Sessions are streamed, so memory stays bounded by the
+    number of periods, not sessions.
+    """
+    where, params = ("WHERE user_id = ?", (user_id,)) if user_id is not None else ("", ())
+    conn.execute(f"DELETE FROM rollups {where}", params)
+    conn.execute(f"DELETE FROM exercise_rollups {where}", params)
+    rows = conn.execute(
+        "SELECT s.id, s.user_id, s.started_at, s.rounds, s.workout_seconds, s.rest_seconds,"
+        " i.phase, i.exercise, i.seconds"
+        f" FROM sessions s LEFT JOIN intervals i ON i.session_id = s.id {where.replace('user_id', 's.user_id')}"
+        " ORDER BY s.id, i.seq",
+        params,
+    )
+    batch = RollupBatch()
+    count = 0
+    for _, session_rows in itertools.groupby(rows, key=lambda row: row[0]):
+        first, *rest = session_rows
+        intervals = [(row[6], row[7], row[8]) for row in (first, *rest) if row[6] is not None]
+        batch.add(first[1], first[2], first[3], first[4], first[5], exercise_sets(intervals))
+        count += 1
+    batch.apply(conn)
+    return count
@@ -1,30 +1,162 @@
 # data_tracking/storage.py
+"""
+Saving and loading the workout history.
+
+The app only talks to these functions; the data lives in the SQLite store of
+data_tracking/history_store.py, keyed on `current_user_id()`. Sessions are
+saved through the write-behind queue (data_tracking/write_queue.py), so
+saving never waits on the database, and history reads go through the
+read-through cache (data_tracking/read_cache.py), so reruns that changed
+nothing never query it. Values returned from the cache are shared: do not
+modify them.
+"""
+import time
+
 import streamlit as st
 
+from configs.app_config import DEFAULT_USER_ID, HISTORY_DEFAULT_DAYS, HISTORY_READ_DRAIN_TIMEOUT_SECONDS
+from data_tracking import history_store, read_cache, rollups, transfer, write_queue
+
+
+def current_user_id() -> str:
+    return st.session_state.get("user_id") or DEFAULT_USER_ID
+
+
+def _wait_for_queued_sessions() -> None:
+    """
+    Lets the writer catch up before a read, so sessions just saved are
+    included; gives up after HISTORY_READ_DRAIN_TIMEOUT_SECONDS.
+    """
+    write_queue.get_write_queue().drain(HISTORY_READ_DRAIN_TIMEOUT_SECONDS)
+
+
 def save_workout_session_data(session_details: dict):
     """
-    Placeholder for saving workout session data.
-    This could involve writing to a CSV, a database, or a cloud service.
-    """
-    # Example: st.session_state.history.append(session_details)
-    # For now, just print to console.
-    print(f"Placeholder: Saving session data: {session_details}")
-    # In a real app, you might use:
-    # import pandas as pd
-    # df = pd.DataFrame([session_details])
-    # if os.path.exists('workout_log.csv'):
-    #   df.to_csv('workout_log.csv', mode='a', header=False, index=False)
-    # else:
-    #   df.to_csv('workout_log.csv', mode='w', header=True, index=False)
-    st.toast("Placeholder: Workout data would be saved here.")
-
-def load_workout_history():
-    """
-    Placeholder for loading workout history.
-    """
-    print("Placeholder: Loading workout history.")
-    # Example:
-    # if os.path.exists('workout_log.csv'):
-    #   return pd.read_csv('workout_log.csv')
-    # return pd.DataFrame()
-    return []
\ No newline at end of file
+    Queues one finished session for the history; a background thread
+    writes it.
+
+    `session_details` is `WorkoutSession.get_session_record()`: the settings
+    plus the session's raw event log, from which every statistic can be
+    derived again (core/session_log.py).
+    """
+    write_queue.get_write_queue().put(current_user_id(), session_details)
+    st.toast("💾 Workout saved to your history.")
+
+
+def load_workout_history(days: int | None = HISTORY_DEFAULT_DAYS, user_id: str | None = None) -> list[dict]:
+    """
+    The user's sessions of the last `days` days (all of them for None),
+    newest first, without their event logs. Sessions still queued for
+    writing are included unless the writer is too far behind (see
+    `_wait_for_queued_sessions`).
+
+    Cached until the user's next save; a window cached earlier is trimmed
+    to the current one instead of being read again.
+    """
+    _wait_for_queued_sessions()
+    store = history_store.get_history_store()
+    user_id = user_id or current_user_id()
+    since = time.time() - days * 86400 if days is not None else None
+    loaded_since, sessions = read_cache.get_read_cache().read(
+        user_id, ("sessions", days), lambda: (since, list(store.iter_sessions(user_id, since=since))))
+    if since is None or since == loaded_since:
+        return list(sessions)
+    # Cached earlier: the window has moved on since, so drop what fell out of it.
+    return [session for session in sessions if session["started_at"] >= since]
+
+
+def load_history_rollups(granularity: str, periods: int, user_id: str | None = None) -> dict:
+    """
+    The user's last `periods` day/week/month rollups (data_tracking/rollups.py):
+    {"periods": keys oldest first, "totals": rows, "exercises": rows}.
+    Periods without sessions have no rows.
+    """
+    _wait_for_queued_sessions()
+    keys = rollups.recent_periods(granularity, periods)
+    store = history_store.get_history_store()
+    user_id = user_id or current_user_id()
+    return read_cache.get_read_cache().read(user_id, ("rollups", granularity, tuple(keys)), lambda: {
+        "periods": keys,
+        "totals": store.rollup_rows(user_id, granularity, keys[0]),
+        "exercises": store.exercise_rollup_rows(user_id, granularity, keys[0]),
+    })
+
+
+def history_day_bounds(user_id: str | None = None) -> tuple[str, str] | None:
+    """The first and last day ("YYYY-MM-DD") the user has sessions on."""
+    _wait_for_queued_sessions()
+    user_id = user_id or current_user_id()
+    return read_cache.get_read_cache().read(
+        user_id, ("day_bounds",), lambda: history_store.get_history_store().rollup_bounds(user_id, rollups.DAY))
+
+
+def load_daily_rollups(since_day: str, until_day: str | None = None, user_id: str | None = None) -> list[dict]:
+    """The user's day rollups in [since_day, until_day], oldest first (days without sessions omitted)."""
+    _wait_for_queued_sessions()
+    user_id = user_id or current_user_id()
+    return read_cache.get_read_cache().read(
+        user_id, ("days", since_day, until_day),
+        lambda: history_store.get_history_store().rollup_rows(user_id, rollups.DAY, since_day, until_day))
+
+
+def load_session_traces(since_month: str | None = None, until_month: str | None = None,
+                        user_id: str | None = None):
+    """
+    The user's per-second session traces (data_tracking/telemetry.py) for
+    the months ("YYYY-MM") in [since_month, until_month], oldest month
+    first. A generator of memory-mapped views: consume it as a stream.
+    """
+    _wait_for_queued_sessions()
+    return history_store.get_history_store().telemetry.scan(user_id or current_user_id(), since_month, until_month)
+
+
+def load_history_analytics(user_id: str | None = None):
+    """
+    Streaks, weekly volume per exercise, the rest-to-work trend, longest
+    sessions and personal bests over the user's whole history
+    (`analytics.HistoryAnalytics`), cached until the user saves a session.
+    """
+    # pandas comes with the analytics module; keep it off the timer page's startup.
+    from data_tracking import analytics
+
+    _wait_for_queued_sessions()
+    return analytics.get_history_analytics(history_store.get_history_store(), user_id or current_user_id())
+
+
+def import_workout_history(file, fmt: str, progress=None, user_id: str | None = None):
+    """
+    Imports a CSV or JSON-lines history file (a binary file object) into
+    the user's history, streamed in batched transactions
+    (data_tracking/transfer.py); returns a `transfer.ImportResult`.
+    `progress(sessions, bytes_read)` is called after every batch.
+    """
+    return transfer.import_history(history_store.get_history_store(), user_id or current_user_id(), file, fmt,
+                                   progress=progress)
+
+
+def export_workout_history(file, fmt: str, progress=None, user_id: str | None = None) -> int:
+    """
+    Writes the user's whole history, oldest session first, to a binary file
+    object as CSV or JSON lines; returns the number of sessions written.
+    """
+    _wait_for_queued_sessions()
+    return transfer.export_history(history_store.get_history_store(), user_id or current_user_id(), file, fmt,
+                                   progress=progress)
+
+
+def save_user_settings(settings: dict, user_id: str | None = None) -> None:
+    history_store.get_history_store().save_settings(user_id or current_user_id(), settings)
+
+
+def load_user_settings(user_id: str | None = None) -> dict:
+    return history_store.get_history_store().load_settings(user_id or current_user_id())
+
+
+def write_queue_stats() -> dict:
+    """Queue depth and flush latency counters of the history writer."""
+    return write_queue.get_write_queue().stats()
+
+
+def read_cache_stats() -> dict:
+    """Size, hit and miss counters of the history read cache."""
+    return read_cache.get_read_cache().stats()
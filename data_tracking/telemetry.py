@@ -0,0 +1,242 @@
+# data_tracking/telemetry.py
+"""
+Per-second telemetry of every saved session, in an append-only columnar
+archive next to the history database.
+
+A session's trace is its state at every second since its first event:
+
+    phase      0 idle (not started / stopped), then the position in `PHASES`
+    exercise   index into the session's schedule (-1 before the first one)
+    paused     1 while paused
+
+The trace is derived from the event log (the state only changes at events),
+so it is stored run-length encoded: each run of identical seconds is one
+(length, phase, exercise, paused) entry, the lengths being the deltas
+between consecutive state changes. A 45-minute session is a few dozen runs,
+~8 bytes each, instead of 2,700 rows.
+
+One file per user and month ("<root>/<user>/2025-06.trace"); each session
+appends one block:
+
+    header     magic, format version, session id (int64), started_at
+               (float64 epoch seconds), seconds (uint32), runs (uint32)
+    columns    lengths uint32[runs], exercise int16[runs], phase
+               uint8[runs], paused uint8[runs]
+
+The header is 32 bytes and a block's columns take 8 bytes per run, so every
+block and every column starts aligned to its item size. A block is written
+with a single `os.write` on a file opened with O_APPEND, so concurrent
+writers never interleave.
+
+Readers map the file (`mmap`) and hand out NumPy views of the columns: no
+copy is made and nothing is read from disk until a column is touched, so a
+year of traces can be scanned (`scan`) in bounded memory. A block torn by a
+crash mid-append is skipped up to the next block magic. Second `k` of a
+trace is epoch second `started_at + k`, which is what other per-second data
+(heart rate) is aligned on.
+"""
+import logging
+import math
+import mmap
+import os
+import shutil
+import struct
+import urllib.parse
+from typing import NamedTuple
+
+import numpy as np
+
+from configs.app_config import PHASE_GET_READY, PHASE_REST, PHASE_WORKOUT
+from core.session_log import EXERCISE_ADVANCE, PAUSE, PHASE_ENTER, RESET, RESUME, START, STOP
+
+logger = logging.getLogger(__name__)
+from data_tracking.rollups import MONTH, period_keys
+
+PHASES = (None, PHASE_GET_READY, PHASE_WORKOUT, PHASE_REST)  # code = position
+NO_EXERCISE = -1
+
+_MAGIC = b"WTRC"
+_VERSION = 1
+_HEADER = struct.Struct("<4sIqdII")
+_SUFFIX = ".trace"
+
+
+class SessionTrace(NamedTuple):
+    """One session's runs; the arrays are read-only views into the mapped file."""
+    session_id: int
+    started_at: float
+    seconds: int
+    lengths: np.ndarray  # uint32
+    exercises: np.ndarray  # int16
+    phases: np.ndarray  # uint8
+    paused: np.ndarray  # uint8
+
+    def expand(self) -> dict[str, np.ndarray]:
+        """The per-second arrays (copies): "phase", "exercise" and "paused"."""
+        return {
+            "phase": np.repeat(self.phases, self.lengths),
+            "exercise": np.repeat(self.exercises, self.lengths),
+            "paused": np.repeat(self.paused, self.lengths),
+        }
+
+    def timestamps(self) -> np.ndarray:
+        """Epoch second of every second of the trace."""
+        return self.started_at + np.arange(self.seconds, dtype=float)
+
+
+def encode(events: list[dict]) -> tuple[int, list[tuple[int, int, int, int]]]:
+    """
+    The trace of a session's event records (`SessionLog.to_records()`):
+    its length in seconds and its (length, phase, exercise, paused) runs.
+    """
+    if not events:
+        return 0, []
+    seconds = int(events[-1]["t"])
+    phase, exercise, running, paused = None, NO_EXERCISE, False, False
+    changes: list[tuple[int, tuple]] = []  # (first second, state)
+    for event in events:
+        kind = event["kind"]
+        if kind == START:
+            running, paused = True, False
+        elif kind == PHASE_ENTER:
+            phase = event.get("phase")
+            exercise = event.get("exercise_index", exercise)
+        elif kind == EXERCISE_ADVANCE:
+            exercise = event.get("exercise_index", exercise)
+        elif kind == PAUSE:
+            paused = True
+        elif kind == RESUME:
+            paused = False
+        elif kind == STOP:
+            running, paused = False, False
+        elif kind == RESET:
+            break
+        # Second k shows the state after the last event at or before k.
+        first = math.ceil(event["t"])
+        if first >= seconds:
+            break
+        state = (PHASES.index(phase) if running and phase in PHASES else 0,
+                 NO_EXERCISE if exercise is None else exercise, int(paused))
+        if changes and changes[-1][0] == first:
+            changes.pop()
+        if not changes or changes[-1][1] != state:
+            changes.append((first, state))
+    ends = [first for first, _ in changes[1:]] + [seconds]
+    return seconds, [(end - first, *state) for (first, state), end in zip(changes, ends)]
+
+
+def _block(session_id: int, started_at: float, events: list[dict]) -> bytes:
+    seconds, runs = encode(events)
+    lengths, phases, exercises, paused = zip(*runs) if runs else ((), (), (), ())
+    return b"".join((
+        _HEADER.pack(_MAGIC, _VERSION, session_id, started_at, seconds, len(runs)),
+        np.asarray(lengths, dtype="<u4").tobytes(),
+        np.asarray(exercises, dtype="<i2").tobytes(),
+        np.asarray(phases, dtype="u1").tobytes(),
+        np.asarray(paused, dtype="u1").tobytes(),
+    ))
+
+
+class TelemetryArchive:
+    def __init__(self, root: str):
+        self.root = root
+
+    def _user_dir(self, user_id: str) -> str:
+        return os.path.join(self.root, urllib.parse.quote(user_id, safe=""))
+
+    def path(self, user_id: str, month: str) -> str:
+        return os.path.join(self._user_dir(user_id), month + _SUFFIX)
+
+    # ----- writing --------------------------------------------------------
+    def append(self, sessions) -> int:
+        """
+        Appends the traces of (user_id, session_id, started_at, events)
+        sessions, one write per file; returns the bytes written. A session
+        whose events cannot be encoded (e.g. a non-finite time or an
+        exercise index outside int16) is logged and left without a trace.
+        """
+        blocks: dict[str, list[bytes]] = {}
+        for user_id, session_id, started_at, events in sessions:
+            try:
+                block = _block(session_id, started_at, events)
+            except (ValueError, OverflowError, TypeError, KeyError) as exc:
+                logger.error("Could not encode the telemetry of session %s: %s", session_id, exc)
+                continue
+            blocks.setdefault(self.path(user_id, period_keys(started_at)[MONTH]), []).append(block)
+        written = 0
+        for path, parts in blocks.items():
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+            try:
+                written += os.write(fd, b"".join(parts))
+            finally:
+                os.close(fd)
+        return written
+
+    def remove(self, user_id: str | None = None) -> None:
+        """Deletes the archive of `user_id` (every user for None)."""
+        shutil.rmtree(self._user_dir(user_id) if user_id is not None else self.root, ignore_errors=True)
+
+    # ----- reading --------------------------------------------------------
+    def months(self, user_id: str) -> list[str]:
+        """The months a user has traces for, oldest first."""
+        try:
+            names = os.listdir(self._user_dir(user_id))
+        except FileNotFoundError:
+            return []
+        return sorted(name[:-len(_SUFFIX)] for name in names if name.endswith(_SUFFIX))
+
+    def read_month(self, user_id: str, month: str) -> list[SessionTrace]:
+        """
+        The traces of one user-month, in append order. The file is mapped, not
+        read; it stays mapped as long as any of the returned arrays is alive.
+        """
+        try:
+            with open(self.path(user_id, month), "rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return []
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            return []
+        traces = []
+        offset, size = 0, len(buffer)
+        while offset + _HEADER.size <= size:
+            magic, version, session_id, started_at, seconds, runs = _HEADER.unpack_from(buffer, offset)
+            end = offset + _HEADER.size + 8 * runs
+            if (magic != _MAGIC or version != _VERSION or end > size
+                    or (end < size and buffer[end:end + len(_MAGIC)] != _MAGIC)):
+                # A torn block: continue at the next block, if any.
+                offset = buffer.find(_MAGIC, offset + 1)
+                if offset < 0:
+                    break
+                continue
+            column = offset + _HEADER.size
+            traces.append(SessionTrace(
+                session_id, started_at, seconds,
+                np.frombuffer(buffer, "<u4", runs, column),
+                np.frombuffer(buffer, "<i2", runs, column + 4 * runs),
+                np.frombuffer(buffer, "u1", runs, column + 6 * runs),
+                np.frombuffer(buffer, "u1", runs, column + 7 * runs),
+            ))
+            offset = end
+        return traces
+
+    def scan(self, user_id: str, since_month: str | None = None, until_month: str | None = None):
+        """Every trace of a user in [since_month, until_month], oldest month first, one month mapped at a time."""
+        for month in self.months(user_id):
+            if (since_month is None or month >= since_month) and (until_month is None or month <= until_month):
+                yield from self.read_month(user_id, month)
+
+
+def seconds_by_phase(traces) -> dict[str | None, int]:
+    """Active (unpaused) seconds per phase over `traces`, summed on the runs without expanding them."""
+    totals = np.zeros(len(PHASES), dtype=np.int64)
+    for trace in traces:
+        totals += np.bincount(trace.phases, weights=trace.lengths * (trace.paused == 0),
+                              minlength=len(PHASES)).astype(np.int64)
+    return {phase: int(seconds) for phase, seconds in zip(PHASES, totals)}
+
+
+def default_root(db_path: str) -> str:
+    """Where the archive of a history database lives: "<db name>.telemetry" next to it."""
+    return os.path.splitext(db_path)[0] + ".telemetry"
@@ -0,0 +1,383 @@
+# data_tracking/transfer.py
+"""
+Bulk import and export of the workout history, as CSV or JSON lines.
+
+Both formats are streamed: files are read and written a line at a time and
+imports are saved in transactions of `HISTORY_IMPORT_BATCH_SIZE` sessions
+(through `HistoryStore.save_summarized`, so rollups and telemetry are kept
+up to date), so memory stays flat however large the file is.
+
+    jsonl   one session record per line, the shape the app saves
+            (`WorkoutSession.get_session_record()`: started_at,
+            workout_duration, rest_duration, schedule, events). Lossless.
+    csv     one row per interval actually spent in a phase:
+
+                session,started_at,phase,exercise,seconds
+                17,2025-06-02T07:30:00.000+02:00,GET_READY,Push-ups,10
+                17,2025-06-02T07:30:00.000+02:00,WORKOUT,Push-ups,45
+                17,2025-06-02T07:30:00.000+02:00,REST,Push-ups,15
+
+            Consecutive rows with the same `session` value are one session.
+            `started_at` is ISO 8601 (local time when it has no offset) or
+            epoch seconds; `phase` is GET_READY, WORKOUT or REST. Events are
+            rebuilt from the intervals, so pauses are not kept and the
+            workout/rest settings are taken from the first interval of each.
+            The totals are summed from the rows rather than folded from the
+            rebuilt events.
+
+Sessions already in the history (same user and start time, to the
+millisecond) are skipped, so an interrupted import can simply be run again.
+A session with an invalid line is skipped and reported; the rest of the
+file is still imported.
+"""
+import csv
+import datetime
+import io
+import json
+import math
+from typing import NamedTuple
+
+from configs.app_config import (
+    HISTORY_IMPORT_BATCH_SIZE,
+    HISTORY_IMPORT_MAX_ERRORS,
+    PHASE_GET_READY,
+    PHASE_REST,
+    PHASE_WORKOUT,
+)
+from core.session_log import EVENT_KINDS, PAUSE, PHASE_ENTER, RESET, RESUME, START
+from data_tracking.history_store import HistoryStore, summarize, summary_columns
+
+CSV = "csv"
+JSONL = "jsonl"
+FORMATS = (CSV, JSONL)
+CSV_COLUMNS = ("session", "started_at", "phase", "exercise", "seconds")
+
+_PHASES = (PHASE_GET_READY, PHASE_WORKOUT, PHASE_REST)
+_SUFFIXES = {".csv": CSV, ".jsonl": JSONL, ".ndjson": JSONL}
+
+
+class ImportResult(NamedTuple):
+    sessions: int  # imported
+    duplicates: int  # already in the history
+    skipped: int  # invalid
+    errors: list[str]  # the first HISTORY_IMPORT_MAX_ERRORS reasons, "line N: ..."
+
+
+def detect_format(name: str) -> str | None:
+    """The format a file name's extension implies (None when unknown)."""
+    for suffix, fmt in _SUFFIXES.items():
+        if name.lower().endswith(suffix):
+            return fmt
+    return None
+
+
+# ----- parsing --------------------------------------------------------------
+class _Errors:
+    def __init__(self):
+        self.count = 0
+        self.messages: list[str] = []
+
+    def add(self, line: int, message: str) -> None:
+        self.count += 1
+        if len(self.messages) < HISTORY_IMPORT_MAX_ERRORS:
+            self.messages.append(f"line {line}: {message}")
+
+
+def _timestamp(value) -> float:
+    """Epoch seconds from a number or an ISO 8601 string (local time when naive)."""
+    if _is_number(value):
+        if not math.isfinite(value):
+            raise ValueError(f"invalid started_at {value!r}")
+        return float(value)
+    if not isinstance(value, str):
+        raise ValueError(f"invalid started_at {value!r}")
+    try:
+        seconds = float(value)
+    except ValueError:
+        pass
+    else:
+        if not math.isfinite(seconds):
+            raise ValueError(f"invalid started_at {value!r}")
+        return seconds
+    try:
+        return datetime.datetime.fromisoformat(value.strip()).timestamp()
+    except ValueError:
+        raise ValueError(f"invalid started_at {value!r}") from None
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _checked_record(record) -> dict:
+    if not isinstance(record, dict):
+        raise ValueError("not a JSON object")
+    events = record.get("events")
+    if not isinstance(events, list) or not events:
+        raise ValueError("no events")
+    schedule = record.get("schedule") or []
+    if not isinstance(schedule, list):
+        raise ValueError("schedule is not a list")
+    for event in events:
+        if (not isinstance(event, dict) or event.get("kind") not in EVENT_KINDS
+                or not _is_number(event.get("t")) or not math.isfinite(event["t"])):
+            raise ValueError(f"invalid event {event!r}")
+        if (event["kind"] == PHASE_ENTER or "phase" in event) and event.get("phase") not in _PHASES:
+            raise ValueError(f"invalid phase in event {event!r}")
+        index = event.get("exercise_index")
+        # Without a schedule the app still logs exercise 0.
+        if index is not None and not (type(index) is int and 0 <= index < max(len(schedule), 1)):
+            raise ValueError(f"invalid exercise_index in event {event!r}")
+    try:
+        workout_duration = int(record.get("workout_duration") or 0)
+        rest_duration = int(record.get("rest_duration") or 0)
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError("invalid workout_duration / rest_duration") from None
+    return {
+        "started_at": _timestamp(record.get("started_at")),
+        "workout_duration": workout_duration,
+        "rest_duration": rest_duration,
+        "schedule": schedule,
+        "events": events,
+    }
+
+
+def read_jsonl(lines, errors: _Errors):
+    """
+    (record, summary, intervals) of every session in JSON lines (see
+    `history_store.summarize`); invalid lines are counted in `errors` and
+    skipped.
+    """
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            record = _checked_record(json.loads(line))
+        except ValueError as exc:  # json.JSONDecodeError included
+            errors.add(number, str(exc))
+            continue
+        yield (record, *summarize(record))
+
+
+def summarized_session(started_at: float, intervals: list[tuple[str, str | None, float]]) -> tuple:
+    """
+    (record, summary, intervals) of a session given as its (phase,
+    exercise, seconds) intervals, in order, as `history_store.summarize`
+    would fold them from the record's events; the totals are summed from the
+    intervals instead. The events are a phase_enter per interval, and a
+    pause/resume where an interval continues the previous one (same phase
+    and exercise), so no round is counted there.
+    """
+    schedule: list[str] = []
+    indexes: dict[str, int] = {}
+    events = [{"t": 0.0, "kind": START}]
+    stored = []
+    workout_duration = rest_duration = rounds = 0
+    workout = rest = 0.0
+    t, previous = 0.0, None
+    for phase, exercise, seconds in intervals:
+        if (phase, exercise) == previous:
+            events.append({"t": t, "kind": PAUSE})
+            events.append({"t": t, "kind": RESUME})
+        else:
+            event = {"t": t, "kind": PHASE_ENTER, "phase": phase}
+            if exercise is not None:
+                if exercise not in indexes:
+                    indexes[exercise] = len(schedule)
+                    schedule.append(exercise)
+                event["exercise_index"] = indexes[exercise]
+                event["exercise"] = exercise
+            events.append(event)
+            if previous is not None and previous[0] == PHASE_WORKOUT:
+                rounds += 1
+            if phase == PHASE_WORKOUT and not workout_duration:
+                workout_duration = round(seconds)
+            elif phase == PHASE_REST and not rest_duration:
+                rest_duration = round(seconds)
+        end = round(t + seconds, 3)
+        if end > t:
+            stored.append((phase, exercise, t, end - t))
+            if phase == PHASE_WORKOUT:
+                workout += end - t
+            else:
+                rest += end - t
+        t, previous = end, (phase, exercise)
+    events.append({"t": t, "kind": RESET})
+    record = {"started_at": started_at, "workout_duration": workout_duration, "rest_duration": rest_duration,
+              "schedule": schedule, "events": events}
+    return record, summary_columns(record, t, workout, rest, rounds), stored
+
+
+def read_csv(text, errors: _Errors):
+    """
+    (record, summary, intervals) of every session in interval rows (see the
+    module docstring), one session held in memory at a time; a session with
+    an invalid row is counted in `errors` and skipped.
+    """
+    reader = csv.reader(text)
+    header = [name.strip().lower() for name in next(reader, [])]
+    missing = [name for name in CSV_COLUMNS if name not in header]
+    if missing:
+        errors.add(1, f"missing column(s) {', '.join(missing)}")
+        return
+    session_at, started_at_at, phase_at, exercise_at, seconds_at = (header.index(name) for name in CSV_COLUMNS)
+    width = max(session_at, started_at_at, phase_at, exercise_at, seconds_at) + 1
+
+    key = started_at = None
+    intervals: list | None = []
+    for row in reader:
+        if not row:
+            continue
+        if len(row) < width:
+            errors.add(reader.line_num, f"expected {len(header)} columns, got {len(row)}")
+            # The session of a truncated row, when it has that column, is skipped.
+            session = row[session_at] if len(row) > session_at else key
+            if session != key:
+                if intervals:
+                    yield summarized_session(started_at, intervals)
+                key = session
+            intervals = None
+            continue
+        if row[session_at] != key:
+            if intervals:
+                yield summarized_session(started_at, intervals)
+            key, intervals = row[session_at], []
+            try:
+                started_at = _timestamp(row[started_at_at])
+            except ValueError as exc:
+                errors.add(reader.line_num, str(exc))
+                intervals = None
+        if intervals is None:  # an earlier row of this session was invalid
+            continue
+        try:
+            phase = row[phase_at]
+            if phase not in _PHASES:
+                phase = phase.strip().upper()
+                if phase not in _PHASES:
+                    raise ValueError(f"invalid phase {row[phase_at]!r}")
+            seconds = float(row[seconds_at])
+            if not (math.isfinite(seconds) and seconds >= 0):
+                raise ValueError(f"invalid seconds {row[seconds_at]!r}")
+        except ValueError as exc:
+            errors.add(reader.line_num, str(exc))
+            intervals = None
+            continue
+        intervals.append((phase, row[exercise_at] or None, seconds))
+    if intervals:
+        yield summarized_session(started_at, intervals)
+
+
+# ----- import ---------------------------------------------------------------
+class _CountingReader(io.RawIOBase):
+    """Counts the bytes read from a binary file (pipes and uploads have no usable `tell`)."""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.bytes_read = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        count = self.raw.readinto(buffer) or 0
+        self.bytes_read += count
+        return count
+
+
+def _existing_starts(store: HistoryStore, user_id: str, starts: list[float]) -> set[float]:
+    with store.connection() as conn:
+        return {
+            round(row[0], 3) for row in conn.execute(
+                "SELECT started_at FROM sessions WHERE user_id = ? AND started_at BETWEEN ? AND ?",
+                (user_id, min(starts) - 0.001, max(starts) + 0.001),
+            )
+        }
+
+
+def import_history(store: HistoryStore, user_id: str, binary, fmt: str,
+                   batch_size: int = HISTORY_IMPORT_BATCH_SIZE, progress=None) -> ImportResult:
+    """
+    Imports a CSV or JSON-lines file (a binary file object, UTF-8) into
+    `user_id`'s history, `batch_size` sessions per transaction.
+
+    `progress(sessions, bytes_read)` is called after every batch.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown format {fmt!r} (expected one of {', '.join(FORMATS)})")
+    counter = _CountingReader(binary)
+    text = io.TextIOWrapper(io.BufferedReader(counter), encoding="utf-8-sig", newline="")
+    errors = _Errors()
+    sessions = read_csv(text, errors) if fmt == CSV else read_jsonl(text, errors)
+    imported = duplicates = 0
+    batch: list[tuple] = []
+
+    def flush():
+        nonlocal imported, duplicates
+        seen = _existing_starts(store, user_id, [summary["started_at"] for _, summary, _ in batch])
+        fresh = []
+        for record, summary, intervals in batch:
+            start = round(summary["started_at"], 3)
+            if start in seen:
+                duplicates += 1
+            else:
+                seen.add(start)
+                fresh.append((user_id, record, summary, intervals))
+        if fresh:
+            store.save_summarized(fresh)
+        imported += len(fresh)
+        batch.clear()
+        if progress is not None:
+            progress(imported, counter.bytes_read)
+
+    with text:
+        for session in sessions:
+            batch.append(session)
+            if len(batch) >= batch_size:
+                flush()
+        if batch:
+            flush()
+    return ImportResult(imported, duplicates, errors.count, errors.messages)
+
+
+# ----- export ---------------------------------------------------------------
+def _iso(started_at: float) -> str:
+    return datetime.datetime.fromtimestamp(started_at).astimezone().isoformat(timespec="milliseconds")
+
+
+def export_history(store: HistoryStore, user_id: str, binary, fmt: str, progress=None) -> int:
+    """
+    Writes `user_id`'s history, oldest session first, to a binary file
+    object as CSV or JSON lines; returns the number of sessions written.
+
+    `progress(sessions, total)` is called every `HISTORY_IMPORT_BATCH_SIZE`
+    sessions and after the last one.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown format {fmt!r} (expected one of {', '.join(FORMATS)})")
+    total = store.count_sessions(user_id)
+    text = io.TextIOWrapper(binary, encoding="utf-8", newline="")
+    written = 0
+    try:
+        if fmt == JSONL:
+            for record in store.iter_session_records(user_id):
+                text.write(json.dumps(record, separators=(",", ":")) + "\n")
+                written += 1
+                if progress is not None and written % HISTORY_IMPORT_BATCH_SIZE == 0:
+                    progress(written, total)
+        else:
+            writer = csv.writer(text, lineterminator="\n")
+            writer.writerow(CSV_COLUMNS)
+            current = started = None
+            for session_id, started_at, phase, exercise, seconds in store.iter_interval_rows(user_id):
+                if session_id != current:
+                    current, started = session_id, _iso(started_at)
+                    written += 1
+                    if progress is not None and written % HISTORY_IMPORT_BATCH_SIZE == 0:
+                        progress(written, total)
+                writer.writerow((session_id, started, phase, exercise or "", round(seconds, 3)))
+        if progress is not None and written % HISTORY_IMPORT_BATCH_SIZE:
+            progress(written, total)
+    finally:
+        text.flush()
+        text.detach()  # leave the caller's file open
+    return written
@@ -1,13 +1,60 @@
 # data_tracking/visualization.py
+import datetime
+import functools
+
 import streamlit as st
-import pandas as pd
 from utils.helpers import format_time
-import plotly.graph_objects as go
-from configs.app_config import CHART_TYPE_BAR, CHART_TYPE_DOUGHNUT
+from configs.app_config import (
+    CHART_TYPE_BAR,
+    CHART_TYPE_DOUGHNUT,
+    CHART_TYPE_LIGHT,
+    HISTORY_ANALYTICS_TREND_WEEKS,
+    HISTORY_CHART_PERIODS,
+    HISTORY_TREND_DEFAULT_WIDTH_PX,
+    HISTORY_TREND_MIN_POINTS,
+    HISTORY_TREND_PX_PER_POINT,
+    INSIGHTS_CHART_CACHE_SIZE,
+    INSIGHTS_CHART_GRANULARITY_SECONDS,
+    INSIGHTS_METRICS_REFRESH_SECONDS,
+    TIMER_MODE_CLIENT,
+)
+from core.scheduler import book_fragment_rerun, use_server_scheduler
+from data_tracking.downsampling import lttb, target_points
+from data_tracking.storage import (
+    history_day_bounds,
+    load_daily_rollups,
+    load_history_analytics,
+    load_history_rollups,
+)
+from utils.browser_bridge import browser_state
 
 def display_workout_insights(session_manager):
     st.subheader("📊 Workout Insights")
 
+    # Metrics and chart refresh on their own cadences while the timer runs in
+    # server mode; the live timer fragment does not touch them. Under
+    # `streamlit run` the refreshes are booked with the shared scheduler, like
+    # the live timer's, instead of a browser timer per session. In
+    # browser-countdown mode they only refresh with the phase changes (which
+    # rerun the whole page), so the browser keeps no timer at all.
+    live = session_manager.is_running() and st.session_state.get("timer_mode") != TIMER_MODE_CLIENT
+    scheduled = live and use_server_scheduler()
+    browser_timer = live and not scheduled
+
+    metrics = st.fragment(_render_insight_metrics,
+                          run_every=INSIGHTS_METRICS_REFRESH_SECONDS if browser_timer else None)
+    metrics(session_manager, scheduled)
+
+    st.markdown("##### Workout vs. Prep/Rest Duration") # Updated label
+
+    chart = st.fragment(_render_insights_chart,
+                        run_every=INSIGHTS_CHART_GRANULARITY_SECONDS if browser_timer else None)
+    chart(session_manager, scheduled)
+
+
+def _render_insight_metrics(session_manager, scheduled: bool = False):
+    if scheduled:
+        book_fragment_rerun(INSIGHTS_METRICS_REFRESH_SECONDS)
     rounds = session_manager.get_completed_rounds()
     total_workout_secs = session_manager.get_total_workout_time()
     total_rest_secs = session_manager.get_total_rest_time() # Includes "Get Ready" time
@@ -21,71 +68,251 @@ def display_workout_insights(session_manager):
         st.metric(label="Total Prep & Rest Time", value=format_time(total_rest_secs)) # Updated label
         st.metric(label="Total Active Time", value=format_time(total_elapsed_active_secs))
 
-    st.markdown("##### Workout vs. Prep/Rest Duration") # Updated label
-
-    if total_workout_secs > 0 or total_rest_secs > 0:
-        workout_color_hex = "#ff4b4b" 
-        rest_color_hex = "#10ddc2"   
 
-        activities = ["Workout Time", "Prep & Rest Time"] # Updated label
-        durations = [total_workout_secs, total_rest_secs]
-        colors = [workout_color_hex, rest_color_hex]
+def _bucket(seconds: int) -> int:
+    """`seconds` rounded down to the chart granularity."""
+    return seconds // INSIGHTS_CHART_GRANULARITY_SECONDS * INSIGHTS_CHART_GRANULARITY_SECONDS
 
-        valid_indices = [i for i, v in enumerate(durations) if v > 0]
-        
-        if not valid_indices:
-            st.caption("No activity with duration > 0 to display chart.")
-            return
 
-        filtered_labels = [activities[i] for i in valid_indices]
-        filtered_values = [durations[i] for i in valid_indices]
-        filtered_colors = [colors[i] for i in valid_indices]
+def _render_insights_chart(session_manager, scheduled: bool = False):
+    if scheduled:
+        book_fragment_rerun(INSIGHTS_CHART_GRANULARITY_SECONDS)
+    total_workout_secs = _bucket(session_manager.get_total_workout_time())
+    total_rest_secs = _bucket(session_manager.get_total_rest_time())
 
+    if total_workout_secs > 0 or total_rest_secs > 0:
         selected_chart_type = st.session_state.get('insights_chart_type', CHART_TYPE_DOUGHNUT)
+        chart = _build_chart(selected_chart_type, total_workout_secs, total_rest_secs)
 
         if selected_chart_type == CHART_TYPE_DOUGHNUT:
-            fig = go.Figure(data=[go.Pie(
-                labels=filtered_labels,
-                values=filtered_values,
-                hole=.4,
-                marker_colors=filtered_colors,
-                hoverinfo='label+percent+value',
-                textinfo='label+percent',
-                insidetextorientation='radial',
-                textfont=dict(color='white', size=16), 
-                sort=False
-            )])
-            fig.update_layout(
-                margin=dict(t=20, b=20, l=20, r=20),
-                showlegend=True,
-                legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-                height=400,
-                uniformtext_minsize=10,  # New: Set minimum size for text inside slices
-                uniformtext_mode='show'    # New: Try to show text even if it means scaling
-                # paper_bgcolor='rgba(0,0,0,0)' # Ensure background is transparent for Streamlit themes
-            )
-            st.plotly_chart(fig, use_container_width=True)
-        
+            st.plotly_chart(chart, use_container_width=True)
         elif selected_chart_type == CHART_TYPE_BAR:
-            chart_data_df = pd.DataFrame({
-                "Activity": filtered_labels,
-                "Duration (seconds)": filtered_values,
-                "Color": filtered_colors
-            })
             st.bar_chart(
-                chart_data_df,
+                chart,
                 x="Activity",
                 y="Duration (seconds)",
                 color="Color"
             )
+        elif selected_chart_type == CHART_TYPE_LIGHT:
+            # Plain markup, rendered like the custom progress bar
+            st.markdown(chart, unsafe_allow_html=True)
         else:
             st.warning(f"Unknown chart type selected: {selected_chart_type}")
-            
+
     else:
         st.caption("No activity yet to display chart.")
 
-def render_historical_charts(history_data):
-    if not history_data:
+
+@functools.lru_cache(maxsize=INSIGHTS_CHART_CACHE_SIZE)
+def _build_chart(chart_type: str, total_workout_secs: int, total_rest_secs: int):
+    """
+    The chart for one set of (bucketed) totals: a plotly figure for the
+    doughnut, a DataFrame for the bar chart, an HTML string for the
+    lightweight doughnut. Shared by every session, so callers must not
+    modify it.
+    """
+    workout_color_hex = "#ff4b4b"
+    rest_color_hex = "#10ddc2"
+
+    activities = ["Workout Time", "Prep & Rest Time"] # Updated label
+    durations = [total_workout_secs, total_rest_secs]
+    colors = [workout_color_hex, rest_color_hex]
+
+    valid_indices = [i for i, v in enumerate(durations) if v > 0]
+
+    filtered_labels = [activities[i] for i in valid_indices]
+    filtered_values = [durations[i] for i in valid_indices]
+    filtered_colors = [colors[i] for i in valid_indices]
+
+    # Plotly and pandas are imported on first use, not with the page.
+    if chart_type == CHART_TYPE_DOUGHNUT:
+        import plotly.graph_objects as go
+
+        fig = go.Figure(data=[go.Pie(
+            labels=filtered_labels,
+            values=filtered_values,
+            hole=.4,
+            marker_colors=filtered_colors,
+            hoverinfo='label+percent+value',
+            textinfo='label+percent',
+            insidetextorientation='radial',
+            textfont=dict(color='white', size=16),
+            sort=False
+        )])
+        fig.update_layout(
+            margin=dict(t=20, b=20, l=20, r=20),
+            showlegend=True,
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+            height=400,
+            uniformtext_minsize=10,  # New: Set minimum size for text inside slices
+            uniformtext_mode='show'    # New: Try to show text even if it means scaling
+            # paper_bgcolor='rgba(0,0,0,0)' # Ensure background is transparent for Streamlit themes
+        )
+        return fig
+
+    if chart_type == CHART_TYPE_BAR:
+        import pandas as pd
+
+        return pd.DataFrame({
+            "Activity": filtered_labels,
+            "Duration (seconds)": filtered_values,
+            "Color": filtered_colors
+        })
+
+    if chart_type == CHART_TYPE_LIGHT:
+        return _svg_doughnut(total_workout_secs, total_rest_secs, workout_color_hex, rest_color_hex)
+    return None
+
+
+def _svg_doughnut(workout_secs: int, rest_secs: int, workout_color: str, rest_color: str) -> str:
+    """
+    A two-slice doughnut as inline SVG (well under 1 KB).
+
+    The ring is a circle with a circumference of 100, so the workout share
+    is drawn with `stroke-dasharray="<percent> 100"` over a full rest ring.
+    """
+    workout_pct = round(100 * workout_secs / (workout_secs + rest_secs))
+    return (
+        '<div class="insights-svg-chart">'
+        f'<svg viewBox="0 0 42 42" width="180" height="180" role="img" '
+        f'aria-label="Workout {workout_pct}%, prep and rest {100 - workout_pct}%">'
+        f'<circle cx="21" cy="21" r="15.915" fill="none" stroke="{rest_color}" stroke-width="6"/>'
+        f'<circle cx="21" cy="21" r="15.915" fill="none" stroke="{workout_color}" stroke-width="6" '
+        f'stroke-dasharray="{workout_pct} {100 - workout_pct}" stroke-dashoffset="25"/>'
+        f'<text x="21" y="23" text-anchor="middle" font-size="6" fill="currentColor">{workout_pct}%</text>'
+        '</svg>'
+        f'<div><span style="color:{workout_color}">●</span> Workout {format_time(workout_secs)} '
+        f'<span style="color:{rest_color}">●</span> Prep &amp; Rest {format_time(rest_secs)}</div>'
+        '</div>'
+    )
+
+def render_historical_charts(user_id: str | None = None):
+    """
+    Sessions, workout/rest minutes and exercise sets per day, ISO week or
+    month, highlights of the whole history, and the all-time daily trend.
+    The charts read only the pre-aggregated rollups (data_tracking/rollups.py),
+    so their cost does not grow with the number of saved sessions; the
+    highlights are computed once per saved session (data_tracking/analytics.py).
+    """
+    _render_period_rollups(user_id)
+    _render_history_highlights(user_id)
+    _render_history_trend(user_id)
+
+
+def _render_period_rollups(user_id: str | None):
+    granularity = st.radio(
+        "Group by", list(HISTORY_CHART_PERIODS), format_func=lambda g: "ISO week" if g == "week" else g.title(),
+        horizontal=True, key="history_granularity",
+    )
+    periods = HISTORY_CHART_PERIODS[granularity]
+    rollup = load_history_rollups(granularity, periods, user_id)
+    if not rollup["totals"]:
         st.write("No historical workout data available to display charts.")
         return
-    st.write("Placeholder: Historical charts would be displayed here.")
\ No newline at end of file
+
+    import pandas as pd
+
+    by_period = {row["period"]: row for row in rollup["totals"]}
+    empty = {"sessions": 0, "rounds": 0, "workout_seconds": 0.0, "rest_seconds": 0.0}
+    rows = [by_period.get(period, empty) for period in rollup["periods"]]
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric(label=f"Sessions (last {periods} {granularity}s)", value=sum(row["sessions"] for row in rows))
+    with col2:
+        st.metric(label="Rounds", value=sum(row["rounds"] for row in rows))
+    with col3:
+        st.metric(label="Workout Time", value=f"{sum(row['workout_seconds'] for row in rows) / 60:.0f} min")
+
+    st.bar_chart(
+        pd.DataFrame({
+            "Period": rollup["periods"],
+            "Workout (min)": [round(row["workout_seconds"] / 60, 1) for row in rows],
+            "Prep & Rest (min)": [round(row["rest_seconds"] / 60, 1) for row in rows],
+        }),
+        x="Period",
+        y=["Workout (min)", "Prep & Rest (min)"],
+        color=["#ff4b4b", "#10ddc2"],
+    )
+
+    exercises: dict[str, list] = {}
+    for row in rollup["exercises"]:
+        entry = exercises.setdefault(row["exercise"], [0, 0.0])
+        entry[0] += row["sets"]
+        entry[1] += row["workout_seconds"]
+    if exercises:
+        st.markdown("##### Exercises")
+        st.dataframe(
+            pd.DataFrame(
+                [(name, sets, round(seconds / 60, 1)) for name, (sets, seconds) in exercises.items()],
+                columns=["Exercise", "Sets", "Workout (min)"],
+            ).sort_values("Sets", ascending=False),
+            hide_index=True,
+        )
+
+
+def _render_history_highlights(user_id: str | None):
+    """Streaks, personal bests, the rest-to-work trend and the longest sessions."""
+    analytics = load_history_analytics(user_id)
+    if not analytics.sessions:
+        return
+    bests = analytics.personal_bests
+    st.markdown("##### Highlights")
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Current Streak", f"{analytics.current_streak} d", help=f"Longest: {analytics.longest_streak} days")
+    col2.metric("Longest Session", f"{bests['longest_session_minutes']:.0f} min")
+    col3.metric("Most Rounds", bests["most_rounds"])
+    col4.metric("Best Week", f"{bests['best_week_workout_minutes']:.0f} min")
+
+    trend = analytics.rest_to_work["ratio_rolling"].dropna()
+    if len(trend) > 1:
+        st.caption("Prep/rest minutes per workout minute "
+                   f"(rolling {HISTORY_ANALYTICS_TREND_WEEKS} weeks)")
+        st.line_chart(trend.rename("Rest per workout minute").round(2), color="#10ddc2")
+    with st.expander("Longest sessions"):
+        st.dataframe(
+            analytics.longest_sessions.rename(columns={
+                "started": "Started", "minutes": "Minutes", "workout_minutes": "Workout (min)", "rounds": "Rounds",
+            }).round({"Minutes": 1, "Workout (min)": 1}),
+            hide_index=True,
+        )
+
+
+def _render_history_trend(user_id: str | None):
+    """
+    Daily workout minutes over the whole history (from the day rollups),
+    downsampled with LTTB to what the chart's width can show. Narrowing the
+    range re-runs the downsampling on fewer days, so zooming in shows more
+    of them, down to every single day.
+    """
+    bounds = history_day_bounds(user_id)
+    if bounds is None:
+        return
+
+    import pandas as pd
+
+    first = datetime.date.fromisoformat(bounds[0])
+    last = max(datetime.date.fromisoformat(bounds[1]), datetime.date.today())
+    st.markdown("##### All-time Trend")
+    start, end = first, last
+    if first < last:
+        start, end = st.slider("Range", min_value=first, max_value=last, value=(first, last),
+                               format="YYYY-MM-DD", key="history_trend_range")
+
+    rows = load_daily_rollups(start.isoformat(), end.isoformat(), user_id)
+    minutes = pd.Series(
+        [row["workout_seconds"] / 60 for row in rows],
+        index=pd.DatetimeIndex([row["period"] for row in rows]),
+        dtype=float,
+    ).reindex(pd.date_range(start, end, freq="D"), fill_value=0.0)  # days without sessions are 0
+
+    points = target_points(browser_state().get("viewport_width"), HISTORY_TREND_PX_PER_POINT,
+                           HISTORY_TREND_MIN_POINTS, HISTORY_TREND_DEFAULT_WIDTH_PX)
+    trend = minutes.iloc[lttb(minutes.index.asi8, minutes.to_numpy(), points)]
+    st.line_chart(
+        pd.DataFrame({"Day": trend.index, "Workout (min)": trend.round(1).to_numpy()}),
+        x="Day", y="Workout (min)", color="#ff4b4b",
+    )
+    if len(trend) < len(minutes):
+        st.caption(f"{len(trend)} of {len(minutes)} days shown (downsampled to the chart width); "
+                   "narrow the range to see every day.")
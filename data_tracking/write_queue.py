@@ -0,0 +1,216 @@
+# data_tracking/write_queue.py
+"""
+Write-behind queue for finished sessions.
+
+`save_workout_session_data` runs on the script thread that is rendering the
+page, so it only puts the record on this queue. One background thread per
+process takes what has accumulated (up to `HISTORY_WRITE_BATCH_SIZE`
+records) and writes it to the history store in a single transaction.
+
+* Bounded: at most `HISTORY_WRITE_QUEUE_SIZE` records wait in memory. When
+  the writer falls that far behind, `put` waits briefly for room and then
+  writes the record itself, so nothing is dropped.
+* Lock contention: a batch that fails because the database is busy or locked
+  is retried with exponential backoff; one that still fails is logged and
+  counted in `failed`. A batch that fails for any other reason is saved
+  again one record at a time, so a bad record only loses itself.
+* Shutdown: `flush` is registered with `atexit` when the writer starts, so
+  queued records are written before the interpreter exits.
+
+`stats()` reports the queue depth and the flush latency (time to write a
+batch, retries included).
+"""
+import atexit
+import logging
+import queue
+import sqlite3
+import threading
+import time
+
+from configs.app_config import (
+    HISTORY_WRITE_BATCH_SIZE,
+    HISTORY_WRITE_ENQUEUE_TIMEOUT_SECONDS,
+    HISTORY_WRITE_FLUSH_TIMEOUT_SECONDS,
+    HISTORY_WRITE_QUEUE_SIZE,
+    HISTORY_WRITE_RETRIES,
+    HISTORY_WRITE_RETRY_BACKOFF_SECONDS,
+)
+from data_tracking.history_store import HistoryStore, get_history_store
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+_CONTENTION_CODES = {sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED}
+
+
+def _is_contention(exc: Exception) -> bool:
+    return isinstance(exc, sqlite3.OperationalError) and getattr(exc, "sqlite_errorcode", None) in _CONTENTION_CODES
+
+
+class WriteBehindQueue:
+    def __init__(self, store: HistoryStore, maxsize: int = HISTORY_WRITE_QUEUE_SIZE,
+                 batch_size: int = HISTORY_WRITE_BATCH_SIZE):
+        self.store = store
+        self.batch_size = batch_size
+        self._queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._pending = 0  # queued or being written
+        # counters
+        self.enqueued = 0
+        self.written = 0
+        self.batches = 0
+        self.retries = 0
+        self.failed = 0
+        self.overflow_writes = 0
+        self.max_depth = 0
+        self.flush_ms_last = 0.0
+        self.flush_ms_max = 0.0
+        self.flush_ms_total = 0.0
+
+    # ----- producer side ------------------------------------------------
+    def put(self, user_id: str, record: dict) -> None:
+        """Queues one record; only blocks (briefly) when the queue is full."""
+        self._ensure_writer()
+        with self._lock:
+            self._pending += 1
+            self.enqueued += 1
+        try:
+            self._queue.put((user_id, record), timeout=HISTORY_WRITE_ENQUEUE_TIMEOUT_SECONDS)
+        except queue.Full:
+            with self._lock:
+                self.overflow_writes += 1
+            self._write([(user_id, record)])
+            return
+        with self._lock:
+            self.max_depth = max(self.max_depth, self._queue.qsize())
+
+    def drain(self, timeout: float | None = None) -> bool:
+        """Waits until everything queued so far is written; False on timeout."""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+
+    def flush(self, timeout: float = HISTORY_WRITE_FLUSH_TIMEOUT_SECONDS) -> bool:
+        """Writes what is queued and stops the writer (it restarts on the next put)."""
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return self._pending == 0
+        deadline = time.monotonic() + timeout
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            logger.error("History writer did not take the stop request within %.1f s; %d session(s) not saved.",
+                         timeout, self._pending)
+            return False
+        thread.join(max(deadline - time.monotonic(), 0.0))
+        if thread.is_alive():
+            logger.error("History writer did not finish within %.1f s; %d session(s) not saved.",
+                         timeout, self._pending)
+            return False
+        return True
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "depth": self._queue.qsize(),
+                "max_depth": self.max_depth,
+                "pending": self._pending,
+                "enqueued": self.enqueued,
+                "written": self.written,
+                "batches": self.batches,
+                "retries": self.retries,
+                "failed": self.failed,
+                "overflow_writes": self.overflow_writes,
+                "flush_ms_last": round(self.flush_ms_last, 2),
+                "flush_ms_max": round(self.flush_ms_max, 2),
+                "flush_ms_mean": round(self.flush_ms_total / self.batches, 2) if self.batches else 0.0,
+            }
+
+    # ----- writer thread --------------------------------------------------
+    def _ensure_writer(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                if self._thread is None:
+                    atexit.register(self.flush)
+                self._thread = threading.Thread(target=self._run, name="history-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            batch = []
+            stop = item is _STOP
+            if not stop:
+                batch.append(item)
+            while len(batch) < self.batch_size and not stop:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                else:
+                    batch.append(item)
+            if batch:
+                self._write(batch)
+            if stop:
+                return
+
+    def _save(self, batch: list[tuple[str, dict]]) -> tuple[Exception | None, int]:
+        """Saves `batch` in one transaction, retrying on contention; (error or None, retries)."""
+        retries = 0
+        while True:
+            try:
+                self.store.save_entries(batch)
+                return None, retries
+            except Exception as exc:  # noqa: BLE001 - the writer thread must survive
+                if _is_contention(exc) and retries < HISTORY_WRITE_RETRIES:
+                    time.sleep(HISTORY_WRITE_RETRY_BACKOFF_SECONDS * 2 ** retries)
+                    retries += 1
+                    continue
+                return exc, retries
+
+    def _write(self, batch: list[tuple[str, dict]]) -> None:
+        started = time.perf_counter()
+        error, retries = self._save(batch)
+        written, failed = (len(batch), 0) if error is None else (0, len(batch))
+        if error is not None and len(batch) > 1 and not _is_contention(error):
+            # Probably one bad record: save the rest one at a time, so only it is lost.
+            written = failed = 0
+            for entry in batch:
+                error, entry_retries = self._save([entry])
+                retries += entry_retries
+                if error is None:
+                    written += 1
+                else:
+                    failed += 1
+                    logger.error("Could not save a workout session of user %s: %s", entry[0], error, exc_info=error)
+        elif error is not None:
+            logger.error("Could not save %d workout session(s): %s", len(batch), error, exc_info=error)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._idle:
+            self.retries += retries
+            self.written += written
+            self.failed += failed
+            self.batches += 1
+            self.flush_ms_last = elapsed_ms
+            self.flush_ms_max = max(self.flush_ms_max, elapsed_ms)
+            self.flush_ms_total += elapsed_ms
+            self._pending -= len(batch)
+            self._idle.notify_all()
+
+_write_queue: WriteBehindQueue | None = None
+_write_queue_lock = threading.Lock()
+
+
+def get_write_queue() -> WriteBehindQueue:
+    """The process-wide queue in front of `get_history_store()`."""
+    global _write_queue
+    if _write_queue is None:
+        with _write_queue_lock:
+            if _write_queue is None:
+                _write_queue = WriteBehindQueue(get_history_store())
+    return _write_queue
@@ -3,7 +3,7 @@ import streamlit as st
 from utils.helpers import initialize_session_state_defaults
 from ui.sidebar_controls import render_sidebar_controls
 from ai_components.workout_generator import get_ai_workout_suggestions
-from configs.app_config import DEFAULT_WORKOUT_DURATION, DEFAULT_REST_DURATION # For defaults
+from core.session_manager import WorkoutSession
 
 # --- Page Configuration ---
 st.set_page_config(
@@ -22,8 +22,8 @@ def handle_ai_suggestions():
     user_description = st.session_state.ai_workout_prompt_input
     if user_description:
         # Get current workout and rest durations from session state (set by sidebar)
-        workout_duration = st.session_state.get('workout_duration', DEFAULT_WORKOUT_DURATION)
-        rest_duration = st.session_state.get('rest_duration', DEFAULT_REST_DURATION)
+        timer = st.session_state.timer_state
+        workout_duration, rest_duration = timer.workout_duration, timer.rest_duration
         
         with st.spinner("🤖 Crafting your workout plan..."):
             suggestions = get_ai_workout_suggestions(
@@ -53,8 +53,8 @@ st.write("""
 st.markdown("---")
 st.subheader("🤖 Get AI Workout Suggestions")
 
-current_w_duration = st.session_state.get('workout_duration', DEFAULT_WORKOUT_DURATION)
-current_r_duration = st.session_state.get('rest_duration', DEFAULT_REST_DURATION)
+current_w_duration = st.session_state.timer_state.workout_duration
+current_r_duration = st.session_state.timer_state.rest_duration
 st.caption(f"Current timer settings: {current_w_duration}s work / {current_r_duration}s rest per exercise.")
 
 st.text_input(
@@ -93,7 +93,7 @@ with col1:
         updated_schedule = [line.strip() for line in current_text_area_content.splitlines() if line.strip()]
         
         st.session_state.workout_schedule = updated_schedule
-        st.session_state.current_exercise_index = 0
+        WorkoutSession().restart_schedule()
         st.session_state.ai_generated_schedule_text = "" 
         st.toast("Workout list saved!", icon="✅")
         st.success("Workout list updated successfully!")
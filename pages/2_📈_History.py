@@ -0,0 +1,26 @@
+# workout_app/pages/2_📈_History.py
+import streamlit as st
+from utils.helpers import initialize_session_state_defaults
+from ui.sidebar_controls import render_sidebar_controls
+from data_tracking.visualization import render_historical_charts
+from utils.browser_bridge import render_bridge
+
+# --- Page Configuration ---
+st.set_page_config(
+    page_title="Workout History",
+    page_icon="📈",
+    layout="wide",
+    initial_sidebar_state="collapsed"
+)
+
+# --- Initialize Session State & Render Sidebar ---
+initialize_session_state_defaults()
+render_sidebar_controls()
+
+st.title("📈 Workout History")
+st.markdown("Your saved sessions by day, week and month.")
+
+render_historical_charts()
+
+# Reports the viewport width the trend chart is downsampled to.
+render_bridge()
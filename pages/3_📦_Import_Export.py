@@ -0,0 +1,91 @@
+# workout_app/pages/3_📦_Import_Export.py
+import io
+
+import streamlit as st
+from utils.helpers import initialize_session_state_defaults
+from ui.sidebar_controls import render_sidebar_controls
+from configs.app_config import HISTORY_IMPORT_MAX_UPLOAD_MB
+from data_tracking import transfer
+from data_tracking.storage import current_user_id, export_workout_history, import_workout_history
+
+# --- Page Configuration ---
+st.set_page_config(
+    page_title="Import / Export",
+    page_icon="📦",
+    layout="wide",
+    initial_sidebar_state="collapsed"
+)
+
+# --- Initialize Session State & Render Sidebar ---
+initialize_session_state_defaults()
+render_sidebar_controls()
+
+st.title("📦 Import / Export")
+st.markdown("Move your workout history in and out of the app as CSV or JSON lines.")
+
+# --- Import ---
+st.subheader("Import")
+st.caption(
+    "**JSON lines**: one saved session per line, as exported below. "
+    "**CSV**: one row per interval, with the columns `" + ",".join(transfer.CSV_COLUMNS) + "`; "
+    "consecutive rows with the same `session` are one session, `phase` is GET_READY, WORKOUT or REST. "
+    "Sessions already in your history are skipped. Larger files: `python -m data_tracking import FILE`."
+)
+uploaded = st.file_uploader(
+    "History file", type=["csv", "jsonl", "ndjson"], max_upload_size=HISTORY_IMPORT_MAX_UPLOAD_MB,
+    key="history_import_file",
+)
+if uploaded is not None and st.button("Import", type="primary", key="history_import_start"):
+    bar = st.progress(0.0, text="Importing...")
+    imported_so_far = 0
+
+    def show_progress(sessions: int, bytes_read: int):
+        global imported_so_far
+        imported_so_far = sessions
+        bar.progress(min(bytes_read / max(uploaded.size, 1), 1.0), text=f"{sessions:,} sessions imported...")
+
+    try:
+        result = import_workout_history(uploaded, transfer.detect_format(uploaded.name), progress=show_progress)
+    except Exception as e:
+        bar.empty()
+        st.error(f"Import stopped: {e}")
+        st.info(f"{imported_so_far:,} session(s) were imported before it stopped; importing the file again "
+                "skips them and continues.")
+    else:
+        bar.progress(1.0, text="Done.")
+        st.success(f"Imported {result.sessions:,} session(s); {result.duplicates:,} were already in your history.")
+        if result.skipped:
+            st.warning(f"{result.skipped:,} invalid session(s) or line(s) skipped:\n\n"
+                       + "\n".join(f"- {error}" for error in result.errors))
+
+# --- Export ---
+st.subheader("Export")
+export_format = st.radio(
+    "Format", transfer.FORMATS, horizontal=True, key="history_export_format",
+    format_func={transfer.CSV: "CSV (intervals)", transfer.JSONL: "JSON lines (lossless)"}.get,
+)
+
+
+st.caption(
+    "The file is built in memory when you click Download, so exporting a very large history from here needs that "
+    "much server memory; `python -m data_tracking export FILE` streams it to disk instead."
+)
+# Streamlit calls `export_file` after this run has ended, outside the script
+# context, so `current_user_id()` would fall back to DEFAULT_USER_ID there:
+# the user and format are taken now.
+export_user_id = current_user_id()
+export_fmt = export_format
+
+
+def export_file() -> bytes:
+    # Built only when the button is clicked; Streamlit keeps download data in memory.
+    file = io.BytesIO()
+    export_workout_history(file, export_fmt, user_id=export_user_id)
+    return file.getvalue()
+
+
+st.download_button(
+    "Download history", data=export_file, file_name=f"workout_history.{export_format}",
+    mime="text/csv" if export_format == transfer.CSV else "application/x-ndjson",
+    key="history_export_download",
+)
@@ -0,0 +1,145 @@
+// ui/bridge/bridge.js
+// Browser side of utils/browser_bridge.py: one zero-height component, kept
+// mounted for the whole session, that runs the server's commands against
+// the main page and reports client state back.
+//
+// Every render carries {session, batch, commands, assets?}. `batch` increases
+// once per rerun that queued something, so re-renders of an old batch (a
+// rerun with nothing new, or the iframe remounting after a page switch) are
+// no-ops; `session` restarts the count when the server session is new.
+// Commands:
+//   {type: "play_sound", name, seq, cue}
+//   {type: "schedule_cues", cues}      an empty list cancels queued cues
+//   {type: "request_permission"}
+//   {type: "notify", title, body, icon, sound, tag, only_when_hidden}
+//   {type: "alert", message}
+// Client events, sent as the component value (only when they change):
+//   {audio_unlocked, visibility, notification_permission, viewport_width}
+// viewport_width is rounded to VIEWPORT_STEP pixels so resizing does not
+// rerun the app for every pixel.
+(function () {
+  const host = window.parent;
+
+  function post(type, data) {
+    host.postMessage(Object.assign({isStreamlitMessage: true, type: type}, data), "*");
+  }
+
+  // ----- sound channel in the main document --------------------------------
+  // Loaded there (not in this iframe) so it shares the page's user
+  // activation and survives this iframe being remounted.
+  let channelReady = null;
+  function channel() {
+    if (!channelReady) {
+      channelReady = new Promise((resolve) => {
+        if (host.workoutSoundChannel) return resolve(host.workoutSoundChannel);
+        const script = host.document.createElement("script");
+        script.src = new URL("sound_channel.js", window.location.href).href;
+        script.onload = () => resolve(host.workoutSoundChannel);
+        host.document.head.appendChild(script);
+      });
+    }
+    return channelReady;
+  }
+
+  // ----- commands -------------------------------------------------------
+  function notify(cmd) {
+    if (!("Notification" in host)) return;
+    const show = () => host.Notification.requestPermission().then((perm) => {
+      if (perm !== "granted") return;
+      new host.Notification(cmd.title, {body: cmd.body, icon: cmd.icon || undefined, tag: cmd.tag || undefined});
+      if (cmd.sound) new host.Audio(cmd.sound).play().catch(() => {});
+      report();
+    });
+    if (!cmd.only_when_hidden || host.document.visibilityState === "hidden") {
+      show();
+      return;
+    }
+    const onHidden = () => {
+      if (host.document.visibilityState !== "hidden") return;
+      host.document.removeEventListener("visibilitychange", onHidden);
+      show();
+    };
+    host.document.addEventListener("visibilitychange", onHidden);
+  }
+
+  const HANDLERS = {
+    play_sound: (sound, cmd) => sound.play(cmd.name, cmd.seq, cmd.cue),
+    schedule_cues: (sound, cmd) => sound.scheduleCues(cmd.cues),
+    request_permission: (sound) => {
+      sound.unlock();
+      if ("Notification" in host) host.Notification.requestPermission().then(report, report);
+    },
+    notify: (sound, cmd) => notify(cmd),
+    alert: (sound, cmd) => host.alert(cmd.message),
+  };
+
+  function run(args) {
+    channel().then((sound) => {
+      if (args.assets) sound.setAssets(args.assets);
+      const last = host.workoutBridgeLast || {};
+      if (last.session === args.session && args.batch <= last.batch) return;
+      if (last.session !== args.session) sound.newSession();
+      host.workoutBridgeLast = {session: args.session, batch: args.batch};
+      args.commands.forEach((cmd) => {
+        const handler = HANDLERS[cmd.type];
+        if (!handler) {
+          console.warn("[bridge] unknown command", cmd.type);
+          return;
+        }
+        try {
+          handler(sound, cmd);
+        } catch (e) {
+          console.error("[bridge]", cmd.type, e);
+        }
+      });
+    });
+  }
+
+  // ----- client events --------------------------------------------------
+  // What was last reported lives on the page too, so a remounted iframe
+  // does not send (and rerun the app for) an unchanged state.
+  const VIEWPORT_STEP = 100;
+  let rendered = false;
+  function report() {
+    if (!rendered) return;
+    const state = {
+      audio_unlocked: !!(host.audioCtx && host.audioCtx.state === "running"),
+      visibility: host.document.visibilityState,
+      notification_permission: "Notification" in host ? host.Notification.permission : "unsupported",
+      viewport_width: Math.round(host.innerWidth / VIEWPORT_STEP) * VIEWPORT_STEP,
+    };
+    const serialized = JSON.stringify(state);
+    if (serialized === host.workoutBridgeReported) return;
+    host.workoutBridgeReported = serialized;
+    post("streamlit:setComponentValue", {value: state, dataType: "json"});
+  }
+
+  let resizeTimer = null;
+  function onResize() {
+    clearTimeout(resizeTimer);
+    resizeTimer = setTimeout(report, 250);
+  }
+
+  host.addEventListener("workout-audio-state", report);
+  host.addEventListener("resize", onResize);
+  host.document.addEventListener("visibilitychange", report);
+  window.addEventListener("pagehide", () => {
+    host.removeEventListener("workout-audio-state", report);
+    host.removeEventListener("resize", onResize);
+    host.document.removeEventListener("visibilitychange", report);
+  });
+
+  window.addEventListener("message", (event) => {
+    if (event.data && event.data.type === "streamlit:render") {
+      const args = event.data.args;
+      if ((host.workoutBridgeLast || {}).session !== args.session) {
+        host.workoutBridgeReported = null;  // new server session: report again
+      }
+      rendered = true;
+      run(args);
+      report();
+    }
+  });
+  post("streamlit:componentReady", {apiVersion: 1});
+  post("streamlit:setFrameHeight", {height: 0});
+})();
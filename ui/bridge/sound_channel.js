@@ -0,0 +1,146 @@
+// ui/bridge/sound_channel.js
+// Long-lived sound channel for the page. The browser bridge (bridge.js) adds
+// this script to the main document once per page load, so the audio lives
+// where the user's clicks unlock it; the bridge then forwards commands:
+//   setAssets(assets)     {"urls": [...], "sounds": {"Beep_High": 0, ...}}
+//   play(name, seq, cue)  play a sound now (skipped if `cue` was already
+//                         scheduled on the audio clock)
+//   scheduleCues(cues)    replace the look-ahead queue; each cue is
+//                         {key, in, sound}, `in` seconds from now
+//   cancelCues()          drop every cue that has not started yet
+//   unlock()              resume the AudioContext (also run on every
+//                         click and key press)
+//   newSession()          the server session changed: its play_sound
+//                         `seq` numbers start again at 1
+(function () {
+  if (window.workoutSoundChannel) return;
+
+  // Same voices as window.playJsSound: [first Hz, second Hz, seconds, type]
+  const TONES = {
+    Beep_High: [880, 0, 0.15, "sine"],
+    Beep_Low: [440, 0, 0.15, "sine"],
+    Double_Beep: [660, 880, 0.15, "sine"],
+    Success: [523.25, 783.99, 0.3, "sine"],
+    Error: [300, 0, 0.15, "sawtooth"],
+  };
+
+  const players = {};  // url index -> preloaded HTMLAudioElement
+
+  const channel = window.workoutSoundChannel = {
+    assets: {urls: [], sounds: {}},
+    lastSeq: 0,
+    cues: {},  // cue key -> {when, nodes}; kept after playing, for play()
+
+    audioContext() {
+      if (!window.audioCtx) {
+        try {
+          window.audioCtx = new (window.AudioContext || window.webkitAudioContext)();
+        } catch (e) {
+          return null;
+        }
+        // The bridge reports unlocks back to the server.
+        window.audioCtx.addEventListener("statechange", () => {
+          window.isAudioUnlocked = window.audioCtx.state === "running";
+          window.dispatchEvent(new Event("workout-audio-state"));
+        });
+      }
+      window.isAudioUnlocked = window.audioCtx.state === "running";
+      return window.audioCtx;
+    },
+
+    setAssets(assets) {
+      this.assets = assets;
+      assets.urls.forEach((_, idx) => this.player(idx));
+    },
+
+    player(idx) {
+      if (!players[idx]) {
+        players[idx] = new Audio(this.assets.urls[idx]);
+        players[idx].preload = "auto";
+      }
+      return players[idx];
+    },
+
+    newSession() {
+      this.lastSeq = 0;
+    },
+
+    play(name, seq, cue) {
+      // A command re-rendered by a later rerun must not beep again.
+      if (seq <= this.lastSeq) return;
+      this.lastSeq = seq;
+      if (cue && this.cues[cue]) return;  // already on the audio clock
+      const synth = () => {
+        const ctx = this.audioContext();
+        if (ctx && ctx.state === "running") this.tone(name, ctx.currentTime);
+      };
+      const idx = this.assets.sounds[name];
+      if (idx === undefined) { synth(); return; }
+      const audio = this.player(idx);
+      audio.currentTime = 0;
+      audio.play().catch(synth);  // autoplay blocked or asset unreachable
+    },
+
+    tone(name, when) {
+      const [freq1, freq2, seconds, type] = TONES[name] || TONES.Beep_High;
+      const ctx = window.audioCtx;
+      const nodes = [];
+      const note = (freq, start, length, oscType) => {
+        const osc = ctx.createOscillator();
+        const gain = ctx.createGain();
+        osc.connect(gain);
+        gain.connect(ctx.destination);
+        gain.gain.setValueAtTime(0.5, start);
+        gain.gain.linearRampToValueAtTime(0, start + length);
+        osc.frequency.setValueAtTime(freq, start);
+        osc.type = oscType;
+        osc.start(start);
+        osc.stop(start + length);
+        nodes.push(osc);
+      };
+      note(freq1, when, seconds, type);
+      if (freq2) {
+        const delay = name === "Success" ? 0.15 : 0.1;
+        note(freq2, when + delay, name === "Success" ? seconds - delay : seconds / 2, "sine");
+      }
+      return nodes;
+    },
+
+    scheduleCues(cues) {
+      this.cancelCues();
+      const ctx = this.audioContext();
+      // A suspended clock does not advance: leave those beeps to play().
+      if (!ctx || ctx.state !== "running") return;
+      const now = ctx.currentTime;
+      cues.forEach((cue) => {
+        if (cue.in < 0.05 || this.cues[cue.key]) return;
+        const when = now + cue.in;
+        this.cues[cue.key] = {when: when, nodes: this.tone(cue.sound, when)};
+      });
+    },
+
+    cancelCues() {
+      const ctx = window.audioCtx;
+      const now = ctx ? ctx.currentTime : 0;
+      Object.keys(this.cues).forEach((key) => {
+        const cue = this.cues[key];
+        if (cue.when > now) {
+          cue.nodes.forEach((node) => { try { node.stop(0); } catch (e) {} });
+          delete this.cues[key];
+        } else if (cue.when < now - 600) {
+          delete this.cues[key];  // played long ago
+        }
+      });
+    },
+  };
+
+  // Browsers only start an AudioContext from a user gesture.
+  const unlock = channel.unlock = () => {
+    const ctx = channel.audioContext();
+    if (ctx && ctx.state === "suspended") {
+      ctx.resume();
+    }
+  };
+  document.addEventListener("pointerdown", unlock, true);
+  document.addEventListener("keydown", unlock, true);
+})();
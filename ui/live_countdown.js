@@ -0,0 +1,55 @@
+// ui/live_countdown.js
+// Browser-side countdown for the "Browser countdown" timer mode.
+// The server injects the upcoming phase plan as __PHASE_PLAN__; this script
+// animates the digits, phase header and progress bar from it until the
+// server syncs again at the next phase boundary.
+(function () {
+    const plan = __PHASE_PLAN__;
+    const token = {};
+    window.liveCountdownToken = token;
+
+    const startedAt = performance.now();
+    const gradientClasses = ["workout-gradient-colors", "rest-gradient-colors", "default-gradient-colors"];
+    const barClasses = ["custom-bar-workout", "custom-bar-rest", "custom-bar-default"];
+
+    function formatTime(seconds) {
+        const m = Math.floor(seconds / 60);
+        const s = seconds % 60;
+        return String(m).padStart(2, "0") + ":" + String(s).padStart(2, "0");
+    }
+
+    function swapClass(el, choices, wanted) {
+        choices.forEach(c => el.classList.toggle(c, c === wanted));
+    }
+
+    function render() {
+        const header = document.querySelector(".live-phase-header");
+        const digits = document.querySelector(".live-timer-digits");
+        const bar = document.querySelector(".live-progress-fill");
+        if (window.liveCountdownToken !== token || !digits || !digits.isConnected) {
+            clearInterval(timer);
+            return;
+        }
+
+        const elapsed = (performance.now() - startedAt) / 1000;
+        const entry = plan.find(p => p.ends_in > elapsed) || plan[plan.length - 1];
+        const remaining = Math.max(Math.ceil(entry.ends_in - elapsed), 0);
+        const progress = entry.duration > 0
+            ? Math.min(Math.max((entry.duration - remaining) / entry.duration, 0), 1)
+            : 0;
+
+        digits.textContent = formatTime(remaining);
+        swapClass(digits, gradientClasses, entry.gradient);
+        if (header) {
+            header.textContent = entry.header;
+            swapClass(header, gradientClasses, entry.gradient);
+        }
+        if (bar) {
+            bar.style.width = Math.floor(progress * 100) + "%";
+            swapClass(bar, barClasses, entry.bar);
+        }
+    }
+
+    const timer = setInterval(render, 250);
+    render();
+})();
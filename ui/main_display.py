@@ -3,64 +3,110 @@ import streamlit as st
 from core.session_manager import WorkoutSession
 from configs.app_config import (
     PHASE_GET_READY, PHASE_WORKOUT, PHASE_REST, PHASE_PAUSED, # Import new phase
-    MOTIVATIONAL_MESSAGES
+    MOTIVATIONAL_MESSAGES, LIVE_TIMER_REFRESH_SECONDS,
+    TIMER_MODE_CLIENT, CLIENT_PHASE_PLAN_LENGTH, CLIENT_SYNC_MARGIN_SECONDS,
+    SCHEDULER_WAKE_MARGIN_SECONDS,
 )
+from core.scheduler import book_fragment_rerun, cancel_session_reruns, use_server_scheduler
 from data_tracking.visualization import display_workout_insights
-from streamlit_js_eval import streamlit_js_eval
+from utils.browser_bridge import request_permission
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 import html
+import json
+import os
 import random
 
 
-def render_main_display(session: WorkoutSession, trigger_ai_feedback_callback=None) -> None:
+_COUNTDOWN_JS_PATH = os.path.join(os.path.dirname(__file__), "live_countdown.js")
+_countdown_js_template: str | None = None
+
+
+def _phase_style(phase: str, exercise: str | None) -> tuple[str, str, str]:
+    """Returns (gradient class, progress bar class, header text) for a phase."""
+    if phase == PHASE_GET_READY:
+        return "rest-gradient-colors", "custom-bar-rest", "⏱️ GET READY!"
+    if phase == PHASE_WORKOUT:
+        return "workout-gradient-colors", "custom-bar-workout", f"💪 {exercise or 'WORKOUT!'}"
+    if phase == PHASE_REST:
+        return "rest-gradient-colors", "custom-bar-rest", "🧘 REST"
+    if phase == PHASE_PAUSED:
+        # Neutral gradient for paused
+        return "default-gradient-colors", "custom-bar-default", "⏸️ PAUSED"
+    return "default-gradient-colors", "custom-bar-default", f"🏁 {phase.capitalize()}"
+
+
+def _is_fragment_rerun() -> bool:
+    ctx = get_script_run_ctx()
+    return bool(ctx and ctx.fragment_ids_this_run)
+
+
+def _render_client_countdown(session: WorkoutSession) -> None:
+    """Sends the upcoming phase plan and the script that animates it."""
+    global _countdown_js_template
+    if _countdown_js_template is None:
+        with open(_COUNTDOWN_JS_PATH) as f:
+            _countdown_js_template = f.read()
+
+    plan = []
+    for entry in session.get_phase_plan(CLIENT_PHASE_PLAN_LENGTH):
+        gradient, bar, header = _phase_style(entry["phase"], entry["exercise"])
+        plan.append({
+            "ends_in": entry["ends_in"],
+            "duration": entry["duration"],
+            "header": header,
+            "gradient": gradient,
+            "bar": bar,
+        })
+    plan_json = json.dumps(plan).replace("</", "<\\/")
+    st.html(
+        f"<script>{_countdown_js_template.replace('__PHASE_PLAN__', plan_json)}</script>",
+        unsafe_allow_javascript=True,
+    )
+
+
+def _book_next_refresh(session: WorkoutSession, client_mode: bool) -> None:
     """
-    Renders the main timer display and control buttons.
+    Books the next live timer rerun with the shared server scheduler (when
+    that fails, the app reruns with the browser timer instead).
+    """
+    if not session.is_running():
+        cancel_session_reruns()
+    elif client_mode:
+        book_fragment_rerun(session.seconds_until_phase_end() + CLIENT_SYNC_MARGIN_SECONDS)
+    else:
+        book_fragment_rerun(session.seconds_until_tick() + SCHEDULER_WAKE_MARGIN_SECONDS)
 
-    Args:
-        session (WorkoutSession): The current workout session object.
-        trigger_ai_feedback_callback (callable, optional):
-            The function to call when the pause button is clicked.
+
+def _render_live_timer(session: WorkoutSession, scheduled: bool = False) -> None:
     """
-    st.markdown(
-        "<h3 style='text-align:center;margin-bottom:10px;'>⏱️ Workout Timer</h3>",
-        unsafe_allow_html=True,
-    )
+    Renders the phase header, timer digits, next-up line and progress bar.
+
+    Runs as a fragment while the timer is running, so only this block is
+    re-sent. In server mode it refreshes every second; in browser-countdown
+    mode the page animates the digits itself and the fragment only wakes at
+    the phase boundary. With `scheduled` the wake-ups come from the shared
+    server scheduler (core/scheduler.py) instead of a browser timer. Phase
+    transitions (which change the stats, sounds and button states) hand over
+    to a full app rerun.
+    """
+    client_mode = st.session_state.get("timer_mode") == TIMER_MODE_CLIENT
+    if session.phase_change_due() or (client_mode and _is_fragment_rerun()):
+        st.rerun(scope="app")
+    session.tick()
 
     current_phase = session.get_current_phase()
     time_display = session.get_current_time_display() # Already handles paused time
     current_exercise = session.get_current_exercise()
     schedule_exists = bool(st.session_state.get("workout_schedule"))
 
-    text_gradient_color_class = "default-gradient-colors"
-    progress_bar_fill_class = "custom-bar-default"
-    phase_icon = "🏁"
-    phase_text_content = current_phase.capitalize()
-
-    if current_phase == PHASE_GET_READY:
-        text_gradient_color_class = "rest-gradient-colors"
-        progress_bar_fill_class = "custom-bar-rest"
-        phase_icon = "⏱️"
-        phase_text_content = "GET READY!"
-    elif current_phase == PHASE_WORKOUT:
-        text_gradient_color_class = "workout-gradient-colors"
-        progress_bar_fill_class = "custom-bar-workout"
-        phase_icon = "💪"
-        phase_text_content = html.escape(current_exercise) if schedule_exists and current_exercise else "WORKOUT!"
-    elif current_phase == PHASE_REST:
-        text_gradient_color_class = "rest-gradient-colors"
-        progress_bar_fill_class = "custom-bar-rest"
-        phase_icon = "🧘"
-        phase_text_content = "REST"
-    elif current_phase == PHASE_PAUSED:
-        text_gradient_color_class = "default-gradient-colors" # Neutral gradient for paused
-        progress_bar_fill_class = "custom-bar-default"
-        phase_icon = "⏸️"
-        phase_text_content = "PAUSED"
-
+    text_gradient_color_class, progress_bar_fill_class, phase_header = _phase_style(
+        current_phase, current_exercise if schedule_exists else None
+    )
 
     st.markdown(
         f"""
-        <div class="animated-gradient-text-base phase-header-gradient {text_gradient_color_class}">
-            {phase_icon} {phase_text_content}
+        <div class="animated-gradient-text-base phase-header-gradient live-phase-header {text_gradient_color_class}">
+            {html.escape(phase_header)}
         </div>
         """,
         unsafe_allow_html=True,
@@ -68,7 +114,7 @@ def render_main_display(session: WorkoutSession, trigger_ai_feedback_callback=No
 
     st.markdown(
         f"""
-        <div class="animated-gradient-text-base timer-numbers-display {text_gradient_color_class}">
+        <div class="animated-gradient-text-base timer-numbers-display live-timer-digits {text_gradient_color_class}">
             {time_display}
         </div>
         """,
@@ -128,13 +174,59 @@ def render_main_display(session: WorkoutSession, trigger_ai_feedback_callback=No
         f"""
         <div class="custom-progress-wrapper">
             <div class="custom-progress-bg">
-                <div class="custom-bar-fill {progress_bar_fill_class}" style="width:{progress_value_percent}%;"></div>
+                <div class="custom-bar-fill live-progress-fill {progress_bar_fill_class}" style="width:{progress_value_percent}%;"></div>
             </div>
         </div>
         """,
         unsafe_allow_html=True,
     )
 
+    if client_mode and session.is_running():
+        _render_client_countdown(session)
+
+    if scheduled:
+        _book_next_refresh(session, client_mode)
+
+
+def _render_ai_feedback(session: WorkoutSession, schedule_exists: bool) -> None:
+    st.subheader("🧠 AI Feedback") # Updated Title
+
+    # Display AI feedback if available, otherwise show the placeholder
+    feedback_message = st.session_state.get("ai_feedback", "Pause your workout to receive AI feedback.")
+    st.info(feedback_message)
+
+    # Check for the no-schedule warning *only when paused*
+    if session.is_paused() and not schedule_exists and "For more targeted feedback" not in feedback_message:
+         st.warning('Add exercises via the "Add Workout" menu for targeted feedback!', icon="💡")
+
+
+def render_main_display(session: WorkoutSession, trigger_ai_feedback_callback=None) -> None:
+    """
+    Renders the main timer display and control buttons.
+
+    Args:
+        session (WorkoutSession): The current workout session object.
+        trigger_ai_feedback_callback (callable, optional):
+            The function to call when the pause button is clicked.
+    """
+    st.markdown(
+        "<h3 style='text-align:center;margin-bottom:10px;'>⏱️ Workout Timer</h3>",
+        unsafe_allow_html=True,
+    )
+
+    scheduled = use_server_scheduler()
+    if not session.is_running() or scheduled:
+        refresh_every = None
+    elif st.session_state.get("timer_mode") == TIMER_MODE_CLIENT:
+        # Wake up once, just after the current phase ends.
+        refresh_every = session.seconds_until_phase_end() + CLIENT_SYNC_MARGIN_SECONDS
+    else:
+        refresh_every = LIVE_TIMER_REFRESH_SECONDS
+    live_timer = st.fragment(_render_live_timer, run_every=refresh_every)
+    live_timer(session, scheduled)
+
+    schedule_exists = bool(st.session_state.get("workout_schedule"))
+
     # --- Control buttons ---
     col1, col2, col3 = st.columns([2, 2, 1]) # Keep 3 columns for Start/Resume, Pause, Reset
 
@@ -146,7 +238,7 @@ def render_main_display(session: WorkoutSession, trigger_ai_feedback_callback=No
                 st.rerun()
         elif not session.is_running_or_paused(): # Initial state, or after reset
             if st.button("🚀 Start", use_container_width=True, key="start_button"):
-                streamlit_js_eval(js_code="if(typeof window.requestSoundPermissionAndUnlock === 'function') { window.requestSoundPermissionAndUnlock(); } else { console.error('[AUDIO DEBUG] requestSoundPermissionAndUnlock not found.'); }")
+                request_permission()
                 session.start_session()
                 st.rerun()
         else: # Running, not paused
@@ -174,12 +266,4 @@ def render_main_display(session: WorkoutSession, trigger_ai_feedback_callback=No
     display_workout_insights(session)
 
     st.markdown("---")
-    st.subheader("🧠 AI Feedback") # Updated Title
-
-    # Display AI feedback if available, otherwise show the placeholder
-    feedback_message = st.session_state.get("ai_feedback", "Pause your workout to receive AI feedback.")
-    st.info(feedback_message)
-
-    # Check for the no-schedule warning *only when paused*
-    if session.is_paused() and not schedule_exists and "For more targeted feedback" not in feedback_message:
-         st.warning('Add exercises via the "Add Workout" menu for targeted feedback!', icon="💡")
\ No newline at end of file
+    _render_ai_feedback(session, schedule_exists)
@@ -1,11 +1,13 @@
 # workout_app/ui/sidebar_controls.py
 import streamlit as st
-from streamlit_js_eval import streamlit_js_eval
 
+from core.session_manager import WorkoutSession
 from configs.app_config import (
     SLIDER_OPTIONS,
     INSIGHTS_CHART_OPTIONS,
+    TIMER_MODE_OPTIONS,
 )
+from utils.browser_bridge import request_permission
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Sidebar controls
@@ -16,35 +18,37 @@ def render_sidebar_controls():
     # ------------------------------------------------------------------ #
     st.sidebar.header("⚙️ Timer Settings")
 
+    timer = st.session_state.timer_state
+
     workout_duration = st.sidebar.select_slider(
         "Workout Duration (seconds)",
         options=SLIDER_OPTIONS,
-        value=st.session_state.get("workout_duration", SLIDER_OPTIONS[8]),
+        value=timer.workout_duration,
         key="workout_duration_slider",
     )
     rest_duration = st.sidebar.select_slider(
         "Rest Duration (seconds)",
         options=SLIDER_OPTIONS,
-        value=st.session_state.get("rest_duration", SLIDER_OPTIONS[2]),
+        value=timer.rest_duration,
         key="rest_duration_slider",
     )
 
-    # push the new values into session_state immediately
-    if st.session_state.workout_duration_slider != st.session_state.workout_duration:
-        st.session_state.workout_duration = st.session_state.workout_duration_slider
-        if (
-            not st.session_state.get("timer_running", False)
-            and st.session_state.get("current_phase") == "WORKOUT"
-        ):
-            st.session_state.current_time = st.session_state.workout_duration
+    # push the new values into the timer immediately (an idle timer also
+    # goes back to Get Ready; a running one re-times the current phase)
+    if (workout_duration, rest_duration) != (timer.workout_duration, timer.rest_duration):
+        WorkoutSession(timer).update_durations(workout_duration, rest_duration)
 
-    if st.session_state.rest_duration_slider != st.session_state.rest_duration:
-        st.session_state.rest_duration = st.session_state.rest_duration_slider
-        if (
-            not st.session_state.get("timer_running", False)
-            and st.session_state.get("current_phase") == "REST"
-        ):
-            st.session_state.current_time = st.session_state.rest_duration
+    default_timer_mode = st.session_state.get("timer_mode", TIMER_MODE_OPTIONS[0])
+    st.session_state.timer_mode = st.sidebar.selectbox(
+        "Timer Updates:",
+        options=TIMER_MODE_OPTIONS,
+        index=TIMER_MODE_OPTIONS.index(default_timer_mode)
+        if default_timer_mode in TIMER_MODE_OPTIONS
+        else 0,
+        key="sb_timer_mode",
+        help="Browser countdown animates the timer on your device and only "
+        "syncs with the server when the phase changes.",
+    )
 
     # ------------------------------------------------------------------ #
     # 🔊 Master sound toggle (all per-event pickers removed)
@@ -60,12 +64,7 @@ def render_sidebar_controls():
 
         # When turning sound ON ask the browser for permission / unlock audio
         if st.session_state.sound_master_enabled:
-            streamlit_js_eval(
-                js_code=(
-                    "if (typeof window.requestSoundPermissionAndUnlock==='function') "
-                    "{ window.requestSoundPermissionAndUnlock(); }"
-                )
-            )
+            request_permission()
         st.rerun()
 
     st.sidebar.caption("Quickly mute or un-mute all app sounds.")
@@ -0,0 +1,144 @@
+// ui/sound_engine.js
+// Web Audio sound engine: audio unlock, permission request and the
+// `window.playJsSound()` synth beep the sound channel falls back to.
+
+// Make functions and context global for accessibility. The sound channel
+// (ui/bridge/sound_channel.js) may have created the context already.
+window.audioCtx = window.audioCtx || null;
+window.isAudioUnlocked = window.isAudioUnlocked || false;
+
+// Function to initialize/unlock AudioContext
+window.unlockAudio = function() {
+    // Only proceed if not already unlocked and running
+    if (window.isAudioUnlocked && window.audioCtx && window.audioCtx.state === 'running') {
+        // console.log("[AUDIO DEBUG] Audio Context already unlocked and running.");
+        return;
+    }
+
+    if (!window.audioCtx) {
+        try {
+            window.audioCtx = new (window.AudioContext || window.webkitAudioContext)();
+            console.log("[AUDIO DEBUG] Audio Context Created.");
+        } catch(e) {
+            console.error("[AUDIO DEBUG] Audio Context could not be created:", e);
+            return; // Exit if creation failed
+        }
+    }
+
+    if (window.audioCtx.state === 'suspended') {
+        console.log("[AUDIO DEBUG] Audio Context is suspended, attempting to resume...");
+        window.audioCtx.resume().then(() => {
+            window.isAudioUnlocked = true;
+            console.log("[AUDIO DEBUG] Audio Context Resumed successfully.");
+            // Play a silent buffer to "prime" the audio context
+            const buffer = window.audioCtx.createBuffer(1, 1, 22050);
+            const source = window.audioCtx.createBufferSource();
+            source.buffer = buffer;
+            source.connect(window.audioCtx.destination);
+            source.start(0);
+            console.log("[AUDIO DEBUG] Silent buffer played.");
+        }).catch(e => {
+            console.error("[AUDIO DEBUG] Audio Context resume failed:", e);
+            window.isAudioUnlocked = false;
+        });
+    } else if (window.audioCtx.state === 'running') {
+        window.isAudioUnlocked = true;
+        console.log("[AUDIO DEBUG] Audio Context is already running.");
+    } else {
+         console.log(`[AUDIO DEBUG] Audio Context in state: ${window.audioCtx.state}`);
+    }
+}
+
+// Function to request permission AND unlock audio (NEW/MODIFIED)
+window.requestSoundPermissionAndUnlock = function() {
+    console.log("[AUDIO DEBUG] requestSoundPermissionAndUnlock called.");
+    // 1. Try unlocking directly first
+    window.unlockAudio();
+
+    // 2. Check if Notification API exists
+    if (!("Notification" in window)) {
+        console.warn("[AUDIO DEBUG] Notification API not supported. Relying on click to unlock.");
+        return;
+    }
+
+    // 3. Request Notification Permission
+    Notification.requestPermission().then(perm => {
+        if (perm === 'granted') {
+            console.log('[AUDIO DEBUG] Notification permission granted.');
+            // Try unlocking AGAIN after permission (important!)
+            window.unlockAudio();
+        } else {
+            console.warn('[AUDIO DEBUG] Notification permission denied. Sound might not work.');
+            // Still try unlocking, as the click itself might be enough
+            window.unlockAudio();
+        }
+    }).catch(error => {
+        console.error('[AUDIO DEBUG] Error requesting notification permission:', error);
+        window.unlockAudio(); // Try unlocking even on error
+    });
+}
+
+// Function to play sounds using Web Audio API (MODIFIED for robustness)
+window.playJsSound = function(soundType = 'Beep_High', durationMs = 150) {
+    if (!window.audioCtx || !window.isAudioUnlocked || window.audioCtx.state !== 'running') {
+       console.warn(`[AUDIO DEBUG] Cannot play sound '${soundType}'. Context not ready (State: ${window.audioCtx ? window.audioCtx.state : 'null'}, Unlocked: ${window.isAudioUnlocked}). Needs user interaction/permission.`);
+        // Try a final, gentle unlock attempt - MIGHT NOT WORK but worth a try
+        if (window.audioCtx && window.audioCtx.state === 'suspended') {
+            window.audioCtx.resume();
+        }
+        // If still not running, we must exit to avoid errors.
+        if (!window.audioCtx || window.audioCtx.state !== 'running') {
+            return;
+        }
+    }
+
+    console.log(`[AUDIO DEBUG] Playing sound: ${soundType}`);
+    const ctx = window.audioCtx;
+    const oscillator = ctx.createOscillator();
+    const gainNode = ctx.createGain();
+
+    oscillator.connect(gainNode);
+    gainNode.connect(ctx.destination);
+
+    let freq1 = 880; // Default: High A
+    let freq2 = 0;   // For double beep
+    let oscType = 'sine';
+
+    switch(soundType) {
+        case 'Beep_High': freq1 = 880; break; // A5
+        case 'Beep_Low': freq1 = 440; break; // A4
+        case 'Double_Beep': freq1 = 660; freq2 = 880; break; // E5 -> A5
+        case 'Success': freq1 = 523.25; freq2 = 783.99; durationMs = 300; break; // C5 -> G5
+        case 'Error': freq1 = 300; oscType = 'sawtooth'; break; // Low G# approx
+        default: freq1 = 880; break;
+    }
+
+    const now = ctx.currentTime;
+    const durationSec = durationMs / 1000;
+
+    gainNode.gain.setValueAtTime(0.5, now); // Start at half volume
+    gainNode.gain.linearRampToValueAtTime(0, now + durationSec); // Fade out
+
+    oscillator.frequency.setValueAtTime(freq1, now);
+    oscillator.type = oscType;
+    oscillator.start(now);
+    oscillator.stop(now + durationSec);
+
+    // Handle second beep/note for Double_Beep and Success
+    if (freq2 !== 0) {
+        const osc2 = ctx.createOscillator();
+        const gain2 = ctx.createGain();
+        osc2.connect(gain2);
+        gain2.connect(ctx.destination);
+
+        const delay = (soundType === 'Success') ? 0.15 : 0.1; // Delay for 2nd note
+        const duration2 = (soundType === 'Success') ? durationSec - delay : durationSec / 2;
+
+        gain2.gain.setValueAtTime(0.5, now + delay);
+        gain2.gain.linearRampToValueAtTime(0, now + delay + duration2);
+        osc2.frequency.setValueAtTime(freq2, now + delay);
+        osc2.type = 'sine';
+        osc2.start(now + delay);
+        osc2.stop(now + delay + duration2);
+    }
+}
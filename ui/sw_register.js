@@ -0,0 +1,17 @@
+// ui/sw_register.js
+// Registers the PWA service worker. This file is loaded after the page's
+// `load` event may already have fired, so register right away in that case.
+if ('serviceWorker' in navigator) {
+  const register = () => {
+    navigator.serviceWorker.register('/sw.js').then(registration => {
+      console.log('SW registered: ', registration);
+    }).catch(registrationError => {
+      console.log('SW registration failed: ', registrationError);
+    });
+  };
+  if (document.readyState === 'complete') {
+    register();
+  } else {
+    window.addEventListener('load', register);
+  }
+}
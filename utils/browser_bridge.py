@@ -0,0 +1,113 @@
+# utils/browser_bridge.py
+"""
+One persistent, two-way channel between the app and the browser.
+
+Everything the server asks of the page (play a sound, queue the look-ahead
+audio cues, ask for notification permission, show a notification) is a typed
+command appended to a per-session queue. `render_bridge` flushes the queue
+once per full run into a single custom component (ui/bridge/) that keeps the
+same key, so it is mounted once and every later run only updates its args:
+one delta per rerun, however many commands were queued.
+
+The component reports client state back as its value (audio unlocked, tab
+visibility, notification permission, viewport width); `render_bridge` stores it in
+`st.session_state.browser_state`.
+"""
+import os
+import uuid
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+from utils.sound_assets import get_sound_registry
+
+_BRIDGE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "ui", "bridge")
+_bridge_component = components.declare_component("workout_bridge", path=_BRIDGE_DIR)
+
+PLAY_SOUND = "play_sound"
+SCHEDULE_CUES = "schedule_cues"
+REQUEST_PERMISSION = "request_permission"
+NOTIFY = "notify"
+ALERT = "alert"
+
+DEFAULT_BROWSER_STATE = {
+    "audio_unlocked": False,
+    "visibility": "visible",
+    "notification_permission": "default",
+    "viewport_width": None,  # px, rounded to 100
+}
+
+
+def queue_command(kind: str, **payload) -> None:
+    """Queues one command for the next `render_bridge` call."""
+    st.session_state.setdefault("bridge_queue", []).append({"type": kind, **payload})
+
+
+def play_sound(name: str, seq: int, cue: str | None = None) -> None:
+    """Plays `name` through the page's sound channel. `seq` must increase per session."""
+    queue_command(PLAY_SOUND, name=name, seq=int(seq), cue=cue)
+
+
+def schedule_cues(cues: list[dict] | None) -> None:
+    """
+    Replaces the page's look-ahead cue queue with `cues`.
+
+    `cues` come from `WorkoutSession.get_audio_cues`; their times are
+    relative, so the page anchors them on its own clock when they arrive.
+    Passing None (paused, stopped, reset) cancels the queued cues; that is
+    sent once, not on every idle rerun.
+    """
+    if cues:
+        st.session_state.audio_cues_queued = True
+        queue_command(SCHEDULE_CUES, cues=cues)
+    elif st.session_state.get("audio_cues_queued"):
+        st.session_state.audio_cues_queued = False
+        queue_command(SCHEDULE_CUES, cues=[])
+
+
+def request_permission() -> None:
+    """Unlocks page audio and asks for notification permission."""
+    queue_command(REQUEST_PERMISSION)
+
+
+def notify(title: str, body: str = "", icon: str = "", sound: str = "",
+           tag: str = "", only_when_hidden: bool = False) -> None:
+    """Shows a system notification (optionally only once the tab is hidden)."""
+    queue_command(NOTIFY, title=title, body=body, icon=icon, sound=sound,
+                  tag=tag, only_when_hidden=only_when_hidden)
+
+
+def alert(message: str) -> None:
+    queue_command(ALERT, message=message)
+
+
+def browser_state() -> dict:
+    """The last client state the page reported."""
+    return st.session_state.get("browser_state") or DEFAULT_BROWSER_STATE
+
+
+def render_bridge() -> dict:
+    """
+    Flushes the queued commands to the page. Call once per full run, at the
+    same place in the script every time, so the component stays mounted.
+    """
+    if "bridge_session" not in st.session_state:
+        st.session_state.bridge_session = uuid.uuid4().hex[:12]
+        st.session_state.bridge_batch = 0
+    commands = st.session_state.pop("bridge_queue", [])
+    if commands:
+        st.session_state.bridge_batch += 1
+    args = {
+        "session": st.session_state.bridge_session,
+        "batch": st.session_state.bridge_batch,
+        "commands": commands,
+    }
+    # The sound channel keeps the asset manifest on the page, so it only
+    # rides along with the session's first render.
+    if not st.session_state.get("bridge_assets_sent"):
+        args["assets"] = get_sound_registry().manifest()
+        st.session_state.bridge_assets_sent = True
+    state = _bridge_component(**args, key="workout_bridge", default=None)
+    if state:
+        st.session_state.browser_state = state
+    return browser_state()
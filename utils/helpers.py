@@ -9,39 +9,21 @@ def format_time(seconds: int) -> str:
 def initialize_session_state_defaults():
     from configs.app_config import (
         DEFAULT_WORKOUT_DURATION, DEFAULT_REST_DURATION,
-        PHASE_GET_READY, GET_READY_DURATION,
         DEFAULT_WORKOUT_START_SOUND, DEFAULT_REST_START_SOUND, DEFAULT_SESSION_START_SOUND,
-        DEFAULT_INSIGHTS_CHART_TYPE
+        DEFAULT_INSIGHTS_CHART_TYPE, DEFAULT_TIMER_MODE
     )
+    from core.session_state import TimerState
 
     # ... (other initializations) ...
 
-    if 'workout_duration' not in st.session_state:
-        st.session_state.workout_duration = DEFAULT_WORKOUT_DURATION
-    if 'rest_duration' not in st.session_state:
-        st.session_state.rest_duration = DEFAULT_REST_DURATION
-    if 'timer_running' not in st.session_state:
-        st.session_state.timer_running = False
-    
-    if 'current_phase' not in st.session_state:
-        st.session_state.current_phase = PHASE_GET_READY
-    if 'current_time' not in st.session_state:
-        st.session_state.current_time = GET_READY_DURATION
-
-    if 'completed_rounds' not in st.session_state:
-        st.session_state.completed_rounds = 0
-    if 'accumulated_workout_seconds' not in st.session_state:
-        st.session_state.accumulated_workout_seconds = 0
-    if 'accumulated_rest_seconds' not in st.session_state:
-        st.session_state.accumulated_rest_seconds = 0
-    if 'session_stats_initialized_for_run' not in st.session_state:
-        st.session_state.session_stats_initialized_for_run = False
+    # All timer state (durations, phase, clock, rounds, exercise index)
+    # lives in one TimerState object; see core/session_state.py.
+    if 'timer_state' not in st.session_state:
+        st.session_state.timer_state = TimerState(
+            workout_duration=DEFAULT_WORKOUT_DURATION,
+            rest_duration=DEFAULT_REST_DURATION,
+        )
 
-    if 'phase_before_pause' not in st.session_state:
-        st.session_state.phase_before_pause = None
-    if 'time_before_pause' not in st.session_state:
-        st.session_state.time_before_pause = 0
-    
     # New: Master sound enabled state
     if 'sound_master_enabled' not in st.session_state:
         st.session_state.sound_master_enabled = True # Default to sound on, user can toggle
@@ -62,8 +44,9 @@ def initialize_session_state_defaults():
     # ... (rest of the initializations) ...
     if 'workout_schedule' not in st.session_state:
         st.session_state.workout_schedule = []
-    if 'current_exercise_index' not in st.session_state:
-        st.session_state.current_exercise_index = 0
+
+    if 'timer_mode' not in st.session_state:
+        st.session_state.timer_mode = DEFAULT_TIMER_MODE
 
     if 'insights_chart_type' not in st.session_state:
         st.session_state.insights_chart_type = DEFAULT_INSIGHTS_CHART_TYPE
@@ -0,0 +1,54 @@
+# utils/sound_assets.py
+"""
+Sound assets for the page's sound channel.
+
+`SoundAssetRegistry` resolves every sound in `core.session_manager._SOUND_URLS`
+once per process: each distinct URL gets one slot, so sounds that share an
+MP3 share a preloaded player in the browser. The manifest is handed to the
+sound channel (ui/bridge/sound_channel.js) by the browser bridge
+(utils/browser_bridge.py) once per session. Nothing is written to the media
+file manager.
+"""
+import logging
+import threading
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SoundAssetRegistry:
+    def __init__(self, sources: dict[str, str]):
+        self.urls: list[str] = []
+        self.sounds: dict[str, int] = {}  # sound name -> index into urls
+        for name, source in sources.items():
+            self.register(name, source)
+
+    def register(self, name: str, source: str) -> None:
+        if not source.startswith(("http://", "https://", "/")):
+            _LOGGER.warning("Sound %s has no servable URL (%s); it will use the synth beep.", name, source)
+            return
+        if source not in self.urls:
+            self.urls.append(source)
+        self.sounds[name] = self.urls.index(source)
+
+    def url(self, name: str) -> str | None:
+        idx = self.sounds.get(name)
+        return None if idx is None else self.urls[idx]
+
+    def manifest(self) -> dict:
+        return {"urls": self.urls, "sounds": self.sounds}
+
+
+_registry: SoundAssetRegistry | None = None
+_lock = threading.Lock()
+
+
+def get_sound_registry() -> SoundAssetRegistry:
+    """The process-wide registry, built from `_SOUND_URLS` on first use."""
+    global _registry
+    if _registry is None:
+        with _lock:
+            if _registry is None:
+                from core.session_manager import _SOUND_URLS
+
+                _registry = SoundAssetRegistry(_SOUND_URLS)
+    return _registry
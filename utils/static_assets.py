@@ -0,0 +1,133 @@
+# utils/static_assets.py
+"""
+Page-wide CSS and JS served as files instead of being inlined into every run.
+
+`AssetBundle` copies each source file once per process into a build
+directory under a content-hashed name (`style.3f9a1c2e.css`) and writes a
+gzip-compressed sibling (`.gz`) next to it. `render_page_assets` puts one
+small loader on the page that adds the `<link>`/`<script>` tags to the
+document head the first time it sees them, so every run only carries the
+hashed URLs.
+
+Under `streamlit run` the files are served by Streamlit's component file
+route (the build directory is declared as a component), which marks them
+`Cache-Control: public`. The `app.py` launcher also mounts `asset_routes()`,
+which serves the same files with a one-year immutable lifetime and the
+pre-compressed body; `use_asset_route()` switches the URLs to it.
+"""
+import atexit
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+_UI_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "ui")
+
+# name -> source file; loaded in this order
+PAGE_ASSETS = {
+    "style": os.path.join(_UI_DIR, "style.css"),
+    "sound_engine": os.path.join(_UI_DIR, "sound_engine.js"),
+    "sw_register": os.path.join(_UI_DIR, "sw_register.js"),
+}
+
+ASSET_ROUTE = "/assets"
+ASSET_CACHE_CONTROL = "public, max-age=31536000, immutable"
+_MEDIA_TYPES = {".css": "text/css", ".js": "text/javascript"}
+
+_LOADER = """<script>(function(d){%s.forEach(function(a){
+var el=d.getElementById("asset-"+a[0]);if(el&&el.dataset.url===a[1])return;if(el)el.remove();
+el=d.createElement(a[1].endsWith(".css")?"link":"script");el.id="asset-"+a[0];el.dataset.url=a[1];
+if(el.tagName==="LINK"){el.rel="stylesheet";el.href=a[1];}else{el.src=a[1];el.async=false;}
+d.head.appendChild(el);});})(document)</script>"""
+
+
+class AssetBundle:
+    def __init__(self, sources: dict[str, str], build_dir: str):
+        self.build_dir = build_dir
+        self.files: dict[str, str] = {}  # asset name -> hashed file name
+        for name, source in sources.items():
+            self.add(name, source)
+
+    def add(self, name: str, source: str) -> str:
+        with open(source, "rb") as f:
+            data = f.read()
+        stem, ext = os.path.splitext(os.path.basename(source))
+        filename = f"{stem}.{hashlib.sha256(data).hexdigest()[:10]}{ext}"
+        with open(os.path.join(self.build_dir, filename), "wb") as f:
+            f.write(data)
+        with open(os.path.join(self.build_dir, filename + ".gz"), "wb") as f:
+            f.write(gzip.compress(data, compresslevel=9, mtime=0))
+        self.files[name] = filename
+        return filename
+
+    def path(self, filename: str) -> str | None:
+        """Build path of a file this bundle produced (None for anything else)."""
+        if filename not in self.files.values():
+            return None
+        return os.path.join(self.build_dir, filename)
+
+
+_bundle: AssetBundle | None = None
+_base_url: str | None = None
+_lock = threading.Lock()
+
+
+def get_asset_bundle() -> AssetBundle:
+    """The process-wide bundle, built on first use."""
+    global _bundle, _base_url
+    if _bundle is None:
+        with _lock:
+            if _bundle is None:
+                build_dir = tempfile.mkdtemp(prefix="workout-assets-")
+                atexit.register(shutil.rmtree, build_dir, True)
+                bundle = AssetBundle(PAGE_ASSETS, build_dir)
+                if _base_url is None:
+                    component = components.declare_component("page_assets", path=build_dir)
+                    _base_url = f"component/{component.name}"
+                _bundle = bundle
+    return _bundle
+
+
+def use_asset_route() -> None:
+    """Serve the assets from `asset_routes()` (call before the first run)."""
+    global _base_url
+    _base_url = ASSET_ROUTE.lstrip("/")
+
+
+def asset_url(name: str) -> str:
+    """Page-relative URL of asset `name`."""
+    bundle = get_asset_bundle()
+    return f"{_base_url}/{bundle.files[name]}"
+
+
+def render_page_assets() -> None:
+    """Adds every `PAGE_ASSETS` file to the page (a no-op once loaded)."""
+    urls = [[name, asset_url(name)] for name in PAGE_ASSETS]
+    st.html(_LOADER % json.dumps(urls), unsafe_allow_javascript=True)
+
+
+def asset_routes() -> list:
+    """Starlette routes serving the bundle with long cache headers and gzip."""
+    from starlette.exceptions import HTTPException
+    from starlette.responses import FileResponse
+    from starlette.routing import Route
+
+    async def serve_asset(request):
+        filename = request.path_params["filename"]
+        path = get_asset_bundle().path(filename)
+        if path is None:
+            raise HTTPException(status_code=404, detail="Asset not found")
+        headers = {"Cache-Control": ASSET_CACHE_CONTROL, "Vary": "Accept-Encoding"}
+        media_type = _MEDIA_TYPES.get(os.path.splitext(filename)[1], "application/octet-stream")
+        if "gzip" in request.headers.get("accept-encoding", ""):
+            headers["Content-Encoding"] = "gzip"
+            path += ".gz"
+        return FileResponse(path, media_type=media_type, headers=headers)
+
+    return [Route(ASSET_ROUTE + "/{filename}", serve_asset, methods=["GET"])]